@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for loading, matching, planning and report generation.
+
+Every benchmark runs on synthetic data (see src/synthetic/) at several
+scales, offline: the API is answered by a SyntheticClient. Each benchmark
+is run several times; minimum, median and mean are stored as JSON, so runs
+can be compared with --compare. A benchmark whose median got slower than
+the threshold is a regression (exit code 1), so performance work can be
+proven and protected.
+
+Benchmarks:
+- db.bulk_insert_*: writing each entity type into an empty database
+- filter_transactions[type]: each creator's filter over the open transactions
+- find_contact_by_name / find_cost_centre_by_name: payee names of the open
+  transactions, with a cold contact cache
+- generate_voucher_plan[type]: each creator's plan (with voucher numbers)
+- build_voucher_plan_markdown: the markdown of the largest plan
+- MasterVoucherCreator.run_all_creators: all creators end to end
+
+Usage:
+    python3 benchmarks/run_benchmarks.py                          # Scales 1000 and 10000
+    python3 benchmarks/run_benchmarks.py --scales 1000,100000 --repeat 5
+    python3 benchmarks/run_benchmarks.py --only filter_transactions
+    python3 benchmarks/run_benchmarks.py --compare benchmarks/results/baseline.json
+"""
+import os
+import sys
+import io
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.database.db import TransactionDB
+from src.synthetic import SyntheticDataset, SyntheticClient, write_dataset
+from src.vouchers.run_context import RunContext
+from src.vouchers.registry import get_creator_keys, load_creator_class
+from src.vouchers.name_matching import reset_contact_cache
+from src.vouchers.voucher_utils import (
+    find_contact_by_name,
+    find_cost_centre_by_name,
+    build_voucher_plan_markdown,
+    get_transaction_raw_data,
+    reset_voucher_number_cache
+)
+from scripts.vouchers.create_all_vouchers import MasterVoucherCreator
+
+
+# Default dataset sizes (number of transactions)
+DEFAULT_SCALES = [1000, 10000]
+
+# Runs per benchmark
+DEFAULT_REPEAT = 3
+
+# Median slowdown counted as a regression (0.2 = 20% slower)
+DEFAULT_THRESHOLD = 0.2
+
+# Slowdowns below this many seconds are noise, not regressions
+DEFAULT_MIN_SECONDS = 0.005
+
+# Payee names looked up by the name matching benchmarks
+NAME_SAMPLE_SIZE = 500
+
+RESULTS_DIR = os.path.join(project_root, 'benchmarks', 'results')
+
+
+def measure(func: Callable, repeat: int, setup: Optional[Callable] = None,
+            teardown: Optional[Callable] = None) -> Dict:
+    """
+    Time a function several times (console output is discarded).
+
+    Args:
+        func: Function to time; called with the result of setup (if given)
+        repeat: Number of runs
+        setup: Called before every run, not timed
+        teardown: Called with the result of setup after every run, not timed
+
+    Returns:
+        Dictionary with runs, min, median and mean (seconds)
+    """
+    times = []
+    for _ in range(max(1, repeat)):
+        with redirect_stdout(io.StringIO()):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            func(state) if setup else func()
+            times.append(time.perf_counter() - start)
+            if teardown:
+                teardown(state)
+    return {
+        'runs': len(times),
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.mean(times),
+    }
+
+
+class BenchmarkScale:
+    """Synthetic database, client and prepared creators of one scale."""
+
+    def __init__(self, transactions: int, seed: int, directory: str):
+        """
+        Generate the dataset and write it into a database in directory.
+
+        Args:
+            transactions: Number of transactions
+            seed: Random seed of the dataset
+            directory: Directory for the database files
+        """
+        self.directory = directory
+        self.dataset = SyntheticDataset(transactions=transactions, seed=seed)
+        self.db_path = os.path.join(directory, f"synthetic_{transactions}.db")
+        with redirect_stdout(io.StringIO()):
+            write_dataset(self.dataset, self.db_path)
+        self.client = SyntheticClient(self.dataset)
+        self.context = self.new_context()
+        self.rows = {
+            'transactions': self.dataset.transactions(),
+            'contacts': self.dataset.contacts(),
+            'vouchers': self.dataset.vouchers(),
+            'cost_centres': self.dataset.cost_centres(),
+        }
+        self._empty_dbs = 0
+        self.creators: Dict[str, object] = {}
+        self.open_transactions: List[Dict] = []
+        self.filtered: Dict[str, List[Dict]] = {}
+
+    def new_context(self) -> RunContext:
+        """Get a run context on the synthetic database (no reload)."""
+        context = RunContext(api_key='synthetic', api_url='synthetic://sevdesk',
+                             db_path=self.db_path, client=self.client)
+        context.reload_policy = {'no_reload': True}
+        return context
+
+    def empty_db_path(self) -> str:
+        """Get the path of a new, empty database."""
+        self._empty_dbs += 1
+        return os.path.join(self.directory, f"empty_{self._empty_dbs}.db")
+
+    def prepare_creators(self):
+        """Set up every creator like a master run (accounting type, filter)."""
+        with redirect_stdout(io.StringIO()):
+            self.open_transactions = self.context.db.get_all_transactions(status=100)
+            for key in get_creator_keys():
+                creator = load_creator_class(key)()
+                creator.use_context(self.context)
+                creator.initialize_api_client()
+                creator.db = self.context.db
+                if not creator.find_accounting_type(creator.db):
+                    continue
+                self.creators[key] = creator
+                self.filtered[key] = creator.filter_transactions(self.open_transactions)
+
+    def close(self):
+        """Close the database connections (and the voucher number ledgers)."""
+        self.context.close()
+        with redirect_stdout(io.StringIO()):
+            reset_voucher_number_cache()
+
+
+def get_benchmarks(scale: BenchmarkScale) -> List[Dict]:
+    """
+    Get the benchmarks of one scale.
+
+    Returns:
+        List of dictionaries with name, func and optional setup/teardown
+    """
+    benchmarks = []
+
+    # Database writes
+    for entity, rows in scale.rows.items():
+        def insert(db, entity=entity, rows=rows):
+            getattr(db, f"bulk_insert_{entity}")(rows)
+        benchmarks.append({
+            'name': f"db.bulk_insert_{entity}",
+            'func': insert,
+            'setup': lambda: TransactionDB(db_path=scale.empty_db_path()),
+            'teardown': lambda db: db.close(),
+        })
+
+    # Creator filters
+    for key, creator in scale.creators.items():
+        benchmarks.append({
+            'name': f"filter_transactions[{key}]",
+            'func': lambda creator=creator: creator.filter_transactions(scale.open_transactions),
+        })
+
+    # Name matching (cold contact cache)
+    names = []
+    for txn in scale.open_transactions:
+        name = get_transaction_raw_data(txn).get('payeePayerName')
+        if name and name not in names:
+            names.append(name)
+            if len(names) == NAME_SAMPLE_SIZE:
+                break
+    db = scale.context.db
+
+    def find_contacts(_):
+        for name in names:
+            find_contact_by_name(db, name)
+
+    def find_cost_centres():
+        for name in names:
+            find_cost_centre_by_name(db, name)
+
+    benchmarks.append({
+        'name': f"find_contact_by_name ({len(names)} names)",
+        'func': find_contacts,
+        'setup': reset_contact_cache,
+    })
+    benchmarks.append({
+        'name': f"find_cost_centre_by_name ({len(names)} names)",
+        'func': find_cost_centres,
+    })
+
+    # Plans and report
+    for key, creator in scale.creators.items():
+        if not scale.filtered[key]:
+            continue
+        benchmarks.append({
+            'name': f"generate_voucher_plan[{key}]",
+            'func': lambda _, creator=creator, key=key: creator.generate_voucher_plan(scale.filtered[key]),
+            'setup': reset_contact_cache,
+        })
+
+    if scale.filtered:
+        largest = max(scale.filtered, key=lambda key: len(scale.filtered[key]))
+        creator = scale.creators[largest]
+        with redirect_stdout(io.StringIO()):
+            largest_plan = creator.build_voucher_plan(scale.filtered[largest])
+        benchmarks.append({
+            'name': f"build_voucher_plan_markdown[{largest}]",
+            'func': lambda: build_voucher_plan_markdown(
+                title=f"{creator.get_script_name()} Voucher Plan",
+                voucher_plan=largest_plan,
+                accounting_type=creator.accounting_type,
+                extra_sections=creator.get_extra_markdown_sections(largest_plan),
+                show_donation_type=creator.show_donation_type_column()
+            ),
+        })
+
+    # All creators end to end
+    def new_master():
+        reset_contact_cache()
+        master = MasterVoucherCreator(reload_policy={'no_reload': True})
+        master.context = scale.new_context()
+        return master
+
+    def close_master(master):
+        master.context.close()
+
+    benchmarks.append({
+        'name': 'MasterVoucherCreator.run_all_creators',
+        'func': lambda master: master.run_all_creators(),
+        'setup': new_master,
+        'teardown': close_master,
+    })
+
+    return benchmarks
+
+
+def run_benchmarks(scales: List[int], repeat: int, seed: int, only: Optional[str] = None) -> Dict:
+    """
+    Run all benchmarks at all scales.
+
+    Args:
+        scales: Dataset sizes (number of transactions)
+        repeat: Runs per benchmark
+        seed: Random seed of the datasets
+        only: Only run benchmarks whose name contains this text
+
+    Returns:
+        Result dictionary (see save_results())
+    """
+    results = {
+        'created_at': datetime.now().isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeat': repeat,
+        'scales': {},
+    }
+
+    for transactions in scales:
+        print(f"\n{'=' * 80}")
+        print(f"Scale: {transactions:,} transactions")
+        print('=' * 80)
+        with tempfile.TemporaryDirectory(prefix='sevdesk-bench-') as directory:
+            start = time.perf_counter()
+            scale = BenchmarkScale(transactions, seed, directory)
+            scale.prepare_creators()
+            print(f"Prepared synthetic data in {time.perf_counter() - start:.1f}s "
+                  f"({len(scale.open_transactions):,} open transactions)")
+            print()
+            print(f"{'Benchmark':<52} {'Median':>10} {'Min':>10}")
+            print('-' * 74)
+
+            timings = {}
+            try:
+                for benchmark in get_benchmarks(scale):
+                    if only and only not in benchmark['name']:
+                        continue
+                    timing = measure(benchmark['func'], repeat, benchmark.get('setup'), benchmark.get('teardown'))
+                    timings[benchmark['name']] = timing
+                    print(f"{benchmark['name']:<52} {timing['median']:>9.4f}s {timing['min']:>9.4f}s")
+            finally:
+                scale.close()
+                reset_contact_cache()
+            results['scales'][str(transactions)] = timings
+
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    """Get the current git commit (None outside a git checkout)."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results: Dict, path: Optional[str] = None) -> str:
+    """
+    Write benchmark results as JSON.
+
+    Args:
+        results: Result dictionary
+        path: Output file (default: benchmarks/results/benchmark_<timestamp>.json)
+
+    Returns:
+        Path of the written file
+    """
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD,
+                    min_seconds: float = DEFAULT_MIN_SECONDS) -> List[Dict]:
+    """
+    Compare benchmark medians with a baseline and print the changes.
+
+    A benchmark is a regression if its median is more than threshold
+    (relative) and more than min_seconds (absolute) slower than the baseline.
+
+    Returns:
+        List of regressions ({'scale', 'name', 'baseline', 'current', 'change'})
+    """
+    regressions = []
+    print(f"\n{'=' * 80}")
+    print(f"Comparison with baseline from {baseline.get('created_at', '?')[:19]} "
+          f"(commit {baseline.get('git_commit') or '?'}, threshold {threshold:.0%})")
+    print('=' * 80)
+    print(f"{'Scale':>8} {'Benchmark':<52} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+    print('-' * 92)
+
+    for scale, timings in current['scales'].items():
+        baseline_timings = baseline.get('scales', {}).get(scale, {})
+        for name, timing in timings.items():
+            if name not in baseline_timings:
+                continue
+            before = baseline_timings[name]['median']
+            after = timing['median']
+            change = (after - before) / before if before > 0 else 0.0
+            regressed = change > threshold and after - before > min_seconds
+            marker = ' ❌' if regressed else (' ✓' if change < -threshold else '')
+            print(f"{scale:>8} {name:<52} {before:>9.4f}s {after:>9.4f}s {change:>+7.0%}{marker}")
+            if regressed:
+                regressions.append({
+                    'scale': scale,
+                    'name': name,
+                    'baseline': before,
+                    'current': after,
+                    'change': change,
+                })
+
+    print()
+    if regressions:
+        print(f"❌ {len(regressions)} benchmark(s) regressed by more than {threshold:.0%}")
+    else:
+        print("✓ No regressions")
+    return regressions
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark planning, matching, loading and reports')
+    parser.add_argument('--scales', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help='Comma-separated dataset sizes in transactions (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='Runs per benchmark (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Random seed of the synthetic data (default: %(default)s)')
+    parser.add_argument('--only', default=None, metavar='TEXT',
+                        help='Only run benchmarks whose name contains TEXT')
+    parser.add_argument('--output', default=None, metavar='PATH',
+                        help='Result file (default: benchmarks/results/benchmark_<timestamp>.json)')
+    parser.add_argument('--compare', default=None, metavar='BASELINE',
+                        help='Compare with a saved result file; exit code 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative median slowdown counted as regression (default: %(default)s)')
+    parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS,
+                        help='Ignore slowdowns smaller than this (default: %(default)s)')
+    args = parser.parse_args()
+
+    try:
+        scales = [int(scale) for scale in args.scales.split(',') if scale.strip()]
+    except ValueError:
+        parser.error(f"Invalid --scales: {args.scales}")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = run_benchmarks(scales, args.repeat, args.seed, only=args.only)
+    path = save_results(results, args.output)
+    print(f"\n✓ Saved results to {path}")
+
+    if baseline is not None and compare_results(results, baseline, args.threshold, args.min_seconds):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic SevDesk dataset.
+
+Writes deterministic, realistic data (see src/synthetic/generator.py) into a
+separate SQLite database or as API-shaped JSON files. Use it to measure
+planning and matching without real customer data:
+
+    python3 scripts/loaders/generate_synthetic_data.py --transactions 100000
+    DB_PATH=synthetic.db python3 scripts/vouchers/create_all_vouchers.py --no-reload
+
+The database is recorded as freshly reloaded, so run the creators with
+--no-reload (a reload would replace the data with the real account's).
+
+Usage:
+    python3 scripts/loaders/generate_synthetic_data.py                       # 1,000 transactions into synthetic.db
+    python3 scripts/loaders/generate_synthetic_data.py --transactions 1000000 --seed 7
+    python3 scripts/loaders/generate_synthetic_data.py --json synthetic_json  # API responses as JSON files
+"""
+import os
+import sys
+import time
+import argparse
+from datetime import date
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.synthetic import SyntheticDataset, write_dataset, dump_dataset_json
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Generate a synthetic SevDesk dataset')
+    parser.add_argument('--transactions', type=int, default=1000, metavar='N',
+                        help='Number of transactions (default: 1000)')
+    parser.add_argument('--contacts', type=int, default=None, metavar='N',
+                        help='Number of contacts (default: transactions / 20, at least 50)')
+    parser.add_argument('--vouchers', type=int, default=None, metavar='N',
+                        help='Number of existing vouchers (default: transactions / 2)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Random seed; the same seed and sizes give the same data (default: 42)')
+    parser.add_argument('--open-ratio', type=float, default=0.25, metavar='RATIO',
+                        help='Share of open transactions (default: 0.25)')
+    parser.add_argument('--start-date', type=date.fromisoformat, default=date(2024, 1, 1), metavar='YYYY-MM-DD',
+                        help='Date of the first transaction (default: 2024-01-01)')
+    parser.add_argument('--days', type=int, default=730,
+                        help='Number of days the data is spread over (default: 730)')
+    parser.add_argument('--db', default='synthetic.db', metavar='PATH',
+                        help='SQLite database to write (default: synthetic.db)')
+    parser.add_argument('--json', default=None, metavar='DIR',
+                        help='Write API-shaped JSON files into DIR instead of a database')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='Replace an existing database file')
+    args = parser.parse_args()
+    
+    dataset = SyntheticDataset(
+        transactions=args.transactions,
+        contacts=args.contacts,
+        vouchers=args.vouchers,
+        seed=args.seed,
+        open_ratio=args.open_ratio,
+        start_date=args.start_date,
+        days=args.days
+    )
+    
+    print("=" * 60)
+    print("Synthetic SevDesk Data Generator")
+    print("=" * 60)
+    print()
+    for entity, count in dataset.summary().items():
+        print(f"  {entity:<18} {count:>10,}")
+    print(f"  (seed {args.seed})")
+    print()
+    
+    start = time.perf_counter()
+    if args.json:
+        print(f"Writing JSON files to {args.json}...")
+        paths = dump_dataset_json(dataset, args.json)
+        for path in paths.values():
+            print(f"✓ {path}")
+    else:
+        if os.path.exists(args.db):
+            if not args.overwrite:
+                print(f"Error: {args.db} already exists (use --overwrite to replace it)")
+                sys.exit(1)
+            os.remove(args.db)
+        print(f"Writing database {args.db}...")
+        counts = write_dataset(dataset, args.db)
+        print(f"✓ Wrote {sum(counts.values()):,} rows")
+    
+    print(f"✓ Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,8 @@
 Load SevDesk transactions into a SQLite database.
 
 This script fetches open transactions from the SevDesk API and stores them
-in a local SQLite database for easy querying and analysis.
+in a local SQLite database for easy querying and analysis. Each page is
+written by a background writer while the next page is fetched.
 """
 import os
 import sys
@@ -16,6 +17,7 @@ if project_root not in sys.path:
 
 from src.sevdesk.client import SevDeskClient
 from src.database.db import TransactionDB
+from src.database.pipeline import BatchWriter
 
 
 def main():
@@ -50,16 +52,6 @@ def main():
     print("✓ Connection successful!")
     print()
     
-    # Fetch open transactions (status=100)
-    print("Fetching open transactions from SevDesk...")
-    try:
-        transactions = client.get_all_transactions(status=100)
-        print(f"✓ Fetched {len(transactions)} open transactions")
-        print()
-    except Exception as e:
-        print(f"Error fetching transactions: {e}")
-        sys.exit(1)
-    
     # Initialize database
     print(f"Opening database: {db_path}")
     with TransactionDB(db_path=db_path) as db:
@@ -70,10 +62,20 @@ def main():
         print(f"  - By status: {before_stats['by_status']}")
         print()
         
-        # Insert transactions
-        print("Inserting transactions into database...")
-        inserted = db.bulk_insert_transactions(transactions)
-        print(f"✓ Successfully inserted/updated {inserted} transactions")
+        # Fetch open transactions (status=100) and insert them page by page
+        print("Fetching open transactions from SevDesk and inserting them into database...")
+        try:
+            with BatchWriter(db_path, lambda writer_db, rows: writer_db.bulk_insert_transactions(rows)) as writer:
+                for page in client.iter_transaction_pages(status=100):
+                    writer.put(page)
+        except Exception as e:
+            print(f"Error loading transactions: {e}")
+            sys.exit(1)
+        
+        stats = writer.stats
+        print(f"✓ Fetched {stats['rows']} open transactions")
+        print(f"✓ Successfully inserted/updated {stats['written']} transactions "
+              f"({stats['rows_per_second']:,.0f} rows/s, {stats['seconds']:.2f}s)")
         print()
         
         # Get updated statistics
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Sync vouchers from SevDesk API into the local voucher mirror.
+
+The sync is incremental: vouchers are read most recently updated first and
+only new or changed vouchers (different update timestamp) are stored. The
+sync stops at the first voucher updated before the newest update seen by
+the last completed sync (the cursor in the sync_state table), so status and
+paidAmount changes of old vouchers are picked up too. An interrupted sync
+does not advance the cursor, so the next sync checks the missed vouchers
+again. Use --full to walk all vouchers (most recently created first).
+
+Usage:
+    python3 scripts/loaders/load_vouchers.py                  # Incremental sync
+    python3 scripts/loaders/load_vouchers.py --full           # Check all vouchers
+    python3 scripts/loaders/load_vouchers.py --no-positions   # Skip voucher positions
+"""
+import os
+import sys
+import argparse
+from typing import Dict
+from dotenv import load_dotenv
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.sevdesk.client import SevDeskClient
+from src.database.db import TransactionDB
+
+
+# Vouchers per API request
+PAGE_SIZE = 100
+
+# Entity of the voucher mirror in the sync_state table
+SYNC_ENTITY = 'vouchers'
+
+
+def sync_vouchers(db: TransactionDB, client: SevDeskClient, full: bool = False,
+                  with_positions: bool = True) -> Dict:
+    """
+    Sync new and changed vouchers into the local mirror.
+
+    The cursor (newest update seen) is advanced only when a pass completes.
+    After an interrupted pass the mirror is incomplete below the pages it
+    stored, so the next sync walks down to the last completed cursor again
+    (or does a full pass if none completed yet); already mirrored vouchers
+    are skipped without further requests.
+
+    Args:
+        db: Database connection
+        client: SevDesk API client
+        full: If True, check all vouchers instead of stopping at the cursor
+        with_positions: If True, also fetch the positions of new/changed vouchers
+
+    Returns:
+        Dictionary with counts: checked, new, updated, failed, positions, pages,
+        and resumed (True if an unfinished pass was picked up)
+    """
+    stats = {'checked': 0, 'new': 0, 'updated': 0, 'failed': 0, 'positions': 0, 'pages': 0}
+    offset = 0
+
+    state = db.get_sync_state(SYNC_ENTITY) or {}
+    stats['resumed'] = bool(state.get('pass_started_at'))
+
+    # Never synced completely: a full pass is needed anyway
+    high_water = None if full else state.get('cursor')
+    order_by = 'update' if high_water else 'create'
+    newest_update = None
+
+    db.start_sync_pass(SYNC_ENTITY)
+
+    while True:
+        vouchers = client.get_vouchers(limit=PAGE_SIZE, offset=offset, order_by=order_by)
+        if not vouchers:
+            break
+
+        known = db.get_voucher_update_dates([str(v.get('id')) for v in vouchers])
+        reached_high_water = False
+        page = {'checked': 0, 'new': 0, 'updated': 0, 'failed': 0, 'positions': 0}
+
+        try:
+            for voucher in vouchers:
+                voucher_id = str(voucher.get('id'))
+                update = voucher.get('update') or ''
+                if high_water and update < high_water:
+                    # Updated before the last completed pass: this and all later vouchers are mirrored
+                    reached_high_water = True
+                    break
+                page['checked'] += 1
+                if update and (newest_update is None or update > newest_update):
+                    newest_update = update
+                if voucher_id in known and known[voucher_id] == voucher.get('update'):
+                    continue
+
+                if not db.insert_voucher(voucher, commit=False):
+                    page['failed'] += 1
+                    continue
+
+                if voucher_id in known:
+                    page['updated'] += 1
+                else:
+                    page['new'] += 1
+
+                if with_positions:
+                    positions = client.get_voucher_positions(voucher_id)
+                    page['positions'] += db.replace_voucher_positions(voucher_id, positions, commit=False)
+
+            # One commit per page: the vouchers and positions of a page are stored together
+            db.conn.commit()
+        except Exception:
+            db.conn.rollback()
+            raise
+
+        stats['pages'] += 1
+        for key, value in page.items():
+            stats[key] += value
+
+        if reached_high_water:
+            break
+
+        if len(vouchers) < PAGE_SIZE:
+            break
+
+        offset += PAGE_SIZE
+
+    if stats['failed']:
+        # Not stored vouchers would be skipped by the next incremental sync
+        print(f"⚠️  Warning: {stats['failed']} voucher(s) could not be stored; "
+              f"the sync cursor was not advanced")
+    else:
+        db.complete_sync_pass(SYNC_ENTITY, newest_update)
+
+    return stats
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description='Sync vouchers from SevDesk into the local database'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Check all vouchers instead of stopping at the last synced update'
+    )
+    parser.add_argument(
+        '--no-positions',
+        action='store_true',
+        help='Do not fetch voucher positions'
+    )
+    args = parser.parse_args()
+
+    # Load environment variables
+    load_dotenv()
+
+    api_key = os.getenv('SEVDESK_API_KEY')
+    api_url = os.getenv('SEVDESK_API_URL', 'https://my.sevdesk.de/api/v1')
+    db_path = os.getenv('DB_PATH', 'transactions.db')
+
+    if not api_key:
+        print("Error: SEVDESK_API_KEY not found in environment variables.")
+        return
+
+    print("=" * 60)
+    print("SevDesk Voucher Sync")
+    print("=" * 60)
+    print()
+
+    # Initialize API client
+    print(f"Connecting to SevDesk API at {api_url}...")
+    client = SevDeskClient(api_key=api_key, base_url=api_url)
+
+    # Test connection
+    if not client.test_connection():
+        print("✗ Connection failed!")
+        return
+
+    print("✓ Connection successful!")
+    print()
+
+    # Open database and sync vouchers
+    print(f"Opening database: {db_path}")
+    with TransactionDB(db_path=db_path) as db:
+        mode = "full" if args.full else "incremental"
+        print(f"Syncing vouchers ({mode})...")
+        stats = sync_vouchers(db, client, full=args.full, with_positions=not args.no_positions)
+
+        print(f"✓ Checked {stats['checked']} vouchers in {stats['pages']} request(s)")
+        if stats['resumed']:
+            print("✓ Completed the previously interrupted sync")
+        print(f"✓ New: {stats['new']}, updated: {stats['updated']}")
+        if not args.no_positions:
+            print(f"✓ Stored {stats['positions']} voucher positions")
+        print()
+
+        # Show open vouchers
+        open_vouchers = db.get_vouchers(status=100)
+        print(f"Open vouchers in database (status 100): {len(open_vouchers)}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -8,11 +8,37 @@ This script clears the local database and reloads:
 - Accounting types
 - Categories
 - Contacts
+- Vouchers (incremental sync into the local voucher mirror)
+
+The five entity types are independent, so by default they are fetched in
+parallel (all requests share the client's rate limit). The fetched data is
+written by the calling thread only, one entity type after the other, so
+there is a single SQLite writer. Transactions are paged: each page is
+written by a background writer while the next one is fetched (see
+src/database/pipeline.py).
 
 Use this before running voucher creation scripts to ensure you have the latest data.
+
+Every completed reload is recorded in the reload_metadata table (time,
+number of rows and newest update date per table). The voucher creators use
+it to skip the reload if the data is fresh enough (see reload_if_stale()):
+- --max-data-age MINUTES: reuse data reloaded less than MINUTES ago
+- --no-reload: always reuse the stored data
+- --delta: only load the open transactions (and refresh the stored open
+  transactions that changed status) instead of the whole history
+
+Usage:
+    python3 scripts/loaders/reload_data.py            # Parallel reload
+    python3 scripts/loaders/reload_data.py --jobs 1   # One entity type after the other
+    python3 scripts/loaders/reload_data.py --delta    # Only open and changed transactions
 """
 import os
 import sys
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 # Add project root to path
@@ -22,9 +48,199 @@ if project_root not in sys.path:
 
 from src.sevdesk.client import SevDeskClient
 from src.database.db import TransactionDB
+from src.database.pipeline import BatchWriter
+from scripts.loaders.load_vouchers import sync_vouchers
+
+
+# Entity types replaced on reload: (title, client method, table, insert method).
+# Client methods starting with iter_ yield pages, which are written while
+# the next page is fetched.
+RELOAD_ENTITIES = [
+    ('Transactions', 'iter_transaction_pages', 'transactions', 'bulk_insert_transactions'),
+    ('Cost Centres', 'get_cost_centres', 'cost_centres', 'bulk_insert_cost_centres'),
+    ('Accounting Types', 'get_accounting_types', 'accounting_types', 'bulk_insert_accounting_types'),
+    ('Categories', 'get_categories', 'categories', 'bulk_insert_categories'),
+    ('Contacts', 'get_contacts', 'contacts', 'bulk_insert_contacts'),
+]
+
+# Entity types fetched at the same time (1 = one after the other)
+RELOAD_JOBS = len(RELOAD_ENTITIES)
+
+# Tables a completed reload is recorded for (the voucher mirror is synced)
+RELOAD_TABLES = [table for _, _, table, _ in RELOAD_ENTITIES] + ['vouchers']
+
 
+def _fetch_entity(client: SevDeskClient, method_name: str, output=None):
+    """
+    Fetch all items of one entity type.
+    
+    Args:
+        client: SevDesk API client
+        method_name: Client method returning all items
+        output: ThreadOutput collecting the console output of a worker thread
+    
+    Returns:
+        Tuple of (items, seconds, console output of a worker thread)
+    """
+    if output is None:
+        start = time.perf_counter()
+        items = getattr(client, method_name)()
+        return items, time.perf_counter() - start, ''
+    
+    with output.capture() as buffer:
+        items, seconds, _ = _fetch_entity(client, method_name)
+    return items, seconds, buffer.getvalue()
 
-def reload_all_data(db_path: str = 'transactions.db', api_key: str = None, api_url: str = None):
+
+def _write_entity(db: TransactionDB, title: str, table: str, insert_method: str,
+                  items: List[Dict], fetch_seconds: float) -> Dict:
+    """
+    Replace the stored items of one entity type.
+    
+    Returns:
+        Timing dictionary with entity, table, count, fetch_seconds and write_seconds
+    """
+    name = title.lower()
+    print(f"✓ Fetched {len(items)} {name} ({fetch_seconds:.2f}s)")
+    start = time.perf_counter()
+    
+    print(f"Clearing existing {name}...")
+    db.cursor.execute(f'DELETE FROM {table}')
+    db.conn.commit()
+    print("✓ Cleared")
+    
+    print(f"Inserting {name}...")
+    count = getattr(db, insert_method)(items)
+    print(f"✓ Inserted {count} {name}")
+    
+    return {
+        'entity': title,
+        'table': table,
+        'count': count,
+        'fetch_seconds': fetch_seconds,
+        'write_seconds': time.perf_counter() - start
+    }
+
+
+def _stream_entity(client: SevDeskClient, db: TransactionDB, title: str, pages_method: str,
+                   table: str, insert_method: str, page_filter: Optional[Dict] = None,
+                   remove_missing: bool = True) -> Dict:
+    """
+    Fetch one entity type page by page while a background writer stores the pages.
+    
+    Each page is written in one database transaction. Rows that were not
+    loaded again are removed at the end, so the table is never empty
+    during the reload and keeps its old rows if the fetch fails.
+    
+    Args:
+        client: SevDesk API client
+        db: Database connection of the calling thread (idle while the writer runs)
+        title: Entity type name
+        pages_method: Client method yielding pages
+        table: Database table
+        insert_method: Database method inserting one page
+        page_filter: Keyword arguments of the client method (e.g. {'status': 100})
+        remove_missing: Remove the rows that were not loaded again
+            (only for a complete, unfiltered load)
+        
+    Returns:
+        Timing dictionary with entity, table, count, fetch_seconds and write_seconds
+    """
+    name = title.lower()
+    started_at = datetime.now().isoformat()
+    
+    with BatchWriter(db.db_path, lambda writer_db, rows: getattr(writer_db, insert_method)(rows)) as writer:
+        for page in getattr(client, pages_method)(**(page_filter or {})):
+            writer.put(page)
+    stats = writer.stats
+    
+    print(f"✓ Fetched and inserted {stats['written']} {name} in {stats['batches']} page(s) "
+          f"({stats['rows_per_second']:,.0f} rows/s)")
+    if stats['wait_seconds'] >= 0.01:
+        print(f"  (fetching waited {stats['wait_seconds']:.2f}s for the database writer)")
+    
+    # Everything loaded: drop the rows that no longer exist
+    if remove_missing:
+        db.cursor.execute(f'DELETE FROM {table} WHERE loaded_at < ?', (started_at,))
+        db.conn.commit()
+        if db.cursor.rowcount > 0:
+            print(f"✓ Removed {db.cursor.rowcount} {name} that no longer exist")
+    
+    return {
+        'entity': title,
+        'table': table,
+        'count': stats['written'],
+        'fetch_seconds': stats['seconds'],
+        'write_seconds': stats['write_seconds']
+    }
+
+
+def _delta_transactions(client: SevDeskClient, db: TransactionDB, title: str, pages_method: str,
+                        table: str, insert_method: str) -> Dict:
+    """
+    Load only the open transactions and refresh the stored ones that changed.
+    
+    The open transactions are fetched page by page (see _stream_entity()).
+    Stored transactions that are open locally but were not returned are
+    fetched one by one: they were booked or deleted since the last reload.
+    All other stored transactions are kept as they are.
+    
+    Returns:
+        Timing dictionary with entity, table, count, fetch_seconds and write_seconds
+    """
+    # Imported here: the src.vouchers package imports this module
+    from src.vouchers.verification import fetch_transactions
+    
+    started_at = datetime.now().isoformat()
+    timing = _stream_entity(client, db, title, pages_method, table, insert_method,
+                            page_filter={'status': 100}, remove_missing=False)
+    
+    db.cursor.execute(f'SELECT id FROM {table} WHERE status = 100 AND loaded_at < ?', (started_at,))
+    left_open = [row['id'] for row in db.cursor.fetchall()]
+    if not left_open:
+        return timing
+    
+    print(f"Refreshing {len(left_open)} stored open transaction(s) that are no longer open...")
+    start = time.perf_counter()
+    fetched = fetch_transactions(client, left_open)
+    changed = [result['transaction'] for result in fetched.values() if result.get('transaction')]
+    # Deleted transactions are answered with 404 (or, rarely, an empty result)
+    deleted = [
+        transaction_id for transaction_id, result in fetched.items()
+        if result.get('not_found') or (not result.get('transaction') and not result.get('error'))
+    ]
+    timing['fetch_seconds'] += time.perf_counter() - start
+    
+    start = time.perf_counter()
+    updated = db.bulk_insert_transactions(changed)
+    if deleted:
+        db.cursor.executemany(f'DELETE FROM {table} WHERE id = ?', [(tid,) for tid in deleted])
+        db.conn.commit()
+    timing['write_seconds'] += time.perf_counter() - start
+    timing['count'] += updated
+    
+    print(f"✓ Updated {updated} changed and removed {len(deleted)} deleted transaction(s)")
+    failed = len(left_open) - len(changed) - len(deleted)
+    if failed:
+        print(f"⚠️  {failed} transaction(s) could not be fetched and keep their stored status")
+    return timing
+
+
+def print_reload_timings(timings: List[Dict], wall_seconds: float):
+    """Print the fetch and write time of every entity type."""
+    print()
+    print(f"{'Entity':<18} {'Items':>7} {'Fetch':>9} {'Write':>9}")
+    print("-" * 46)
+    for timing in timings:
+        print(f"{timing['entity']:<18} {timing['count']:>7} "
+              f"{timing['fetch_seconds']:>8.2f}s {timing['write_seconds']:>8.2f}s")
+    print("-" * 46)
+    fetch_total = sum(timing['fetch_seconds'] for timing in timings)
+    print(f"Wall time: {wall_seconds:.2f}s (fetch time of all entity types: {fetch_total:.2f}s)")
+
+
+def reload_all_data(db_path: str = 'transactions.db', api_key: str = None, api_url: str = None,
+                    jobs: int = RELOAD_JOBS, delta: bool = False):
     """
     Reload all data from the SevDesk API.
     
@@ -32,6 +248,9 @@ def reload_all_data(db_path: str = 'transactions.db', api_key: str = None, api_u
         db_path: Path to the database file
         api_key: SevDesk API key (if None, loads from environment)
         api_url: SevDesk API URL (if None, loads from environment)
+        jobs: Number of entity types fetched at the same time (1 = sequential)
+        delta: Only load the open transactions and refresh the stored open
+            transactions that changed (see _delta_transactions())
     """
     # Load environment variables if not provided
     if not api_key or not api_url:
@@ -44,7 +263,7 @@ def reload_all_data(db_path: str = 'transactions.db', api_key: str = None, api_u
         return False
     
     print("=" * 80)
-    print("SevDesk Data Reload")
+    print("SevDesk Data Reload" + (" (delta)" if delta else ""))
     print("=" * 80)
     print()
     
@@ -60,103 +279,70 @@ def reload_all_data(db_path: str = 'transactions.db', api_key: str = None, api_u
     print("✓ Connection successful!")
     print()
     
+    # Imported here: the src.vouchers package imports this module
+    from src.vouchers.thread_output import route_thread_output
+    
+    jobs = max(1, min(jobs, len(RELOAD_ENTITIES)))
+    reload_start = time.perf_counter()
+    timings = []
+    
     # Open database
     print(f"Opening database: {db_path}")
-    with TransactionDB(db_path=db_path) as db:
-        # 1. Load Transactions
-        print()
-        print("-" * 80)
-        print("1. Loading Transactions")
-        print("-" * 80)
+    with TransactionDB(db_path=db_path) as db, route_thread_output() as output, \
+            ThreadPoolExecutor(max_workers=jobs) as executor:
+        if jobs > 1:
+            # Fetch everything at once; this thread is the only writer
+            print(f"Fetching {len(RELOAD_ENTITIES)} entity types from API ({jobs} in parallel)...")
+            futures = [
+                executor.submit(_fetch_entity, client, method_name, output)
+                if not method_name.startswith('iter_') else None
+                for _, method_name, _, _ in RELOAD_ENTITIES
+            ]
         
-        print("Fetching transactions from API...")
-        transactions = client.get_all_transactions()
-        print(f"✓ Fetched {len(transactions)} transactions")
+        for number, (title, method_name, table, insert_method) in enumerate(RELOAD_ENTITIES, 1):
+            print()
+            print("-" * 80)
+            print(f"{number}. Loading {title}")
+            print("-" * 80)
+            
+            print(f"Fetching {title.lower()} from API...")
+            if delta and table == 'transactions':
+                timings.append(_delta_transactions(client, db, title, method_name, table, insert_method))
+                continue
+            if method_name.startswith('iter_'):
+                timings.append(_stream_entity(client, db, title, method_name, table, insert_method))
+                continue
+            if jobs > 1:
+                items, fetch_seconds, fetch_output = futures[number - 1].result()
+                print(fetch_output, end='')
+            else:
+                items, fetch_seconds, _ = _fetch_entity(client, method_name)
+            
+            timings.append(_write_entity(db, title, table, insert_method, items, fetch_seconds))
         
-        print("Clearing existing transactions...")
-        db.cursor.execute('DELETE FROM transactions')
-        db.conn.commit()
-        print("✓ Cleared")
-        
-        print("Inserting transactions...")
-        count = db.bulk_insert_transactions(transactions)
-        print(f"✓ Inserted {count} transactions")
-        
-        # 2. Load Cost Centres
+        # Sync Vouchers (incremental, the mirror is not cleared)
         print()
         print("-" * 80)
-        print("2. Loading Cost Centres")
+        print(f"{len(RELOAD_ENTITIES) + 1}. Syncing Vouchers")
         print("-" * 80)
         
-        print("Fetching cost centres from API...")
-        cost_centres = client.get_cost_centres()
-        print(f"✓ Fetched {len(cost_centres)} cost centres")
+        print("Fetching new and changed vouchers from API...")
+        sync_start = time.perf_counter()
+        stats = sync_vouchers(db, client, with_positions=False)
+        print(f"✓ Checked {stats['checked']} vouchers (new: {stats['new']}, updated: {stats['updated']})")
+        timings.append({
+            'entity': 'Vouchers (sync)',
+            'table': 'vouchers',
+            'count': stats['new'] + stats['updated'],
+            'fetch_seconds': time.perf_counter() - sync_start,
+            'write_seconds': 0.0
+        })
         
-        print("Clearing existing cost centres...")
-        db.cursor.execute('DELETE FROM cost_centres')
-        db.conn.commit()
-        print("✓ Cleared")
-        
-        print("Inserting cost centres...")
-        count = db.bulk_insert_cost_centres(cost_centres)
-        print(f"✓ Inserted {count} cost centres")
-        
-        # 3. Load Accounting Types
-        print()
-        print("-" * 80)
-        print("3. Loading Accounting Types")
-        print("-" * 80)
-        
-        print("Fetching accounting types from API...")
-        accounting_types = client.get_accounting_types()
-        print(f"✓ Fetched {len(accounting_types)} accounting types")
-        
-        print("Clearing existing accounting types...")
-        db.cursor.execute('DELETE FROM accounting_types')
-        db.conn.commit()
-        print("✓ Cleared")
-        
-        print("Inserting accounting types...")
-        count = db.bulk_insert_accounting_types(accounting_types)
-        print(f"✓ Inserted {count} accounting types")
-        
-        # 4. Load Categories
-        print()
-        print("-" * 80)
-        print("4. Loading Categories")
-        print("-" * 80)
-        
-        print("Fetching categories from API...")
-        categories = client.get_categories()
-        print(f"✓ Fetched {len(categories)} categories")
-        
-        print("Clearing existing categories...")
-        db.cursor.execute('DELETE FROM categories')
-        db.conn.commit()
-        print("✓ Cleared")
-        
-        print("Inserting categories...")
-        count = db.bulk_insert_categories(categories)
-        print(f"✓ Inserted {count} categories")
-        
-        # 5. Load Contacts
-        print()
-        print("-" * 80)
-        print("5. Loading Contacts")
-        print("-" * 80)
-        
-        print("Fetching contacts from API...")
-        contacts = client.get_contacts()
-        print(f"✓ Fetched {len(contacts)} contacts")
-        
-        print("Clearing existing contacts...")
-        db.cursor.execute('DELETE FROM contacts')
-        db.conn.commit()
-        print("✓ Cleared")
-        
-        print("Inserting contacts...")
-        count = db.bulk_insert_contacts(contacts)
-        print(f"✓ Inserted {count} contacts")
+        # Everything loaded: later runs may reuse this data (see reload_if_stale())
+        db.record_reload({timing['table']: timing['count'] for timing in timings},
+                         mode='delta' if delta else 'full')
+    
+    print_reload_timings(timings, time.perf_counter() - reload_start)
     
     print()
     print("=" * 80)
@@ -167,15 +353,154 @@ def reload_all_data(db_path: str = 'transactions.db', api_key: str = None, api_u
     return True
 
 
+def get_data_age(metadata: Dict[str, Dict]) -> Optional[float]:
+    """
+    Get the age of the stored data in seconds.
+    
+    Args:
+        metadata: Reload metadata (see TransactionDB.get_reload_metadata())
+    
+    Returns:
+        Seconds since the oldest table was reloaded, or None if a table
+        was never reloaded completely
+    """
+    if any(table not in metadata for table in RELOAD_TABLES):
+        return None
+    oldest = min(datetime.fromisoformat(metadata[table]['reloaded_at']) for table in RELOAD_TABLES)
+    return max(0.0, (datetime.now() - oldest).total_seconds())
+
+
+def format_data_age(seconds: float) -> str:
+    """Format a data age for the console (e.g. '42s', '7 min', '3.5 h', '2 days')."""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} min"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 86400:.0f} days"
+
+
+def print_data_age_note(metadata: Dict[str, Dict], reason: str):
+    """Print how old the reused data is and what it contains."""
+    age = get_data_age(metadata)
+    transactions = metadata['transactions']
+    reloaded_at = datetime.fromisoformat(transactions['reloaded_at'])
+    print(f"ℹ️  Using stored data from {reloaded_at:%Y-%m-%d %H:%M:%S} "
+          f"({format_data_age(age)} old, {transactions['mode']} reload) - {reason}")
+    print(f"   {transactions['item_count']} transactions (newest update: {transactions['high_water'] or '-'}), "
+          f"{metadata['contacts']['item_count']} contacts, "
+          f"{metadata['vouchers']['item_count']} vouchers")
+    print("   Changes made in SevDesk since then are not included.")
+
+
+def reload_if_stale(db_path: str = 'transactions.db', api_key: str = None, api_url: str = None,
+                    max_data_age: Optional[float] = None, no_reload: bool = False,
+                    delta: bool = False, jobs: int = RELOAD_JOBS) -> bool:
+    """
+    Reload all data unless the stored data is fresh enough.
+    
+    Without a policy (the default) the data is always reloaded.
+    
+    Args:
+        db_path: Path to the database file
+        api_key: SevDesk API key (if None, loads from environment)
+        api_url: SevDesk API URL (if None, loads from environment)
+        max_data_age: Reuse data reloaded at most this many minutes ago
+        no_reload: Always reuse the stored data
+        delta: Reload only the open and changed transactions (see reload_all_data())
+        jobs: Number of entity types fetched at the same time
+    
+    Returns:
+        True if the data is loaded (or reused), False if the reload failed
+    """
+    with TransactionDB(db_path=db_path) as db:
+        metadata = db.get_reload_metadata()
+    age = get_data_age(metadata)
+    
+    if no_reload:
+        if age is None:
+            print(f"⚠️  No completed reload recorded in {db_path} - using the database as it is (--no-reload)")
+        else:
+            print_data_age_note(metadata, "reload skipped (--no-reload)")
+        print()
+        return True
+    
+    if max_data_age is not None:
+        if age is not None and age <= max_data_age * 60:
+            print_data_age_note(metadata, f"reload skipped (--max-data-age {max_data_age:g} min)")
+            print()
+            return True
+        if age is None:
+            print("No completed reload recorded - reloading")
+        else:
+            print(f"Stored data is {format_data_age(age)} old (--max-data-age {max_data_age:g} min) - reloading")
+    
+    if delta and age is None:
+        print("No completed reload recorded - doing a full reload instead of --delta")
+        delta = False
+    
+    print("Reloading all data from SevDesk API...")
+    print()
+    return reload_all_data(db_path=db_path, api_key=api_key, api_url=api_url, jobs=jobs, delta=delta)
+
+
+def add_reload_policy_arguments(parser: argparse.ArgumentParser):
+    """Add --max-data-age, --no-reload and --delta to a voucher script's parser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        '--max-data-age',
+        type=float,
+        default=None,
+        metavar='MINUTES',
+        help='Skip the data reload if the last reload is at most MINUTES old'
+    )
+    group.add_argument(
+        '--no-reload',
+        action='store_true',
+        help='Use the stored data without reloading (prints how old it is)'
+    )
+    parser.add_argument(
+        '--delta',
+        action='store_true',
+        help='Reload only open and changed transactions instead of the whole history'
+    )
+
+
+def get_reload_policy(args: argparse.Namespace) -> Dict:
+    """Get the reload policy of parsed arguments (keyword arguments of reload_if_stale())."""
+    return {
+        'max_data_age': getattr(args, 'max_data_age', None),
+        'no_reload': getattr(args, 'no_reload', False),
+        'delta': getattr(args, 'delta', False),
+    }
+
+
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description='Reload all data from SevDesk API')
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=RELOAD_JOBS,
+        metavar='N',
+        help=f'Entity types fetched at the same time, 1 = one after the other (default: {RELOAD_JOBS})'
+    )
+    parser.add_argument(
+        '--delta',
+        action='store_true',
+        help='Load only open and changed transactions instead of the whole history'
+    )
+    args = parser.parse_args()
+    
     load_dotenv()
     
     api_key = os.getenv('SEVDESK_API_KEY')
     api_url = os.getenv('SEVDESK_API_URL', 'https://my.sevdesk.de/api/v1')
     db_path = os.getenv('DB_PATH', 'transactions.db')
     
-    success = reload_all_data(db_path=db_path, api_key=api_key, api_url=api_url)
+    success = reload_if_stale(db_path=db_path, api_key=api_key, api_url=api_url,
+                              delta=args.delta, jobs=args.jobs)
     
     if not success:
         sys.exit(1)
@@ -10,11 +10,15 @@ Usage:
     python3 mark_bar_kollekten_paid.py              # Show overview
     python3 mark_bar_kollekten_paid.py --mark-single # Mark one voucher as test
     python3 mark_bar_kollekten_paid.py --mark-all    # Mark all vouchers
+    python3 mark_bar_kollekten_paid.py --incremental # Only check vouchers changed since the last sync
 """
 import os
 import sys
+import time
 import argparse
-from typing import List, Dict
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -25,6 +29,9 @@ if project_root not in sys.path:
 
 from src.sevdesk.client import SevDeskClient
 from src.database.db import TransactionDB
+from src.vouchers.journal import PaymentJournal
+from src.vouchers.thread_output import map_in_order
+from scripts.loaders.load_vouchers import sync_vouchers
 
 
 # Check account ID for "Kasse"
@@ -33,6 +40,25 @@ KASSE_CHECK_ACCOUNT_ID = '5472950'
 # Cost centre names to filter (all Bar-Kollekten related)
 COST_CENTRE_NAMES = ['Bar-Kollekten', 'Bar-Kollekten Missionare']
 
+# Vouchers per API request and concurrent requests of the discovery scan
+DISCOVERY_PAGE_SIZE = 100
+DISCOVERY_JOBS = 4
+
+# Vouchers marked at the same time, retries after transient errors and
+# the delay before a retry (multiplied by the attempt number)
+MARK_JOBS = 4
+MARK_RETRIES = 2
+MARK_RETRY_DELAY = 1.0
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Check if a failed request may succeed when repeated (connection, timeout, 429, 5xx)."""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
 
 class BarKollektenMarker:
     """Mark Bar-Kollekten vouchers as paid."""
@@ -44,6 +70,8 @@ class BarKollektenMarker:
         self.db_path = 'transactions.db'
         self.client = None
         self.db = None
+        # Voucher details of this run (voucher ID -> voucher), see prefetch_voucher_details()
+        self.voucher_details: Dict[str, Dict] = {}
         
     def load_environment(self):
         """Load environment variables."""
@@ -77,7 +105,8 @@ class BarKollektenMarker:
                 ids.append(str(cc.get('id')))
         return ids
     
-    def get_open_bar_kollekten_vouchers(self):
+    def get_open_bar_kollekten_vouchers(self, incremental: bool = False, sync: bool = True,
+                                        jobs: int = DISCOVERY_JOBS):
         """
         Get all Bar-Kollekten income vouchers that need payment recording.
         
@@ -91,15 +120,19 @@ class BarKollektenMarker:
         - Bar-Kollekten
         - Bar-Kollekten Missionare
         
+        Args:
+            incremental: If True, only sync vouchers changed since the last
+                sync into the local voucher mirror and search the mirror;
+                otherwise scan all paid income vouchers via the API
+            sync: If False (incremental only), use the mirror as it is
+                (e.g. right after a data reload)
+            jobs: Number of concurrent API requests
+        
         Returns:
             List of voucher dictionaries
         """
         # Get Bar-Kollekten cost centre IDs from database
-        cost_centres = self.db.get_all_cost_centres()
-        bar_kollekten_ids = []
-        for cc in cost_centres:
-            if cc.get('name') in COST_CENTRE_NAMES:
-                bar_kollekten_ids.append(str(cc.get('id')))
+        bar_kollekten_ids = self.get_bar_kollekten_cost_centre_ids()
         
         if not bar_kollekten_ids:
             print("❌ Error: Could not find any Bar-Kollekten cost centres")
@@ -108,38 +141,177 @@ class BarKollektenMarker:
         print(f"📊 Found Bar-Kollekten cost centres: {', '.join(COST_CENTRE_NAMES)}")
         print(f"   Cost centre IDs: {', '.join(bar_kollekten_ids)}")
         
-        matching_vouchers = []
-        
         # Get paid vouchers with paidAmount=0 (status=100 but payment not recorded)
         print("🔍 Checking paid vouchers without payment record (status=100, paidAmount=0)...")
-        params = {'status': 100, 'limit': 1000}
-        response = self.client._request('GET', '/Voucher', params=params)
-        
-        if response and 'objects' in response:
-            for voucher in response['objects']:
-                cost_centre = voucher.get('costCentre')
-                credit_debit = voucher.get('creditDebit')
-                paid_amount = voucher.get('paidAmount', 0)
-                
-                if (cost_centre and 
-                    str(cost_centre.get('id')) in bar_kollekten_ids and 
-                    credit_debit == 'D' and  # D = Debit = Income
-                    paid_amount == 0):  # Payment not recorded
-                    matching_vouchers.append(voucher)
-            
-            print(f"  Found {len(matching_vouchers)} paid vouchers without payment record")
+        if incremental:
+            matches = self.find_bar_kollekten_in_mirror(bar_kollekten_ids, sync=sync, jobs=jobs)
+        else:
+            matches = self.scan_bar_kollekten_vouchers(bar_kollekten_ids, jobs=jobs)
+        
+        matching_vouchers = list(matches)
+        print(f"  Found {len(matching_vouchers)} paid vouchers without payment record")
         
         print(f"✅ Total: {len(matching_vouchers)} Bar-Kollekten income vouchers need payment recording")
         print(f"ℹ️  Note: Status 50 (Unpaid) vouchers are excluded")
         return matching_vouchers
     
-    def get_voucher_details(self, voucher_id: str) -> Dict:
-        """Get full voucher details including positions."""
+    def is_unrecorded_bar_kollekte(self, voucher: Dict, cost_centre_ids: List[str]) -> bool:
+        """
+        Check if a voucher is a paid Bar-Kollekten income voucher without payment record.
+        
+        Args:
+            voucher: Voucher dictionary from the API
+            cost_centre_ids: Bar-Kollekten cost centre IDs
+        """
+        cost_centre = voucher.get('costCentre')
+        try:
+            paid_amount = float(voucher.get('paidAmount') or 0)
+        except (TypeError, ValueError):
+            return False
+        
+        return bool(
+            cost_centre and
+            str(cost_centre.get('id')) in cost_centre_ids and
+            str(voucher.get('status')) == '100' and
+            voucher.get('creditDebit') == 'D' and  # D = Debit = Income
+            paid_amount == 0  # Payment not recorded
+        )
+    
+    def scan_bar_kollekten_vouchers(self, cost_centre_ids: List[str],
+                                    jobs: int = DISCOVERY_JOBS) -> Iterator[Dict]:
+        """
+        Scan all paid income vouchers page by page and yield the matches.
+        
+        Status and creditDebit are filtered by the API; the cost centre is
+        not a filter of GET /Voucher and is checked here, page by page.
+        
+        Args:
+            cost_centre_ids: Bar-Kollekten cost centre IDs
+            jobs: Number of concurrent page requests
+            
+        Yields:
+            Matching voucher dictionaries (most recently created first)
+        """
+        checked = 0
+        pages = 0
+        for page in self.client.iter_voucher_pages(page_size=DISCOVERY_PAGE_SIZE, jobs=jobs,
+                                                   status=100, credit_debit='D'):
+            pages += 1
+            checked += len(page)
+            for voucher in page:
+                if self.is_unrecorded_bar_kollekte(voucher, cost_centre_ids):
+                    yield voucher
+        print(f"  Scanned {checked} paid income vouchers in {pages} request(s)")
+    
+    def find_bar_kollekten_in_mirror(self, cost_centre_ids: List[str], sync: bool = True,
+                                     jobs: int = DISCOVERY_JOBS) -> Iterator[Dict]:
+        """
+        Find the vouchers in the local voucher mirror and yield the confirmed matches.
+        
+        The mirror is brought up to date incrementally first (only vouchers
+        updated since the last sync are fetched). The few candidates are then
+        fetched again to confirm they still need payment recording; candidates
+        deleted in SevDesk (404) are removed from the mirror.
+        
+        Args:
+            cost_centre_ids: Bar-Kollekten cost centre IDs
+            sync: If False, use the mirror without syncing it first
+            jobs: Number of concurrent requests for the candidates
+            
+        Yields:
+            Matching voucher dictionaries (most recently created first)
+        """
+        if sync:
+            stats = sync_vouchers(self.db, self.client, with_positions=False)
+            print(f"  Synced voucher mirror (checked {stats['checked']}, "
+                  f"new: {stats['new']}, updated: {stats['updated']})")
+        
+        candidates = self.db.get_vouchers(
+            status=100,
+            cost_centre_ids=cost_centre_ids,
+            credit_debit='D',
+            paid_amount=0
+        )
+        if not candidates:
+            return
+        
+        def fetch(row: Dict) -> Dict:
+            try:
+                return self._fetch_voucher_details(row['id'])
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    return None
+                raise
+        
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            current = list(executor.map(fetch, candidates))
+        
+        for row, voucher in zip(candidates, current):
+            if voucher is None:
+                # Deleted in SevDesk: not a candidate anymore
+                self.db.delete_voucher(row['id'])
+                continue
+            self.voucher_details[str(voucher.get('id'))] = voucher
+            if voucher.get('update') != row['update_date']:
+                # Keep the mirror current for the next run
+                self.db.insert_voucher(voucher)
+            if self.is_unrecorded_bar_kollekte(voucher, cost_centre_ids):
+                yield voucher
+    
+    def _fetch_voucher_details(self, voucher_id: str) -> Dict:
+        """Fetch full voucher details from the API (bypasses the cache)."""
         response = self.client._request('GET', f'/Voucher/{voucher_id}')
         if response and 'objects' in response and len(response['objects']) > 0:
             return response['objects'][0]
         return None
     
+    def get_voucher_details(self, voucher_id: str) -> Dict:
+        """Get full voucher details including positions (fetched once per run)."""
+        voucher_id = str(voucher_id)
+        if voucher_id not in self.voucher_details:
+            self.voucher_details[voucher_id] = self._fetch_voucher_details(voucher_id)
+        return self.voucher_details[voucher_id]
+    
+    def prefetch_voucher_details(self, vouchers: List[Dict], jobs: int = DISCOVERY_JOBS) -> int:
+        """
+        Fill the voucher detail cache for a list of vouchers.
+        
+        Vouchers from a list response that already contain sumNet are cached
+        as they are; the others are fetched concurrently.
+        
+        Args:
+            vouchers: Voucher dictionaries (at least 'id')
+            jobs: Number of concurrent requests
+            
+        Returns:
+            Number of vouchers fetched from the API
+        """
+        missing = []
+        for voucher in vouchers:
+            voucher_id = str(voucher.get('id'))
+            if voucher_id in self.voucher_details:
+                continue
+            if voucher.get('sumNet') is not None:
+                self.voucher_details[voucher_id] = voucher
+            elif voucher_id not in missing:
+                missing.append(voucher_id)
+        
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+                for voucher_id, details in zip(missing, executor.map(self._fetch_voucher_details, missing)):
+                    self.voucher_details[voucher_id] = details
+        
+        return len(missing)
+    
+    def get_voucher_amount(self, voucher: Dict) -> float:
+        """Get the net amount of a voucher (from the voucher itself or its cached details)."""
+        if voucher.get('sumNet') is not None:
+            return float(voucher.get('sumNet'))
+        full_voucher = self.get_voucher_details(voucher.get('id'))
+        if full_voucher:
+            return float(full_voucher.get('sumNet', 0))
+        return 0
+    
     def build_markdown_table(self, vouchers: List[Dict]) -> str:
         """
         Build a markdown table of vouchers to be marked as paid.
@@ -153,6 +325,9 @@ class BarKollektenMarker:
         if not vouchers:
             return "No Bar-Kollekten vouchers to mark as paid.\n"
         
+        # Amounts come from the list response or one concurrent prefetch
+        self.prefetch_voucher_details(vouchers)
+        
         lines = []
         lines.append("| # | Voucher ID | Date | Amount | Description |")
         lines.append("|---|------------|------|--------|-------------|")
@@ -162,13 +337,8 @@ class BarKollektenMarker:
             voucher_id = voucher.get('id')
             voucher_date = voucher.get('voucherDate', '')[:10]
             
-            # Get full voucher details to get sumNet
-            full_voucher = self.get_voucher_details(voucher_id)
-            if full_voucher:
-                amount = float(full_voucher.get('sumNet', 0))
-                total_amount += amount
-            else:
-                amount = 0
+            amount = self.get_voucher_amount(voucher)
+            total_amount += amount
             
             description = voucher.get('description', '')[:40]
             
@@ -208,58 +378,172 @@ class BarKollektenMarker:
         print(f"Total: {len(vouchers)} voucher(s)")
         print()
     
-    def mark_voucher_as_paid(self, voucher: Dict) -> bool:
+    def mark_voucher_as_paid(self, voucher: Dict, retries: int = MARK_RETRIES) -> bool:
         """
         Mark a single voucher as paid.
         
         Args:
             voucher: Voucher dictionary
+            retries: Number of retries after transient errors
             
         Returns:
             True if successful, False otherwise
         """
+        return self.mark_voucher(voucher, retries=retries)['success']
+    
+    def mark_voucher(self, voucher: Dict, retries: int = MARK_RETRIES) -> Dict:
+        """
+        Mark a single voucher as paid, retrying transient errors.
+        
+        Before a retry the voucher is fetched again: if the failed request
+        did record the payment, the voucher is not booked a second time.
+        
+        Args:
+            voucher: Voucher dictionary
+            retries: Number of retries after transient errors
+            
+        Returns:
+            Result dictionary with voucher_id, voucher_date, amount, success,
+            attempts and error
+        """
         voucher_id = voucher.get('id')
         voucher_date = voucher.get('voucherDate', '')[:10]
         
-        # Get full voucher details to get the correct amount
-        full_voucher = self.get_voucher_details(voucher_id)
-        if full_voucher:
-            amount = float(full_voucher.get('sumNet', 0))
-        else:
-            amount = 0
+        # Amount from the voucher or the details cached for the report
+        amount = self.get_voucher_amount(voucher)
         
         print(f"  Marking voucher {voucher_id} as paid...")
         print(f"    Date: {voucher_date}")
         print(f"    Amount: €{amount:,.2f}")
         print(f"    Account: Kasse (ID: {KASSE_CHECK_ACCOUNT_ID})")
         
+        result = {
+            'voucher_id': voucher_id,
+            'voucher_date': voucher_date,
+            'amount': amount,
+            'success': False,
+            'attempts': 0,
+            'error': None
+        }
+        
+        while True:
+            result['attempts'] += 1
+            try:
+                # Book the voucher amount
+                # For income vouchers, we need to book with positive amount
+                # The date is the voucher date (payment date = voucher date for Bar-Kollekten)
+                data = {
+                    'amount': abs(amount),  # Positive for income
+                    'date': voucher_date,
+                    'type': 'N',  # Normal payment
+                    'checkAccount': {
+                        'id': KASSE_CHECK_ACCOUNT_ID,
+                        'objectName': 'CheckAccount'
+                    },
+                    'createFeed': True
+                }
+                
+                response = self.client._request('PUT', f'/Voucher/{voucher_id}/bookAmount', data=data)
+                
+                if response:
+                    print(f"  ✓ Successfully marked voucher {voucher_id} as paid")
+                    result['success'] = True
+                    result['error'] = None
+                else:
+                    print(f"  ✗ Failed to mark voucher {voucher_id} as paid")
+                    result['error'] = 'Empty response'
+                return result
+                
+            except Exception as e:
+                result['error'] = str(e)
+                if result['attempts'] > retries or not is_transient_error(e):
+                    print(f"  ✗ Error marking voucher {voucher_id}: {e}")
+                    return result
+                
+                print(f"  ⚠️  Attempt {result['attempts']} failed ({e}), retrying...")
+                time.sleep(MARK_RETRY_DELAY * result['attempts'])
+                if self._is_payment_recorded(voucher_id):
+                    print(f"  ✓ Payment of voucher {voucher_id} was recorded by the failed attempt")
+                    result['success'] = True
+                    result['error'] = None
+                    return result
+    
+    def _is_payment_recorded(self, voucher_id: str) -> bool:
+        """Check if a voucher has a recorded payment now (errors count as not recorded)."""
+        try:
+            current = self._fetch_voucher_details(voucher_id)
+            return bool(current) and float(current.get('paidAmount') or 0) != 0
+        except Exception:
+            return False
+    
+    def mark_vouchers(self, vouchers: List[Dict], jobs: int = MARK_JOBS,
+                      retries: int = MARK_RETRIES) -> List[Dict]:
+        """
+        Mark vouchers as paid, up to `jobs` at the same time.
+        
+        Every voucher is recorded in the payment journal before the first
+        one is marked, and its result as soon as it is done. Console output
+        and results stay in voucher order.
+        
+        Args:
+            vouchers: Vouchers to mark
+            jobs: Number of vouchers marked at the same time
+            retries: Number of retries after transient errors
+            
+        Returns:
+            List of result dictionaries (see mark_voucher) in voucher order
+        """
+        if not vouchers:
+            return []
+        
+        # Amounts for the journal (one concurrent prefetch, usually cached)
+        self.prefetch_voucher_details(vouchers, jobs=jobs)
+        
+        journal = PaymentJournal(self.db_path)
         try:
-            # Book the voucher amount
-            # For income vouchers, we need to book with positive amount
-            # The date is the voucher date (payment date = voucher date for Bar-Kollekten)
-            data = {
-                'amount': abs(amount),  # Positive for income
-                'date': voucher_date,
-                'type': 'N',  # Normal payment
-                'checkAccount': {
-                    'id': KASSE_CHECK_ACCOUNT_ID,
-                    'objectName': 'CheckAccount'
-                },
-                'createFeed': True
-            }
+            journal.record_pending([{
+                'position': position,
+                'voucher_id': voucher.get('id'),
+                'voucher_date': voucher.get('voucherDate', '')[:10],
+                'amount': self.get_voucher_amount(voucher),
+                'check_account_id': KASSE_CHECK_ACCOUNT_ID,
+            } for position, voucher in enumerate(vouchers)])
             
-            response = self.client._request('PUT', f'/Voucher/{voucher_id}/bookAmount', data=data)
+            total = len(vouchers)
             
-            if response:
-                print(f"  ✓ Successfully marked voucher {voucher_id} as paid")
-                return True
-            else:
-                print(f"  ✗ Failed to mark voucher {voucher_id} as paid")
-                return False
-                
-        except Exception as e:
-            print(f"  ✗ Error marking voucher {voucher_id}: {e}")
-            return False
+            def mark(entry):
+                index, voucher = entry
+                print(f"[{index}/{total}]")
+                result = self.mark_voucher(voucher, retries=retries)
+                journal.record_result(result['voucher_id'], result['success'],
+                                      result['attempts'], error=result['error'])
+                print()
+                return result
+            
+            work = list(enumerate(vouchers, 1))
+            jobs = min(max(1, jobs), total)
+            if jobs > 1:
+                return map_in_order(mark, work, jobs)
+            return [mark(entry) for entry in work]
+        finally:
+            journal.close()
+    
+    def print_marking_report(self, results: List[Dict]):
+        """Print the results of mark_vouchers() in voucher order."""
+        if not results:
+            return
+        
+        print(f"{'#':<4} {'Voucher ID':<12} {'Date':<12} {'Amount':>12}  {'Tries':<6} {'Result':<40}")
+        print("-" * 100)
+        for i, result in enumerate(results, 1):
+            outcome = "✓ Marked" if result['success'] else f"✗ {(result['error'] or 'Failed')[:36]}"
+            print(f"{i:<4} {str(result['voucher_id']):<12} {result['voucher_date']:<12} "
+                  f"€{result['amount']:>11,.2f}  {result['attempts']:<6} {outcome:<40}")
+        print("-" * 100)
+        marked_amount = sum(result['amount'] for result in results if result['success'])
+        print(f"Marked: {sum(1 for result in results if result['success'])} of {len(results)} "
+              f"(€{marked_amount:,.2f})")
+        print()
     
     def confirm_marking(self, vouchers: List[Dict], mark_all: bool) -> bool:
         """
@@ -312,7 +596,8 @@ class BarKollektenMarker:
         
         print(f"📄 Report saved to: {output_file}")
     
-    def run(self, mark_single: bool = False, mark_all: bool = False, generate_report: bool = True):
+    def run(self, mark_single: bool = False, mark_all: bool = False, generate_report: bool = True,
+            incremental: bool = False, jobs: int = DISCOVERY_JOBS):
         """
         Main execution flow.
         
@@ -320,6 +605,8 @@ class BarKollektenMarker:
             mark_single: If True, mark only the first voucher as test
             mark_all: If True, mark all vouchers
             generate_report: If True, generate markdown report
+            incremental: If True, search the incrementally synced voucher mirror
+            jobs: Number of concurrent API requests (discovery and marking)
         """
         print("=" * 100)
         print("BAR-KOLLEKTEN VOUCHER MARKER")
@@ -332,7 +619,7 @@ class BarKollektenMarker:
         self.open_database()
         
         # Get vouchers
-        vouchers = self.get_open_bar_kollekten_vouchers()
+        vouchers = self.get_open_bar_kollekten_vouchers(incremental=incremental, jobs=jobs)
         
         # Print overview
         self.print_vouchers_overview(vouchers)
@@ -366,21 +653,16 @@ class BarKollektenMarker:
         print()
         
         vouchers_to_mark = vouchers if mark_all else [vouchers[0]]
-        success_count = 0
-        fail_count = 0
-        
-        for voucher in vouchers_to_mark:
-            if self.mark_voucher_as_paid(voucher):
-                success_count += 1
-            else:
-                fail_count += 1
-            print()
+        results = self.mark_vouchers(vouchers_to_mark, jobs=jobs)
+        success_count = sum(1 for result in results if result['success'])
+        fail_count = len(results) - success_count
         
         # Summary
         print("=" * 100)
         print("SUMMARY")
         print("=" * 100)
         print()
+        self.print_marking_report(results)
         print(f"✓ Successfully marked: {success_count}")
         if fail_count > 0:
             print(f"✗ Failed: {fail_count}")
@@ -402,11 +684,28 @@ def main():
         action='store_true',
         help='Mark all vouchers as paid'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only fetch vouchers changed since the last sync and search the local voucher mirror'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=DISCOVERY_JOBS,
+        metavar='N',
+        help=f'Concurrent API requests for finding and marking the vouchers (default: {DISCOVERY_JOBS})'
+    )
     
     args = parser.parse_args()
     
     marker = BarKollektenMarker()
-    marker.run(mark_single=args.mark_single, mark_all=args.mark_all)
+    marker.run(
+        mark_single=args.mark_single,
+        mark_all=args.mark_all,
+        incremental=args.incremental,
+        jobs=args.jobs
+    )
 
 
 if __name__ == '__main__':
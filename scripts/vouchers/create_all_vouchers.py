@@ -10,6 +10,12 @@ Usage:
     python3 create_all_vouchers.py --create-single # Create one voucher per type
     python3 create_all_vouchers.py --create-all    # Create ALL vouchers
     python3 create_all_vouchers.py --run-all       # Create ALL vouchers AND mark Bar-Kollekten as paid
+    python3 create_all_vouchers.py --resume        # Finish vouchers of an interrupted run
+    python3 create_all_vouchers.py --jobs 4        # Plan 4 voucher types / create 4 vouchers in parallel
+    python3 create_all_vouchers.py --create-all --from-plan  # Create the vouchers of the reviewed plan
+    python3 create_all_vouchers.py --only spenden,gehalt     # Only these voucher types
+    python3 create_all_vouchers.py --profile                 # cProfile statistics per phase
+    python3 create_all_vouchers.py --match-mode fuzzy --match-threshold 0.85  # Faster contact matching
 """
 import os
 import sys
@@ -23,17 +29,32 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-# Import all voucher creators
-from scripts.vouchers.create_vouchers_for_gehalt import GehaltVoucherCreator
-from scripts.vouchers.create_vouchers_for_ulp import UlpVoucherCreator
-from scripts.vouchers.create_vouchers_for_spenden import SpendenVoucherCreator
-from scripts.vouchers.create_vouchers_for_krankenkassen import KrankenkassenVoucherCreator
-from scripts.vouchers.create_vouchers_for_grace_baptist import GraceBaptistVoucherCreator
-from scripts.vouchers.create_vouchers_for_kontaktmission import KontaktmissionVoucherCreator
-from scripts.vouchers.create_vouchers_for_ebtc import EBTCVoucherCreator
-from scripts.vouchers.create_vouchers_for_jek_freizeit import JEKFreizeitVoucherCreator
-from scripts.vouchers.create_vouchers_for_geldtransit import GeldtransitVoucherCreator
-from scripts.vouchers.create_vouchers_for_fees import FeesVoucherCreator
+# Voucher creators are imported on use (see src/vouchers/registry.py)
+from src.vouchers.registry import (
+    get_creator_keys,
+    get_creator_names,
+    get_creator_entries,
+    parse_creator_selection,
+    load_creator_class
+)
+from scripts.loaders.reload_data import add_reload_policy_arguments, get_reload_policy
+from src.vouchers.name_matching import reset_contact_cache, get_contact_cache_stats
+from src.vouchers.classifier import TransactionClassifier
+from src.vouchers.voucher_utils import get_transaction_raw_data
+from src.vouchers.run_context import RunContext
+from src.vouchers.thread_output import map_in_order
+from src.vouchers.journal import resume_journal_item, claim_journal_voucher_numbers
+from src.vouchers.verification import verify_created_vouchers, VERIFY_JOBS
+from src.vouchers.profiling import get_phase_timer, start_run_timer, add_profile_arguments
+from src.vouchers.name_matching import add_match_arguments, configure_contact_matching
+from src.vouchers.plan_artifact import (
+    PLAN_ARTIFACT_NAME,
+    build_plan_artifact,
+    save_plan_artifact,
+    load_plan_artifact,
+    check_plan_staleness,
+    compute_snapshot_fingerprint
+)
 
 
 class MasterVoucherCreator:
@@ -44,34 +65,70 @@ class MasterVoucherCreator:
     and optionally creates all vouchers at once.
     """
     
-    # Define all voucher creators to run
-    VOUCHER_CREATORS = [
-        ('gehalt', GehaltVoucherCreator, '💰', 'Gehalt (Salaries)'),
-        ('ulp', UlpVoucherCreator, '🎓', 'ÜLP (Übungsleiterpauschale)'),
-        ('spenden', SpendenVoucherCreator, '💝', 'Spenden (Donations)'),
-        ('krankenkassen', KrankenkassenVoucherCreator, '🏥', 'Krankenkassen (Health Insurance)'),
-        ('grace_baptist', GraceBaptistVoucherCreator, '⛪', 'Grace Baptist'),
-        ('kontaktmission', KontaktmissionVoucherCreator, '🌍', 'Kontaktmission'),
-        ('ebtc', EBTCVoucherCreator, '📚', 'EBTC (Donations)'),
-        ('jek_freizeit', JEKFreizeitVoucherCreator, '🏕️', 'JEK Freizeit'),
-        ('geldtransit', GeldtransitVoucherCreator, '🏦', 'Geldtransit'),
-        ('fees', FeesVoucherCreator, '💳', 'Fees'),
-    ]
     
-    def __init__(self, create_mode: str = None):
+    def __init__(self, create_mode: str = None, jobs: int = 1, reload_policy: Dict = None,
+                 only: List[str] = None):
         """
         Initialize master creator.
         
         Args:
             create_mode: None (plan only), 'single', or 'all'
+            jobs: Number of voucher types planned in parallel
+            reload_policy: When to reuse the stored data instead of reloading
+                (see get_reload_policy())
+            only: Keys of the voucher types to run (None = all registered types)
         """
         self.create_mode = create_mode
+        self.jobs = max(1, jobs)
+        self.reload_policy = reload_policy or {}
+        self.only = only
         self.results: List[Dict] = []
         self.bar_kollekten_vouchers: List[Dict] = []
         self.bar_kollekten_count = 0
         self.total_vouchers = 0
         self.total_created = 0
         self.total_failed = 0
+        self.classification: Dict = None
+        self.context: RunContext = None
+        self.plan_artifact: Dict = None
+        self.bar_kollekten_marker = None
+    
+    def get_context(self) -> RunContext:
+        """
+        Get the run context shared by all creators (created on first use).
+        
+        Environment, API client, database connection, reference data and
+        voucher number allocator are set up once per master run.
+        """
+        if self.context is None:
+            self.context = RunContext.from_environment()
+            self.context.reload_policy = self.reload_policy
+        return self.context
+    
+    def _attach_marker(self, marker):
+        """Let the Bar-Kollekten marker use the shared client and database."""
+        context = self.get_context()
+        marker.api_key = context.api_key
+        marker.api_url = context.api_url
+        marker.db_path = context.db_path
+        marker.client = context.client
+        marker.db = context.db
+    
+    def get_bar_kollekten_marker(self):
+        """
+        Get the Bar-Kollekten marker of this run (created on first use).
+        
+        Report and marking share one marker, so each voucher's details are
+        fetched at most once per run.
+        """
+        if self.bar_kollekten_marker is None:
+            # Import from scripts/ directory (one level up)
+            sys.path.insert(0, os.path.join(project_root, 'scripts'))
+            from mark_bar_kollekten_paid import BarKollektenMarker
+            
+            self.bar_kollekten_marker = BarKollektenMarker()
+            self._attach_marker(self.bar_kollekten_marker)
+        return self.bar_kollekten_marker
         
     def run_all_creators(self) -> List[Dict]:
         """
@@ -87,64 +144,189 @@ class MasterVoucherCreator:
         print("Running all voucher creators...")
         print()
         
-        for key, creator_class, icon, description in self.VOUCHER_CREATORS:
-            print(f"\n{'=' * 80}")
-            print(f"{icon} Processing: {description}")
-            print('=' * 80)
-            
+        # Contact lookups are shared across creators for this run
+        reset_contact_cache()
+        context = self.get_context()
+        
+        if self.only is not None:
+            print(f"Only running: {', '.join(self.only)}")
+            print()
+        
+        # Instantiate the selected creators up front so their predicates can
+        # be evaluated in a single pass over the open transactions
+        creators = []
+        for key, icon, description in get_creator_entries(self.only):
             try:
-                result = self._run_single_creator(key, creator_class, icon, description)
-                self.results.append(result)
-                self.total_vouchers += result['voucher_count']
+                creator = load_creator_class(key)()
+                creator.use_context(context)
+                creators.append((key, creator, icon, description))
             except Exception as e:
-                print(f"\n❌ Error running {description}: {str(e)}")
-                self.results.append({
-                    'key': key,
-                    'icon': icon,
-                    'name': description,
-                    'error': str(e),
-                    'voucher_count': 0,
-                    'voucher_plan': []
-                })
+                creators.append((key, None, icon, description))
+                print(f"❌ Error initializing {description}: {str(e)}")
+        
+        self.classify_open_transactions(
+            [(key, creator) for key, creator, _, _ in creators if creator is not None]
+        )
+        
+        # Set up the shared client and reference data before planning, so
+        # planning only reads (and prints the same for any number of jobs)
+        timer = get_phase_timer()
+        with timer.span('reference data'):
+            context.prepare_shared_resources()
+        
+        with timer.span('plan'):
+            if self.jobs > 1:
+                results = self._plan_creators_parallel(creators)
+            else:
+                results = [self._plan_creator(*entry) for entry in creators]
+        
+        # Voucher numbers are assigned in registry order after all
+        # plans are built, so the numbering does not depend on the jobs
+        with timer.span('voucher numbers'):
+            self._assign_voucher_numbers(results)
+        
+        for result in results:
+            self.results.append(result)
+            self.total_vouchers += result['voucher_count']
         
         return self.results
     
+    def _plan_creator(self, key: str, creator, icon: str, description: str) -> Dict:
+        """
+        Plan a single voucher type (without voucher numbers).
+        
+        Returns:
+            Result dictionary (with 'error' if planning failed)
+        """
+        print(f"\n{'=' * 80}")
+        print(f"{icon} Processing: {description}")
+        print('=' * 80)
+        
+        try:
+            if creator is None:
+                raise RuntimeError('Creator could not be initialized')
+            with get_phase_timer().span(description):
+                return self._run_single_creator(key, creator, icon, description)
+        except Exception as e:
+            print(f"\n❌ Error running {description}: {str(e)}")
+            return {
+                'key': key,
+                'icon': icon,
+                'name': description,
+                'error': str(e),
+                'voucher_count': 0,
+                'voucher_plan': []
+            }
+    
+    def _plan_creators_parallel(self, creators: List[Tuple]) -> List[Dict]:
+        """
+        Plan the voucher types in a thread pool.
+        
+        Each worker gets its own database connection (sharing the reference
+        data snapshots) and its console output is printed in registry
+        order, so the output equals the sequential mode.
+        
+        Args:
+            creators: List of (key, creator, icon, description) tuples
+            
+        Returns:
+            List of result dictionaries in registry order
+        """
+        context = self.get_context()
+        print(f"Planning {len(creators)} voucher types with {self.jobs} parallel jobs...")
+        
+        def plan(entry):
+            with context.thread_database():
+                return self._plan_creator(*entry)
+        
+        return map_in_order(plan, creators, self.jobs)
+    
+    def _assign_voucher_numbers(self, results: List[Dict]):
+        """
+        Reserve voucher numbers for all planned vouchers, type by type.
+        
+        Args:
+            results: Planning results in registry order (updated in place)
+        """
+        for result in results:
+            if not result['voucher_plan']:
+                continue
+            
+            print(f"\n{result['icon']} Voucher numbers for: {result['name']}")
+            try:
+                result['creator'].assign_voucher_numbers(result['voucher_plan'])
+            except Exception as e:
+                print(f"\n❌ Error running {result['name']}: {str(e)}")
+                result['error'] = str(e)
+                result['voucher_count'] = 0
+                result['voucher_plan'] = []
+    
+    def classify_open_transactions(self, creators: List[Tuple[str, object]]) -> Dict:
+        """
+        Load the open transactions once and classify them for all creators.
+        
+        Args:
+            creators: List of (key, creator instance) tuples
+            
+        Returns:
+            Classification result (see TransactionClassifier.classify)
+        """
+        if not creators:
+            self.classification = None
+            return None
+        
+        # Data reload and database are shared by all creators
+        timer = get_phase_timer()
+        context = self.get_context()
+        with timer.span('reload'):
+            context.reload_data()
+        
+        with timer.span('load transactions'):
+            print("Fetching open transactions...")
+            open_transactions = context.db.get_all_transactions(status=100)
+            print(f"✓ Found {len(open_transactions)} open transactions")
+        
+        with timer.span('classify'):
+            classifier = TransactionClassifier(creators)
+            self.classification = classifier.classify(open_transactions)
+        
+        claimed = self.classification['total'] - len(self.classification['unclaimed'])
+        print(f"✓ Classified in one pass: {claimed} claimed, "
+              f"{len(self.classification['unclaimed'])} unclassified, "
+              f"{len(self.classification['multi_claimed'])} claimed by several types")
+        print()
+        
+        return self.classification
+    
     def _run_single_creator(
         self,
         key: str,
-        creator_class,
+        creator,
         icon: str,
         description: str
     ) -> Dict:
         """
         Run a single voucher creator and capture results.
         
+        The creator's transactions come from the shared classification pass;
+        it only falls back to its own filter if no classification is available.
+        
         Args:
             key: Voucher type key (e.g., 'gehalt')
-            creator_class: Creator class to instantiate
+            creator: Creator instance
             icon: Icon for display
             description: Human-readable description
             
         Returns:
             Result dictionary with voucher plan
         """
-        # Create instance
-        creator = creator_class()
-        
         # Suppress create mode for planning phase
         original_args = argparse.Namespace(create_single=False, create_all=False)
         creator.args = original_args
         
-        # Run the setup
+        # Run the setup (shared via the run context, reload happens only once)
         creator.load_environment()
-        
-        # Skip reload if already done
-        if not hasattr(self, '_data_reloaded'):
-            creator.reload_data()
-            self._data_reloaded = True
-        else:
-            print("(Skipping data reload - already done)")
-            print()
+        creator.reload_data()
         
         # Initialize API client
         creator.initialize_api_client()
@@ -165,9 +347,15 @@ class MasterVoucherCreator:
                     'voucher_plan': []
                 }
             
-            # Get and filter transactions
-            all_transactions = creator.get_open_transactions(db)
-            filtered_transactions = creator.filter_transactions(all_transactions)
+            # Take the transactions from the classification pass
+            if self.classification is not None:
+                if key in self.classification['errors']:
+                    raise RuntimeError(f"Filter failed: {self.classification['errors'][key]}")
+                filtered_transactions = self.classification['partitions'].get(key, [])
+            else:
+                all_transactions = creator.get_open_transactions(db)
+                with get_phase_timer().span('filter'):
+                    filtered_transactions = creator.filter_transactions(all_transactions)
             
             if not filtered_transactions:
                 print(f"No matching transactions found for {description}")
@@ -182,8 +370,8 @@ class MasterVoucherCreator:
             
             print(f"✓ Found {len(filtered_transactions)} matching transactions")
             
-            # Generate voucher plan
-            voucher_plan = creator.generate_voucher_plan(filtered_transactions)
+            # Build voucher plan (numbers are assigned after all types are planned)
+            voucher_plan = creator.build_voucher_plan(filtered_transactions)
         
         return {
             'key': key,
@@ -195,26 +383,35 @@ class MasterVoucherCreator:
             'accounting_type': creator.accounting_type
         }
     
+    def _find_bar_kollekten_vouchers(self, marker) -> List[Dict]:
+        """
+        Find the Bar-Kollekten vouchers to mark as paid.
+        
+        Right after the data reload the voucher mirror is current (its sync
+        picks up every voucher updated since the last sync, including old
+        vouchers marked as paid later), so only the mirror is searched
+        (reused data is synced first); otherwise the paid vouchers are scanned.
+        """
+        context = self.get_context()
+        jobs = max(self.jobs, VERIFY_JOBS)
+        if context.data_reloaded:
+            may_be_reused = self.reload_policy.get('max_data_age') is not None or self.reload_policy.get('no_reload')
+            return marker.get_open_bar_kollekten_vouchers(incremental=True, sync=bool(may_be_reused), jobs=jobs)
+        return marker.get_open_bar_kollekten_vouchers(jobs=jobs)
+    
     def get_bar_kollekten_vouchers(self):
         """
         Get Bar-Kollekten vouchers that need to be marked as paid.
         Returns a markdown table section.
         """
         try:
-            # Import from scripts/ directory (one level up)
-            sys.path.insert(0, os.path.join(project_root, 'scripts'))
-            from mark_bar_kollekten_paid import BarKollektenMarker
-            
             print("\n" + "=" * 80)
             print("💰 Checking Bar-Kollekten vouchers to mark as paid...")
             print("=" * 80)
             
-            marker = BarKollektenMarker()
-            marker.load_environment()
-            marker.initialize_api_client()
-            marker.open_database()
+            marker = self.get_bar_kollekten_marker()
             
-            vouchers = marker.get_open_bar_kollekten_vouchers()
+            vouchers = self._find_bar_kollekten_vouchers(marker)
             
             if vouchers:
                 print(f"✓ Found {len(vouchers)} Bar-Kollekten vouchers to mark as paid")
@@ -250,6 +447,11 @@ class MasterVoucherCreator:
         markdown_lines.append("")
         markdown_lines.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         markdown_lines.append(f"**Total Vouchers:** {self.total_vouchers}")
+        if self.only is not None:
+            markdown_lines.append(f"**Voucher Types:** only {', '.join(self.only)}")
+        if self.plan_artifact:
+            markdown_lines.append(f"**Plan ID:** {self.plan_artifact['plan_id']} "
+                                  f"(create with `--create-all --from-plan`)")
         markdown_lines.append("")
         
         # Summary table
@@ -311,6 +513,8 @@ class MasterVoucherCreator:
                 
                 contact = plan.get('contact')
                 contact_display = "✅" if contact else "❌"
+                if contact and plan.get('contact_score') is not None:
+                    contact_display += f" {plan['contact_score']:.0%}"
                 
                 if show_donation:
                     donation_type = plan.get('donation_type', 'general')
@@ -359,6 +563,34 @@ class MasterVoucherCreator:
             markdown_lines.append(f"*See detailed report: `reports/bar_kollekten_to_mark.md`*")
             markdown_lines.append("")
         
+        # Classification report (transactions claimed by several types / by none)
+        if self.classification:
+            names = get_creator_names()
+            
+            if self.classification['multi_claimed']:
+                markdown_lines.append("## 🔀 Transactions Claimed by Several Types")
+                markdown_lines.append("")
+                markdown_lines.append("These transactions appear in more than one plan. Check the filters before creating vouchers.")
+                markdown_lines.append("")
+                markdown_lines.append("| # | Date | Amount | Payee/Payer | Purpose | Claimed By |")
+                markdown_lines.append("|---|------|--------|-------------|---------|------------|")
+                for i, entry in enumerate(self.classification['multi_claimed'], 1):
+                    claimed_by = ', '.join(names.get(key, key) for key in entry['claimed_by'])
+                    markdown_lines.append(f"{self._transaction_row(i, entry['transaction'])} {claimed_by} |")
+                markdown_lines.append("")
+            
+            unclaimed = self.classification['unclaimed']
+            markdown_lines.append("## ❓ Unclassified Open Transactions")
+            markdown_lines.append("")
+            markdown_lines.append(f"**Count:** {len(unclaimed)} of {self.classification['total']} open transactions match no voucher type")
+            markdown_lines.append("")
+            if unclaimed:
+                markdown_lines.append("| # | Date | Amount | Payee/Payer | Purpose |")
+                markdown_lines.append("|---|------|--------|-------------|---------|")
+                for i, txn in enumerate(unclaimed, 1):
+                    markdown_lines.append(self._transaction_row(i, txn))
+                markdown_lines.append("")
+        
         # Warnings section
         warnings = []
         for result in self.results:
@@ -415,6 +647,14 @@ class MasterVoucherCreator:
         
         return output_file
     
+    def _transaction_row(self, index: int, txn: Dict) -> str:
+        """Build a markdown table row for an open transaction."""
+        date = (txn.get('value_date') or '')[:10]
+        amount = float(txn.get('amount') or 0)
+        payee = (get_transaction_raw_data(txn).get('payeePayerName') or '')[:30]
+        purpose = (txn.get('paymt_purpose') or '')[:40]
+        return f"| {index} | {date} | €{amount:,.2f} | {payee} | {purpose} |"
+    
     def print_summary(self, output_file: str):
         """Print console summary of all results."""
         print("\n" + "=" * 80)
@@ -447,6 +687,28 @@ class MasterVoucherCreator:
         print(f"{'TOTAL':<42} {self.total_vouchers:<8}")
         print()
         
+        # Classification statistics
+        if self.classification:
+            print(f"Open transactions: {self.classification['total']} "
+                  f"({len(self.classification['unclaimed'])} unclassified, "
+                  f"{len(self.classification['multi_claimed'])} claimed by several types)")
+            print()
+        
+        # Shared setup
+        if self.context is not None:
+            context_stats = self.context.get_stats()
+            print(f"Shared setup: 1 API client, 1 database connection, "
+                  f"{context_stats['snapshot_loads']} reference data load(s) for {len(self.results)} creators")
+            print()
+        
+        # Contact lookup cache statistics
+        cache_stats = get_contact_cache_stats()
+        lookups = cache_stats['hits'] + cache_stats['misses']
+        if lookups > 0:
+            print(f"Contact lookups: {lookups} ({cache_stats['hits']} cached, "
+                  f"{cache_stats['misses']} resolved, {cache_stats['hit_rate'] * 100:.0f}% hit rate)")
+            print()
+        
         # Warnings
         has_warnings = False
         for result in self.results:
@@ -463,6 +725,9 @@ class MasterVoucherCreator:
         print(f"  1. Review the unified plan: {output_file}")
         print("  2. Test with one voucher per type: python3 create_all_vouchers.py --create-single")
         print("  3. Create all vouchers: python3 create_all_vouchers.py --create-all")
+        if self.plan_artifact:
+            print(f"     (add --from-plan to create exactly the reviewed plan {self.plan_artifact['plan_id']}"
+                  f" without reloading)")
         if self.bar_kollekten_count > 0:
             print(f"  4. OR run everything at once: python3 create_all_vouchers.py --run-all")
             print(f"     (creates vouchers + marks {self.bar_kollekten_count} Bar-Kollekten as paid)")
@@ -512,34 +777,30 @@ class MasterVoucherCreator:
         print()
         
         # Create vouchers for each type
-        for result in results_with_vouchers:
-            print(f"\n{'=' * 80}")
-            print(f"{result['icon']} Creating vouchers for: {result['name']}")
-            print('=' * 80)
-            
-            creator = result['creator']
-            voucher_plan = result['voucher_plan']
-            
-            # Set create mode
-            creator.args = argparse.Namespace(
-                create_single=create_single,
-                create_all=not create_single
-            )
-            
-            try:
-                # Get check account and sev client IDs from first transaction
-                import json
-                first_txn = voucher_plan[0]
-                # We need to get the raw transaction data
-                with creator.open_database() as db:
-                    creator.db = db
-                    all_txns = db.get_all_transactions(status=100)
-                    matching_txn = next((t for t in all_txns if t['id'] == first_txn['transaction_id']), None)
+        created_by_type: List[Tuple[Dict, List[Dict]]] = []
+        timer = get_phase_timer()
+        with timer.span('create vouchers'):
+            for result in results_with_vouchers:
+                print(f"\n{'=' * 80}")
+                print(f"{result['icon']} Creating vouchers for: {result['name']}")
+                print('=' * 80)
+                
+                creator = result['creator']
+                voucher_plan = result['voucher_plan']
+                
+                # Set create mode
+                creator.args = argparse.Namespace(
+                    create_single=create_single,
+                    create_all=not create_single,
+                    jobs=self.jobs
+                )
+                
+                try:
+                    # Check account and sev client IDs (saved plan or first transaction)
+                    account_ids = self._get_account_ids(result)
                     
-                    if matching_txn:
-                        raw_data = json.loads(matching_txn.get('raw_data', '{}'))
-                        check_account_id = raw_data.get('checkAccount', {}).get('id')
-                        sev_client_id = raw_data.get('sevClient', {}).get('id')
+                    if account_ids:
+                        check_account_id, sev_client_id = account_ids
                         
                         # Create vouchers
                         created, failed = creator.create_vouchers(
@@ -553,15 +814,19 @@ class MasterVoucherCreator:
                         
                         creator.print_creation_summary(created, failed)
                         
-                        if created:
-                            creator.verify_transaction_statuses(created)
+                        # Verified together with all other types at the end
+                        created_by_type.append((result, created))
                     else:
                         print(f"❌ Could not find transaction data for {result['name']}")
                         self.total_failed += len(voucher_plan)
                         
-            except Exception as e:
-                print(f"❌ Error creating vouchers for {result['name']}: {str(e)}")
-                self.total_failed += len(voucher_plan)
+                except Exception as e:
+                    print(f"❌ Error creating vouchers for {result['name']}: {str(e)}")
+                    self.total_failed += len(voucher_plan)
+        
+        # One verification pass for all voucher types
+        with timer.span('verify'):
+            self.verify_all_created_vouchers(created_by_type)
         
         # Final summary
         print("\n" + "=" * 80)
@@ -590,6 +855,81 @@ class MasterVoucherCreator:
         
         print("=" * 80)
     
+    def _get_account_ids(self, result: Dict) -> Tuple[str, str]:
+        """
+        Get the check account and sev client IDs for a voucher type.
+        
+        Saved plans contain the IDs; otherwise they are read from the raw
+        data of the first planned transaction.
+        
+        Returns:
+            Tuple of (check_account_id, sev_client_id) or None if not found
+        """
+        if result.get('check_account_id'):
+            return result['check_account_id'], result.get('sev_client_id')
+        
+        import json
+        first_txn = result['voucher_plan'][0]
+        creator = result['creator']
+        with creator.open_database() as db:
+            creator.db = db
+            matching_txn = db.get_transaction(str(first_txn['transaction_id']))
+        
+        if not matching_txn:
+            return None
+        raw_data = json.loads(matching_txn.get('raw_data') or '{}')
+        return raw_data.get('checkAccount', {}).get('id'), raw_data.get('sevClient', {}).get('id')
+    
+    def verify_all_created_vouchers(self, created_by_type: List[Tuple[Dict, List[Dict]]]) -> Dict:
+        """
+        Verify the transactions of all created vouchers in one pass.
+        
+        Args:
+            created_by_type: List of (result, created vouchers) per voucher type
+            
+        Returns:
+            Verification statistics (see verify_created_vouchers)
+        """
+        all_created = [created for _, created_list in created_by_type for created in created_list]
+        if not all_created:
+            return {}
+        
+        print("\n" + "=" * 80)
+        print("🔍 VERIFYING TRANSACTION STATUSES (ALL TYPES)")
+        print("=" * 80)
+        print()
+        
+        context = self.get_context()
+        try:
+            stats = verify_created_vouchers(
+                context.client,
+                context.db,
+                all_created,
+                jobs=max(self.jobs, VERIFY_JOBS)
+            )
+        except Exception as e:
+            print(f"❌ Error during verification: {str(e)}")
+            print()
+            return {}
+        
+        # Per-type summary
+        print("Verification by Type:")
+        print(f"{'Icon':<6} {'Type':<35} {'Changed':<8} {'Open':<8} {'Missing':<8}")
+        print("-" * 70)
+        for result, created_list in created_by_type:
+            if not created_list:
+                continue
+            counts = {'changed': 0, 'unchanged': 0, 'missing': 0}
+            for created in created_list:
+                counts[stats['outcomes'].get(str(created['plan']['transaction_id']), 'missing')] += 1
+            print(f"{result['icon']:<6} {result['name']:<35} {counts['changed']:<8} "
+                  f"{counts['unchanged']:<8} {counts['missing']:<8}")
+        print("-" * 70)
+        print(f"{'TOTAL':<42} {stats['changed']:<8} {stats['unchanged']:<8} {stats['missing']:<8}")
+        print()
+        
+        return stats
+    
     def mark_bar_kollekten_vouchers(self):
         """
         Mark all Bar-Kollekten vouchers as paid.
@@ -598,21 +938,14 @@ class MasterVoucherCreator:
             Tuple of (marked_count, failed_count)
         """
         try:
-            # Import from scripts/ directory (one level up)
-            sys.path.insert(0, os.path.join(project_root, 'scripts'))
-            from mark_bar_kollekten_paid import BarKollektenMarker
-            
             print("\n" + "=" * 80)
             print("💰 MARKING BAR-KOLLEKTEN VOUCHERS AS PAID")
             print("=" * 80)
             print()
             
-            marker = BarKollektenMarker()
-            marker.load_environment()
-            marker.initialize_api_client()
-            marker.open_database()
+            marker = self.get_bar_kollekten_marker()
             
-            vouchers = marker.get_open_bar_kollekten_vouchers()
+            vouchers = self._find_bar_kollekten_vouchers(marker)
             
             if not vouchers:
                 print("✓ No Bar-Kollekten vouchers to mark")
@@ -622,28 +955,16 @@ class MasterVoucherCreator:
             print(f"💳 Payment account: Kasse (ID: 5472950)")
             print()
             
-            marked_count = 0
-            failed_count = 0
+            from mark_bar_kollekten_paid import MARK_JOBS
+            results = marker.mark_vouchers(vouchers, jobs=max(self.jobs, MARK_JOBS))
+            marked_count = sum(1 for result in results if result['success'])
+            failed_count = len(results) - marked_count
             
-            for i, voucher in enumerate(vouchers, 1):
-                voucher_id = voucher.get('id')
-                voucher_date = voucher.get('voucherDate', '')[:10]
-                amount = float(voucher.get('sumNet', 0))
-                
-                print(f"[{i}/{len(vouchers)}] Marking voucher {voucher_id} (€{amount:,.2f})...", end=' ')
-                
-                if marker.mark_voucher_as_paid(voucher):
-                    marked_count += 1
-                    print("✓")
-                else:
-                    failed_count += 1
-                    print("✗")
-            
-            print()
             print("=" * 80)
             print("💰 BAR-KOLLEKTEN MARKING COMPLETED")
             print("=" * 80)
             print()
+            marker.print_marking_report(results)
             print(f"✓ Successfully marked: {marked_count} voucher(s)")
             if failed_count > 0:
                 print(f"❌ Failed: {failed_count} voucher(s)")
@@ -655,7 +976,187 @@ class MasterVoucherCreator:
             print(f"❌ Error marking Bar-Kollekten vouchers: {e}")
             return 0, 0
     
-    def run(self, create_single: bool = False, create_all: bool = False, run_all: bool = False):
+    def resume_interrupted_run(self):
+        """
+        Finish the unfinished vouchers recorded in the voucher journal.
+        
+        Nothing is reloaded or re-planned: planned items are created and
+        booked, created items are only booked (see src/vouchers/journal.py).
+        """
+        print("=" * 80)
+        print("🔁 RESUMING INTERRUPTED VOUCHER CREATION")
+        print("=" * 80)
+        print()
+        
+        context = self.get_context()
+        journal = context.journal
+        items = journal.get_pending_items()
+        
+        if not items:
+            print("✓ No unfinished vouchers in the journal")
+            print()
+            return
+        
+        print(f"{'#':<4} {'Type':<15} {'Transaction':<12} {'Voucher Nr':<14} {'Status':<10} {'Amount':>12}")
+        print("-" * 72)
+        for i, item in enumerate(items, 1):
+            plan = item['plan']
+            print(f"{i:<4} {item['creator'][:15]:<15} {item['transaction_id']:<12} "
+                  f"{str(plan.get('voucher_number') or ''):<14} {item['status']:<10} "
+                  f"€{float(plan.get('amount') or 0):>11,.2f}")
+        print("-" * 72)
+        print()
+        
+        response = input(f"Do you want to finish these {len(items)} voucher(s)? (y/N): ").strip().lower()
+        if response != 'y':
+            print("\n❌ Cancelled by user.")
+            return
+        print()
+        
+        client = context.client
+        
+        # The interrupted run released its voucher numbers; reserve them again
+        # (created vouchers mark them as used through the allocator)
+        conflicts = claim_journal_voucher_numbers(client, journal, context.allocator, items)
+        if conflicts:
+            print(f"❌ {len(conflicts)} voucher number(s) of the journal are no longer available: "
+                  f"{', '.join(conflicts[:5])}{' ...' if len(conflicts) > 5 else ''}")
+            print("   They were used or are reserved by another running process; nothing was created.")
+            print()
+            self.total_failed = len(items)
+            return
+        
+        total = len(items)
+        work = [(i, item) for i, item in enumerate(items, 1)]
+        
+        def resume(entry):
+            index, item = entry
+            return resume_journal_item(client, journal, item, index, total)
+        
+        if self.jobs > 1:
+            outcomes = map_in_order(resume, work, min(self.jobs, total))
+        else:
+            outcomes = [resume(entry) for entry in work]
+        
+        self.total_created = sum(1 for ok in outcomes if ok)
+        self.total_failed = total - self.total_created
+        
+        print("=" * 80)
+        print("🔁 RESUME COMPLETED")
+        print("=" * 80)
+        print()
+        print(f"✓ Finished: {self.total_created} voucher(s)")
+        if self.total_failed > 0:
+            print(f"❌ Still unfinished or failed: {self.total_failed} voucher(s)")
+        print()
+    
+    def load_saved_plan(self, plan_path: str) -> bool:
+        """
+        Load a saved plan instead of reloading data and re-planning.
+        
+        Only the planned transactions are fetched from the API: items whose
+        transaction is no longer open or changed since planning are dropped.
+        The voucher numbers of the plan are reserved again; if any of them
+        was used in the meantime, the plan cannot be executed.
+        
+        Args:
+            plan_path: Path to the plan artifact (voucher_plan_all.json)
+            
+        Returns:
+            True if the plan is loaded and can be executed
+        """
+        print("=" * 80)
+        print("📂 LOADING SAVED VOUCHER PLAN")
+        print("=" * 80)
+        print()
+        
+        try:
+            artifact = load_plan_artifact(plan_path)
+        except FileNotFoundError:
+            print(f"❌ Plan file not found: {plan_path}")
+            print("   Create it first: python3 scripts/vouchers/create_all_vouchers.py")
+            return False
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+        
+        if self.only is not None:
+            artifact['types'] = [entry for entry in artifact['types'] if entry['key'] in self.only]
+            print(f"Only running: {', '.join(self.only)}")
+        
+        planned_count = sum(len(entry['voucher_plan']) for entry in artifact['types'])
+        print(f"Plan file: {plan_path}")
+        print(f"Plan ID:   {artifact['plan_id']} (planned {artifact['created_at'][:19]})")
+        print(f"Vouchers:  {planned_count} across {len(artifact['types'])} types")
+        print()
+        
+        context = self.get_context()
+        if compute_snapshot_fingerprint(context.db) == artifact['fingerprint']:
+            print("✓ Local database unchanged since planning")
+        else:
+            print("ℹ️  Local database changed since planning (planned transactions are checked below)")
+        print()
+        
+        # Cheap staleness check: only the planned transactions
+        print(f"Checking {planned_count} planned transaction(s)...")
+        staleness = check_plan_staleness(context.client, artifact, jobs=max(self.jobs, VERIFY_JOBS))
+        if staleness['stale']:
+            print(f"⚠️  {len(staleness['stale'])} planned voucher(s) are out of date and will be skipped:")
+            for item in staleness['stale']:
+                print(f"   - {item['type']}: transaction {item['transaction_id']} "
+                      f"({item['voucher_number']}): {item['reason']}")
+        else:
+            print(f"✓ All {staleness['checked']} planned transaction(s) unchanged")
+        print()
+        
+        # Reserve the reviewed voucher numbers for this run
+        voucher_numbers = [
+            plan['voucher_number']
+            for entry in artifact['types']
+            for plan in entry['voucher_plan']
+        ]
+        if voucher_numbers:
+            print("Reserving the planned voucher numbers...")
+            conflicts = context.allocator.claim(context.client, voucher_numbers)
+            if conflicts:
+                print(f"❌ {len(conflicts)} planned voucher number(s) are no longer available: "
+                      f"{', '.join(conflicts[:5])}{' ...' if len(conflicts) > 5 else ''}")
+                print("   Please re-run the planning: python3 scripts/vouchers/create_all_vouchers.py")
+                return False
+            print(f"✓ Reserved {len(voucher_numbers)} voucher numbers")
+            print()
+        
+        # Creators are only needed for creating (nothing is re-planned)
+        self.results = []
+        for entry in artifact['types']:
+            if not entry['voucher_plan']:
+                continue
+            if entry['key'] not in get_creator_keys():
+                print(f"❌ Unknown voucher type in plan: {entry['key']}")
+                return False
+            creator = load_creator_class(entry['key'])()
+            creator.use_context(context)
+            creator.initialize_api_client()
+            creator.accounting_type = entry['accounting_type']
+            
+            self.results.append({
+                'key': entry['key'],
+                'icon': entry['icon'],
+                'name': entry['name'],
+                'voucher_count': len(entry['voucher_plan']),
+                'voucher_plan': entry['voucher_plan'],
+                'creator': creator,
+                'accounting_type': entry['accounting_type'],
+                'check_account_id': entry['check_account_id'],
+                'sev_client_id': entry['sev_client_id']
+            })
+        
+        self.total_vouchers = sum(r['voucher_count'] for r in self.results)
+        self.plan_artifact = artifact
+        return True
+    
+    def run(self, create_single: bool = False, create_all: bool = False, run_all: bool = False,
+            resume: bool = False, from_plan: str = None):
         """
         Main execution flow.
         
@@ -663,12 +1164,48 @@ class MasterVoucherCreator:
             create_single: Create one voucher per type (test mode)
             create_all: Create all vouchers for all types
             run_all: Create all vouchers AND mark Bar-Kollekten as paid
+            resume: Only finish the vouchers of an interrupted run
+            from_plan: Path to a saved plan to create instead of re-planning
         """
+        timer = get_phase_timer()
+        try:
+            if resume:
+                self.resume_interrupted_run()
+            elif from_plan:
+                self._run_from_plan(from_plan, create_single=create_single, run_all=run_all)
+            else:
+                self._run(create_single=create_single, create_all=create_all, run_all=run_all)
+        finally:
+            self.bar_kollekten_marker = None
+            if self.context is not None:
+                self.context.close()
+                self.context = None
+            timer.print_table()
+            timer.close()
+    
+    def _run(self, create_single: bool, create_all: bool, run_all: bool):
+        """Execution flow of run() (the run context is closed afterwards)."""
         # Run all creators and collect results
         self.run_all_creators()
         
+        timer = get_phase_timer()
+        
+        # Plan artifact for --from-plan (its ID is shown in the markdown)
+        with timer.span('plan artifact'):
+            try:
+                self.plan_artifact = build_plan_artifact(self.results, self.get_context().db)
+            except Exception as e:
+                print(f"⚠️  Warning: Could not build the plan file: {e}")
+                self.plan_artifact = None
+        
         # Generate unified markdown
-        output_file = self.generate_unified_markdown()
+        with timer.span('markdown'):
+            output_file = self.generate_unified_markdown()
+        
+        if self.plan_artifact:
+            with timer.span('plan artifact'):
+                plan_file = save_plan_artifact(self.plan_artifact, os.path.join(project_root, PLAN_ARTIFACT_NAME))
+            print(f"\n✓ Saved plan {self.plan_artifact['plan_id']} to {plan_file}")
         
         # Print summary
         self.print_summary(output_file)
@@ -700,7 +1237,27 @@ class MasterVoucherCreator:
         
         # Mark Bar-Kollekten vouchers if run_all
         if run_all and self.bar_kollekten_count > 0:
-            self.mark_bar_kollekten_vouchers()
+            with timer.span('mark bar-kollekten'):
+                self.mark_bar_kollekten_vouchers()
+    
+    def _run_from_plan(self, plan_path: str, create_single: bool, run_all: bool):
+        """Execution flow of run() for a saved plan (no reload, no re-planning)."""
+        timer = get_phase_timer()
+        with timer.span('load plan'):
+            loaded = self.load_saved_plan(plan_path)
+        if not loaded:
+            return
+        
+        if self.total_vouchers > 0:
+            self.create_all_vouchers(create_single=create_single)
+        else:
+            print("✓ No vouchers left to create from this plan")
+            print()
+        
+        # Bar-Kollekten are looked up now (they are not part of the plan)
+        if run_all:
+            with timer.span('mark bar-kollekten'):
+                self.mark_bar_kollekten_vouchers()
 
 
 def main():
@@ -723,23 +1280,70 @@ def main():
         action='store_true',
         help='Run ALL operations: Create vouchers AND mark Bar-Kollekten as paid'
     )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Finish the vouchers of an interrupted run (no reload, no re-planning)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Plan N voucher types in parallel and create N vouchers at the same time (default: 1)'
+    )
+    parser.add_argument(
+        '--from-plan',
+        nargs='?',
+        const=os.path.join(project_root, PLAN_ARTIFACT_NAME),
+        default=None,
+        metavar='PLAN_FILE',
+        help=f'Create the vouchers of a saved plan instead of reloading and re-planning '
+             f'(default file: {PLAN_ARTIFACT_NAME}); use with --create-all, --create-single or --run-all'
+    )
+    parser.add_argument(
+        '--only',
+        default=None,
+        metavar='TYPES',
+        help=f'Comma-separated voucher types to run (default: all): {",".join(get_creator_keys())}'
+    )
+    add_reload_policy_arguments(parser)
+    add_match_arguments(parser)
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
+    if args.from_plan and not (args.create_single or args.create_all or args.run_all):
+        parser.error('--from-plan requires --create-all, --create-single or --run-all')
+    
+    try:
+        only = parse_creator_selection(args.only)
+    except ValueError as e:
+        parser.error(str(e))
+    
     # Load environment
     load_dotenv()
     
+    # Contact matching options of all voucher types (command line or .env)
+    try:
+        configure_contact_matching(args)
+    except ValueError as e:
+        parser.error(str(e))
+    
     # Validate
     api_key = os.getenv('SEVDESK_API_KEY')
     if not api_key:
         print("Error: SEVDESK_API_KEY not found in environment variables.")
         sys.exit(1)
     
-    # Run master creator
-    master = MasterVoucherCreator()
+    # Run master creator (phases are timed, see src/vouchers/profiling.py)
+    start_run_timer(args)
+    master = MasterVoucherCreator(jobs=args.jobs, reload_policy=get_reload_policy(args), only=only)
     master.run(
         create_single=args.create_single, 
         create_all=args.create_all,
-        run_all=args.run_all
+        run_all=args.run_all,
+        resume=args.resume,
+        from_plan=args.from_plan
     )
 
 
@@ -16,7 +16,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 import os
 import sys
 import json
-from typing import List, Dict, Optional
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -81,19 +81,9 @@ class BankeinzugVoucherCreator(VoucherCreatorBase):
         print()
         return True
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """Filter transactions with 'Bankeinzug' in payeePayerName."""
-        bankeinzug_transactions = []
-        for txn in all_transactions:
-            # Parse raw data to check payeePayerName
-            raw_data = json.loads(txn.get('raw_data', '{}'))
-            payee_payer_name = raw_data.get('payeePayerName', '') or ''
-            
-            # Check for "Bankeinzug" in payeePayerName (case-insensitive)
-            if 'BANKEINZUG' in payee_payer_name.upper() or 'Bankeinzug' in payee_payer_name:
-                bankeinzug_transactions.append(txn)
-        
-        return bankeinzug_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'bankeinzug'
     
     def build_voucher_plan_item(
         self,
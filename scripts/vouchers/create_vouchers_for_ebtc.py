@@ -13,8 +13,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 """
 import os
 import sys
-import json
-from typing import List, Dict
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,7 +21,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.vouchers.voucher_creator_base import VoucherCreatorBase
-from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name
+from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name, get_transaction_raw_data
 
 
 # Cost centre for outgoing donations
@@ -77,28 +76,9 @@ class EBTCVoucherCreator(VoucherCreatorBase):
         print()
         return True
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """Filter transactions for EBTC donations (outgoing with 'Spende' in purpose)."""
-        ebtc_transactions = []
-        for txn in all_transactions:
-            raw_data = json.loads(txn.get('raw_data', '{}'))
-            payee = raw_data.get('payeePayerName', '') or ''
-            purpose = txn.get('paymt_purpose', '') or ''
-            amount = float(txn.get('amount', 0))
-            
-            # Only include expense transactions (negative amounts)
-            if amount < 0:
-                # Check if EBTC is the recipient
-                payee_upper = payee.upper()
-                purpose_upper = purpose.upper()
-                
-                is_ebtc = 'EBTC' in payee_upper or 'EBTC' in purpose_upper
-                has_spende = 'SPENDE' in purpose_upper or 'Spende' in purpose
-                
-                if is_ebtc and has_spende:
-                    ebtc_transactions.append(txn)
-        
-        return ebtc_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'ebtc'
     
     def build_voucher_plan_item(
         self,
@@ -108,7 +88,7 @@ class EBTCVoucherCreator(VoucherCreatorBase):
     ) -> Dict:
         """Build voucher plan item for an EBTC transaction."""
         # Parse raw data to get payeePayerName
-        raw_data = json.loads(transaction.get('raw_data', '{}'))
+        raw_data = get_transaction_raw_data(transaction)
         payee_payer_name = raw_data.get('payeePayerName', 'Unknown')
         
         # Find matching contact (try to find EBTC)
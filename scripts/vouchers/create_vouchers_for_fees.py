@@ -16,8 +16,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 """
 import os
 import sys
-import json
-from typing import List, Dict, Optional
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -25,7 +24,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.vouchers.voucher_creator_base import VoucherCreatorBase
-from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name
+from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name, find_contact_match, get_transaction_raw_data
 
 
 # Cost centre name
@@ -91,32 +90,9 @@ class FeesVoucherCreator(VoucherCreatorBase):
         print()
         return True
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """
-        Filter transactions matching fee criteria:
-        1. Name: "Paypal Inc." AND Purpose contains: "Gebühren zu", OR
-        2. Purpose contains: "Saldo der Abschlussposten QM"
-        """
-        fee_transactions = []
-        for txn in all_transactions:
-            # Parse raw data to check payeePayerName
-            raw_data = json.loads(txn.get('raw_data', '{}'))
-            payee_payer_name = raw_data.get('payeePayerName', '') or ''
-            payment_purpose = txn.get('paymt_purpose', '') or ''
-            
-            # Condition 1: Check for "Paypal Inc." in payeePayerName and "Gebühren zu" in purpose
-            is_paypal_inc = 'Paypal Inc.' in payee_payer_name
-            has_gebuehren = 'Gebühren zu' in payment_purpose
-            is_paypal_fee = is_paypal_inc and has_gebuehren
-            
-            # Condition 2: Check for "Saldo der Abschlussposten QM" in purpose
-            has_saldo_abschluss = 'Saldo der Abschlussposten QM' in payment_purpose
-            
-            # Add if either condition is met
-            if is_paypal_fee or has_saldo_abschluss:
-                fee_transactions.append(txn)
-        
-        return fee_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'fees'
     
     def build_voucher_plan_item(
         self,
@@ -126,17 +102,20 @@ class FeesVoucherCreator(VoucherCreatorBase):
     ) -> Dict:
         """Build voucher plan item for a fee transaction."""
         # Parse raw data to get payeePayerName
-        raw_data = json.loads(transaction.get('raw_data', '{}'))
+        raw_data = get_transaction_raw_data(transaction)
         payee_payer_name = raw_data.get('payeePayerName', '') or 'Unknown'
         
         # Use the configured cost centre
         cost_centre = self.cost_centre_buchfuehrung
         
         # Find contact by payee/payer name, or use 70000 as fallback if no payee
+        contact_score = None
         if payee_payer_name == 'Unknown' or not payee_payer_name:
             contact = self.contact_70000
         else:
-            contact = find_contact_by_name(self.db, payee_payer_name)
+            contact_match = find_contact_match(self.db, payee_payer_name)
+            contact = contact_match['contact'] if contact_match else None
+            contact_score = contact_match['score'] if contact_match else None
             # If contact not found by name, also use 70000 as fallback
             if not contact:
                 contact = self.contact_70000
@@ -152,6 +131,7 @@ class FeesVoucherCreator(VoucherCreatorBase):
             'payee_payer_name': payee_payer_name,
             'cost_centre': cost_centre,
             'contact': contact,
+            'contact_score': contact_score,
             'voucher_number': voucher_number,
             'accounting_type': self.accounting_type,
             'description': payment_purpose  # Use payment purpose as description
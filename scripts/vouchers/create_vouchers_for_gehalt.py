@@ -9,8 +9,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 """
 import os
 import sys
-import json
-from typing import List, Dict
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,7 +17,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.vouchers.voucher_creator_base import VoucherCreatorBase
-from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name
+from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_match, get_transaction_raw_data
 
 
 # Custom mappings for Gehalt script
@@ -44,15 +43,9 @@ class GehaltVoucherCreator(VoucherCreatorBase):
         """Return accounting type name to search for."""
         return "Lohn / Gehalt"
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """Filter transactions containing 'Gehalt' in payment purpose."""
-        gehalt_transactions = []
-        for txn in all_transactions:
-            payment_purpose = txn.get('paymt_purpose', '') or ''
-            payment_purpose_lower = payment_purpose.lower()
-            if 'gehalt' in payment_purpose_lower:
-                gehalt_transactions.append(txn)
-        return gehalt_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'gehalt'
     
     def build_voucher_plan_item(
         self,
@@ -62,12 +55,12 @@ class GehaltVoucherCreator(VoucherCreatorBase):
     ) -> Dict:
         """Build voucher plan item for a Gehalt transaction."""
         # Parse raw data to get payeePayerName
-        raw_data = json.loads(transaction.get('raw_data', '{}'))
+        raw_data = get_transaction_raw_data(transaction)
         payee_payer_name = raw_data.get('payeePayerName', 'Unknown')
         
         # Find matching cost centre and contact
         cost_centre = self._find_gehalt_cost_centre(payee_payer_name)
-        contact = self._find_gehalt_contact(payee_payer_name)
+        contact_match = self._find_gehalt_contact(payee_payer_name)
         
         return {
             'transaction_id': transaction['id'],
@@ -76,7 +69,8 @@ class GehaltVoucherCreator(VoucherCreatorBase):
             'payment_purpose': transaction['paymt_purpose'],
             'payee_payer_name': payee_payer_name,
             'cost_centre': cost_centre,
-            'contact': contact,
+            'contact': contact_match['contact'] if contact_match else None,
+            'contact_score': contact_match['score'] if contact_match else None,
             'voucher_number': voucher_number,
             'accounting_type': self.accounting_type
         }
@@ -90,8 +84,8 @@ class GehaltVoucherCreator(VoucherCreatorBase):
         )
     
     def _find_gehalt_contact(self, payee_name: str) -> dict:
-        """Find contact for Gehalt (prefer Suppliers for expenses)."""
-        return find_contact_by_name(
+        """Find contact match for Gehalt (prefer Suppliers for expenses)."""
+        return find_contact_match(
             self.db,
             payee_name,
             prefer_category=3,
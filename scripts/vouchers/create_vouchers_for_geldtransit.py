@@ -16,8 +16,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 """
 import os
 import sys
-import json
-from typing import List, Dict, Optional
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -25,7 +24,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.vouchers.voucher_creator_base import VoucherCreatorBase
-from src.vouchers.voucher_utils import find_contact_by_name
+from src.vouchers.voucher_utils import find_contact_by_name, get_transaction_raw_data
 
 
 # Contact name for Geldtransit
@@ -82,32 +81,9 @@ class GeldtransitVoucherCreator(VoucherCreatorBase):
         print()
         return True
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """
-        Filter transactions matching Geldtransit criteria:
-        1. "Bankeinzug" in payeePayerName, OR
-        2. "PayPal (Europe) S.a r.l. et Cie, S. C.A." in payeePayerName AND "Ihr Einkauf bei" in purpose
-        """
-        geldtransit_transactions = []
-        for txn in all_transactions:
-            # Parse raw data to check payeePayerName
-            raw_data = json.loads(txn.get('raw_data', '{}'))
-            payee_payer_name = raw_data.get('payeePayerName', '') or ''
-            payment_purpose = txn.get('paymt_purpose', '') or ''
-            
-            # Condition 1: Check for "Bankeinzug" in payeePayerName (case-insensitive)
-            is_bankeinzug = 'BANKEINZUG' in payee_payer_name.upper() or 'Bankeinzug' in payee_payer_name
-            
-            # Condition 2: Check for PayPal with "Ihr Einkauf bei" in purpose
-            is_paypal = 'PayPal (Europe) S.a r.l. et Cie, S. C.A.' in payee_payer_name
-            has_einkauf = 'Ihr Einkauf bei' in payment_purpose
-            is_paypal_purchase = is_paypal and has_einkauf
-            
-            # Add if either condition is met
-            if is_bankeinzug or is_paypal_purchase:
-                geldtransit_transactions.append(txn)
-        
-        return geldtransit_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'geldtransit'
     
     def build_voucher_plan_item(
         self,
@@ -117,7 +93,7 @@ class GeldtransitVoucherCreator(VoucherCreatorBase):
     ) -> Dict:
         """Build voucher plan item for a Geldtransit transaction."""
         # Parse raw data to get payeePayerName
-        raw_data = json.loads(transaction.get('raw_data', '{}'))
+        raw_data = get_transaction_raw_data(transaction)
         payee_payer_name = raw_data.get('payeePayerName', 'Unknown')
         
         # Use the 70000 contact for all transactions
@@ -144,10 +120,8 @@ class GeldtransitVoucherCreator(VoucherCreatorBase):
         Determine if these are income or expense vouchers.
         Geldtransit can be both, so we need to check per transaction.
         """
-        # This method is called by the base class, but it doesn't have access
-        # to individual transaction data. We need to override the voucher creation
-        # to handle this per transaction.
-        return True  # Default, will be overridden in voucher creation
+        # Decided per transaction in is_income_for_plan()
+        return True
     
     def has_cost_centre(self) -> bool:
         """Geldtransit vouchers do not use cost centres."""
@@ -166,91 +140,14 @@ class GeldtransitVoucherCreator(VoucherCreatorBase):
         payee_name = plan.get('payee_payer_name', '')
         return 'PayPal (Europe) S.a r.l. et Cie, S. C.A.' in payee_name
     
-    def create_vouchers(
-        self,
-        voucher_plan: List[Dict],
-        check_account_id: str,
-        sev_client_id: str
-    ) -> tuple:
-        """
-        Override to handle income vs expense determination per transaction.
-        """
-        from src.vouchers.voucher_utils import create_voucher_for_transaction
-        
-        print("=" * 80)
-        print("CREATING VOUCHERS")
-        print("=" * 80)
-        print()
-        
-        # Determine which vouchers to create
-        vouchers_to_create = [voucher_plan[0]] if self.args.create_single else voucher_plan
-        
-        print(f"Creating {len(vouchers_to_create)} voucher(s)...")
-        print()
-        
-        created_vouchers = []
-        failed_vouchers = []
-        
-        for i, plan in enumerate(vouchers_to_create, 1):
-            print(f"[{i}/{len(vouchers_to_create)}] Creating voucher for transaction {plan['transaction_id']}...")
-            print(f"    Amount: €{plan['amount']:,.2f}")
-            print(f"    Payee/Payer: {plan['payee_payer_name']}")
-            if plan.get('cost_centre'):
-                print(f"    Cost Centre: {plan['cost_centre']['name']}")
-            if plan.get('contact'):
-                print(f"    Contact: {plan['contact']['name']}")
-            
-            # Determine if this is income or expense per transaction
-            is_paypal_fee = self._is_paypal_fee_transaction(plan)
-            is_income = not is_paypal_fee  # PayPal fees are expenses, others are income
-            
-            print(f"    Type: {'Expense' if not is_income else 'Income'}")
-            
-            try:
-                response = create_voucher_for_transaction(
-                    self.client,
-                    plan,
-                    check_account_id,
-                    sev_client_id,
-                    is_income=is_income
-                )
-                
-                if response and 'objects' in response:
-                    # Extract voucher ID from nested structure
-                    voucher_id = response['objects'].get('voucher', {}).get('id')
-                    print(f"    ✓ Voucher created successfully! ID: {voucher_id}")
-                    
-                    # Book voucher amount to link it to the transaction
-                    print(f"    Booking voucher amount to link to transaction...")
-                    try:
-                        book_response = self.client.book_voucher_amount(
-                            voucher_id=voucher_id,
-                            transaction_id=plan['transaction_id'],
-                            check_account_id=check_account_id,
-                            amount=plan['amount'],
-                            date=plan['transaction_date'][:10],
-                            is_income=is_income
-                        )
-                        print(f"    ✓ Voucher booked and linked to transaction!")
-                    except Exception as link_error:
-                        print(f"    ⚠️  Warning: Failed to book/link voucher: {str(link_error)}")
-                    
-                    created_vouchers.append({
-                        'plan': plan,
-                        'voucher_id': voucher_id,
-                        'response': response
-                    })
-                else:
-                    print(f"    ❌ Failed: Unexpected response format")
-                    failed_vouchers.append(plan)
-                    
-            except Exception as e:
-                print(f"    ❌ Failed: {str(e)}")
-                failed_vouchers.append(plan)
-            
-            print()
-        
-        return created_vouchers, failed_vouchers
+    def is_income_for_plan(self, plan: Dict) -> bool:
+        """PayPal fees are expenses, all other Geldtransit vouchers are income."""
+        return not self._is_paypal_fee_transaction(plan)
+    
+    def print_plan_item_details(self, plan: Dict):
+        """Print the voucher details including its type (decided per transaction)."""
+        super().print_plan_item_details(plan)
+        print(f"    Type: {'Income' if self.is_income_for_plan(plan) else 'Expense'}")
 
 
 def main():
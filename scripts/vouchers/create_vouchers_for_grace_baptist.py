@@ -9,8 +9,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 """
 import os
 import sys
-import json
-from typing import List, Dict
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,7 +17,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.vouchers.voucher_creator_base import VoucherCreatorBase
-from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name
+from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name, get_transaction_raw_data
 
 
 # Cost centre for Wilhelmsson
@@ -73,21 +72,9 @@ class GraceBaptistVoucherCreator(VoucherCreatorBase):
         print()
         return True
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """Filter transactions for GRACE BAPTIST with WILHELMSSON."""
-        grace_transactions = []
-        for txn in all_transactions:
-            raw_data = json.loads(txn.get('raw_data', '{}'))
-            payee = raw_data.get('payeePayerName', '') or ''
-            purpose = txn.get('paymt_purpose', '') or ''
-            
-            # Only include expense transactions (negative amounts)
-            if txn.get('amount', 0) < 0:
-                if ('GRACE BAPTIST' in payee.upper() or 'GRACE BAPTIST' in purpose.upper()):
-                    if 'MISKA WILHELMSSON' in purpose.upper() or 'WILHELMSSON' in purpose.upper():
-                        grace_transactions.append(txn)
-        
-        return grace_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'grace_baptist'
     
     def build_voucher_plan_item(
         self,
@@ -97,7 +84,7 @@ class GraceBaptistVoucherCreator(VoucherCreatorBase):
     ) -> Dict:
         """Build voucher plan item for a GRACE BAPTIST transaction."""
         # Parse raw data to get payeePayerName
-        raw_data = json.loads(transaction.get('raw_data', '{}'))
+        raw_data = get_transaction_raw_data(transaction)
         payee_payer_name = raw_data.get('payeePayerName', 'Unknown')
         
         # Find matching contact (use GRACE BAPTIST as payee)
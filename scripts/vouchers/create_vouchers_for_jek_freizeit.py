@@ -13,8 +13,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 """
 import os
 import sys
-import json
-from typing import List, Dict
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,7 +21,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.vouchers.voucher_creator_base import VoucherCreatorBase
-from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name
+from src.vouchers.voucher_utils import find_contact_match, get_transaction_raw_data
 
 
 # Cost centre for JEK Freizeiten
@@ -84,23 +83,9 @@ class JEKFreizeitVoucherCreator(VoucherCreatorBase):
         print()
         return True
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """Filter transactions for JEK Freizeit/Leisure income."""
-        jek_transactions = []
-        for txn in all_transactions:
-            purpose = txn.get('paymt_purpose', '') or ''
-            amount = float(txn.get('amount', 0))
-            
-            # Only include income transactions (positive amounts)
-            if amount > 0:
-                purpose_upper = purpose.upper()
-                
-                # Check for JEK Freizeit or JEK Leisure
-                if ('JEK FREIZEIT' in purpose_upper or 
-                    'JEK LEISURE' in purpose_upper):
-                    jek_transactions.append(txn)
-        
-        return jek_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'jek_freizeit'
     
     def build_voucher_plan_item(
         self,
@@ -110,11 +95,11 @@ class JEKFreizeitVoucherCreator(VoucherCreatorBase):
     ) -> Dict:
         """Build voucher plan item for a JEK Freizeit transaction."""
         # Parse raw data to get payeePayerName
-        raw_data = json.loads(transaction.get('raw_data', '{}'))
+        raw_data = get_transaction_raw_data(transaction)
         payee_payer_name = raw_data.get('payeePayerName', 'Unknown')
         
         # Try to find matching contact (payer)
-        contact = find_contact_by_name(
+        contact_match = find_contact_match(
             self.db,
             payee_payer_name,
             prefer_category=1  # Prefer Kunden (customers)
@@ -127,7 +112,8 @@ class JEKFreizeitVoucherCreator(VoucherCreatorBase):
             'payment_purpose': transaction['paymt_purpose'],
             'payee_payer_name': payee_payer_name,
             'cost_centre': self.cost_centre,  # Same for all (JEK Freizeiten)
-            'contact': contact,
+            'contact': contact_match['contact'] if contact_match else None,
+            'contact_score': contact_match['score'] if contact_match else None,
             'voucher_number': voucher_number,
             'accounting_type': self.accounting_type
         }
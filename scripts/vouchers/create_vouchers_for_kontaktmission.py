@@ -14,8 +14,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 """
 import os
 import sys
-import json
-from typing import List, Dict
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,7 +22,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.vouchers.voucher_creator_base import VoucherCreatorBase
-from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name
+from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name, get_transaction_raw_data
 
 
 # Cost centre mappings based on purpose
@@ -56,20 +55,9 @@ class KontaktmissionVoucherCreator(VoucherCreatorBase):
         """Get the script filename for help text."""
         return "create_vouchers_for_kontaktmission.py"
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """Filter transactions for KONTAKTMISSION."""
-        kontakt_transactions = []
-        for txn in all_transactions:
-            raw_data = json.loads(txn.get('raw_data', '{}'))
-            payee = raw_data.get('payeePayerName', '') or ''
-            purpose = txn.get('paymt_purpose', '') or ''
-            
-            # Only include expense transactions (negative amounts)
-            if txn.get('amount', 0) < 0:
-                if 'KONTAKTMISSION' in payee.upper() or 'KONTAKTMISSION' in purpose.upper():
-                    kontakt_transactions.append(txn)
-        
-        return kontakt_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'kontaktmission'
     
     def build_voucher_plan_item(
         self,
@@ -79,7 +67,7 @@ class KontaktmissionVoucherCreator(VoucherCreatorBase):
     ) -> Dict:
         """Build voucher plan item for a KONTAKTMISSION transaction."""
         # Parse raw data to get payeePayerName
-        raw_data = json.loads(transaction.get('raw_data', '{}'))
+        raw_data = get_transaction_raw_data(transaction)
         payee_payer_name = raw_data.get('payeePayerName', 'Unknown')
         payment_purpose = transaction.get('paymt_purpose', '') or ''
         
@@ -12,8 +12,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 """
 import os
 import sys
-import json
-from typing import List, Dict
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,7 +20,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.vouchers.voucher_creator_base import VoucherCreatorBase
-from src.vouchers.voucher_utils import find_contact_by_name
+from src.vouchers.voucher_utils import find_contact_match, get_transaction_raw_data
 
 
 # Custom mappings for Krankenkassen script
@@ -71,22 +70,9 @@ class KrankenkassenVoucherCreator(VoucherCreatorBase):
         print("Error: Could not find 'Lohnnebenkosten' cost centre!")
         return False
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """Filter transactions from health insurance providers."""
-        krankenkassen_transactions = []
-        for txn in all_transactions:
-            # Parse raw data to get payeePayerName
-            raw_data = json.loads(txn.get('raw_data', '{}'))
-            payee_name = raw_data.get('payeePayerName', '') or ''
-            
-            # Match if payee is a known health insurance provider
-            if ('Techniker Krankenkasse' in payee_name or 
-                'Knappschaft-Bahn-See' in payee_name or
-                'Knappschaft' in payee_name or
-                'Verwaltungs-Berufsgenossenschaft' in payee_name):
-                krankenkassen_transactions.append(txn)
-        
-        return krankenkassen_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'krankenkassen'
     
     def build_voucher_plan_item(
         self,
@@ -96,11 +82,11 @@ class KrankenkassenVoucherCreator(VoucherCreatorBase):
     ) -> Dict:
         """Build voucher plan item for a Krankenkassen transaction."""
         # Parse raw data to get payeePayerName
-        raw_data = json.loads(transaction.get('raw_data', '{}'))
+        raw_data = get_transaction_raw_data(transaction)
         payee_payer_name = raw_data.get('payeePayerName', 'Unknown')
         
         # Find matching contact (health insurance company)
-        contact = self._find_krankenkassen_contact(payee_payer_name)
+        contact_match = self._find_krankenkassen_contact(payee_payer_name)
         
         # Extract year and month from transaction date for description
         # Format: YYYYMM (e.g., "202510" for October 2025)
@@ -114,15 +100,16 @@ class KrankenkassenVoucherCreator(VoucherCreatorBase):
             'payment_purpose': transaction['paymt_purpose'],
             'payee_payer_name': payee_payer_name,
             'cost_centre': self.cost_centre,  # Same for all
-            'contact': contact,
+            'contact': contact_match['contact'] if contact_match else None,
+            'contact_score': contact_match['score'] if contact_match else None,
             'voucher_number': voucher_number,
             'accounting_type': self.accounting_type,
             'description': year_month  # Custom description (e.g., "202510")
         }
     
     def _find_krankenkassen_contact(self, payee_name: str) -> dict:
-        """Find contact for Krankenkassen (prefer Suppliers for expenses)."""
-        return find_contact_by_name(
+        """Find contact match for Krankenkassen (prefer Suppliers for expenses)."""
+        return find_contact_match(
             self.db,
             payee_name,
             prefer_category=3,
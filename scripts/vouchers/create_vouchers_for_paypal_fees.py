@@ -17,7 +17,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 import os
 import sys
 import json
-from typing import List, Dict, Optional
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -97,28 +97,9 @@ class PayPalFeesVoucherCreator(VoucherCreatorBase):
         print()
         return True
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """
-        Filter transactions matching PayPal fee criteria:
-        - Name: "Paypal Inc."
-        - Purpose contains: "Gebühren zu"
-        """
-        paypal_fee_transactions = []
-        for txn in all_transactions:
-            # Parse raw data to check payeePayerName
-            raw_data = json.loads(txn.get('raw_data', '{}'))
-            payee_payer_name = raw_data.get('payeePayerName', '') or ''
-            payment_purpose = txn.get('paymt_purpose', '') or ''
-            
-            # Check for "Paypal Inc." in payeePayerName and "Gebühren zu" in purpose
-            is_paypal_inc = 'Paypal Inc.' in payee_payer_name
-            has_gebuehren = 'Gebühren zu' in payment_purpose
-            
-            # Add if both conditions are met
-            if is_paypal_inc and has_gebuehren:
-                paypal_fee_transactions.append(txn)
-        
-        return paypal_fee_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'paypal_fees'
     
     def build_voucher_plan_item(
         self,
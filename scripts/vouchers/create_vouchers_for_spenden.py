@@ -10,13 +10,16 @@ Donation matching rules are configured in config/donation_rules.csv with support
 - Type rules: Determine donation type and cost centre based on patterns (with priority)
 - Match modes: 'contains', 'startswith', or 'exact' matching
 
+The rules are compiled into automata (see src/rules/matcher.py), so each
+transaction is scanned once per text field regardless of the number of rules.
+The compiled rules are cached next to the CSV and rebuilt when it changes.
+
 All use Accounting Type: "Spendeneingang"
 
 REFACTORED VERSION using VoucherCreatorBase and external CSV configuration.
 """
 import os
 import sys
-import json
 import csv
 from typing import List, Dict, Optional, Tuple
 
@@ -26,11 +29,18 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.vouchers.voucher_creator_base import VoucherCreatorBase
-from src.vouchers.voucher_utils import find_contact_by_name
+from src.vouchers.voucher_utils import find_contact_match, get_transaction_raw_data
+from src.rules.matcher import CompiledRuleSet
+from src.rules.cache import load_compiled
 
 
 class DonationRule:
-    """Represents a donation matching rule from CSV."""
+    """
+    Represents a donation matching rule from CSV.
+    
+    Rules are matched through CompiledRuleSet (see get_conditions()), which
+    holds the only implementation of the match modes.
+    """
     
     def __init__(self, rule_dict: Dict):
         """Initialize rule from CSV row."""
@@ -42,29 +52,54 @@ class DonationRule:
         self.priority = int(rule_dict.get('priority', 999))
         self.match_mode = rule_dict.get('match_mode', 'contains').strip()
     
-    def matches(self, payer_name: str, purpose: str) -> bool:
-        """Check if this rule matches the given payer name and purpose."""
-        # Check payer name pattern if specified
-        if self.payer_name_pattern:
-            if not self._pattern_matches(payer_name or '', self.payer_name_pattern):
-                return False
-        
-        # Check purpose pattern if specified
-        if self.purpose_pattern:
-            if not self._pattern_matches(purpose or '', self.purpose_pattern):
-                return False
-        
-        # If we get here, all specified patterns matched (or no patterns were specified)
-        return True
+    def get_conditions(self) -> Dict:
+        """Get the patterns of this rule for CompiledRuleSet (field -> (pattern, mode))."""
+        return {
+            'payer_name': (self.payer_name_pattern, self.match_mode),
+            'purpose': (self.purpose_pattern, self.match_mode),
+        }
+
+
+def compile_donation_rules(config_path: str) -> Dict:
+    """
+    Parse and compile the donation rules CSV.
+    
+    Rules are returned as CSV rows (not DonationRule objects), so the result
+    can be cached independently of how this script is started.
+    
+    Args:
+        config_path: Path to donation_rules.csv
     
-    def _pattern_matches(self, text: str, pattern: str) -> bool:
-        """Check if pattern matches text based on match mode."""
-        if self.match_mode == 'exact':
-            return text == pattern
-        elif self.match_mode == 'startswith':
-            return text.startswith(pattern)
-        else:  # contains (default)
-            return pattern in text
+    Returns:
+        Dictionary with filter_rows, type_rows (by priority), filter_matcher and type_matcher
+    """
+    filter_rows = []
+    type_rows = []
+    
+    with open(config_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            # Skip comment lines and empty lines
+            if not row.get('rule_type') or row.get('rule_type').startswith('#'):
+                continue
+            
+            row = dict(row)
+            rule_type = DonationRule(row).rule_type
+            if rule_type == 'filter':
+                filter_rows.append(row)
+            elif rule_type == 'type':
+                type_rows.append(row)
+    
+    # Sort type rules by priority (lower number = higher priority)
+    type_rows.sort(key=lambda row: DonationRule(row).priority)
+    
+    # Compile rules for one-pass matching (type rules stay in priority order)
+    return {
+        'filter_rows': filter_rows,
+        'type_rows': type_rows,
+        'filter_matcher': CompiledRuleSet(DonationRule(row).get_conditions() for row in filter_rows),
+        'type_matcher': CompiledRuleSet(DonationRule(row).get_conditions() for row in type_rows),
+    }
 
 
 class SpendenVoucherCreator(VoucherCreatorBase):
@@ -77,10 +112,12 @@ class SpendenVoucherCreator(VoucherCreatorBase):
         self.filter_rules: List[DonationRule] = []
         self.type_rules: List[DonationRule] = []
         self.cost_centre_names = set()  # Track unique cost centre names
+        self.filter_matcher: Optional[CompiledRuleSet] = None
+        self.type_matcher: Optional[CompiledRuleSet] = None
         self._load_donation_rules()
     
     def _load_donation_rules(self):
-        """Load donation rules from CSV file."""
+        """Load donation rules from CSV file (compiled rules are cached, see src/rules/cache.py)."""
         config_path = os.path.join(project_root, 'config', 'donation_rules.csv')
         
         if not os.path.exists(config_path):
@@ -88,28 +125,20 @@ class SpendenVoucherCreator(VoucherCreatorBase):
             print("   Please create config/donation_rules.csv with donation matching rules.")
             sys.exit(1)
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Skip comment lines and empty lines
-                if not row.get('rule_type') or row.get('rule_type').startswith('#'):
-                    continue
-                
-                rule = DonationRule(row)
-                
-                if rule.rule_type == 'filter':
-                    self.filter_rules.append(rule)
-                elif rule.rule_type == 'type':
-                    self.type_rules.append(rule)
-                    if rule.cost_centre_name:
-                        self.cost_centre_names.add(rule.cost_centre_name)
+        compiled, source = load_compiled(config_path, 'donation_rules', compile_donation_rules)
         
-        # Sort type rules by priority (lower number = higher priority)
-        self.type_rules.sort(key=lambda r: r.priority)
+        self.filter_rules = [DonationRule(row) for row in compiled['filter_rows']]
+        self.type_rules = [DonationRule(row) for row in compiled['type_rows']]
+        self.cost_centre_names = {rule.cost_centre_name for rule in self.type_rules if rule.cost_centre_name}
+        self.filter_matcher = compiled['filter_matcher']
+        self.type_matcher = compiled['type_matcher']
         
-        print(f"✓ Loaded {len(self.filter_rules)} filter rules and {len(self.type_rules)} type rules from CSV")
-        print(f"✓ Found {len(self.cost_centre_names)} unique cost centres in rules")
-        print()
+        # Only report once per process
+        if source != 'memory':
+            origin = "CSV" if source == 'compiled' else "rule cache"
+            print(f"✓ Loaded {len(self.filter_rules)} filter rules and {len(self.type_rules)} type rules from {origin}")
+            print(f"✓ Found {len(self.cost_centre_names)} unique cost centres in rules")
+            print()
 
     
     def get_script_name(self) -> str:
@@ -153,29 +182,24 @@ class SpendenVoucherCreator(VoucherCreatorBase):
         
         return True
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """Filter transactions with donation keywords and positive amounts using CSV rules."""
-        spenden_transactions = []
-        for txn in all_transactions:
-            payment_purpose = txn.get('paymt_purpose', '') or ''
-            amount = float(txn.get('amount', 0))
-            
-            # Must be income (positive)
-            if amount > 0:
-                # Get payer name from raw data
-                raw_data = json.loads(txn.get('raw_data', '{}'))
-                payee_payer_name = raw_data.get('payeePayerName', '')
-                
-                # Check if any filter rule matches
-                is_spende = any(
-                    rule.matches(payee_payer_name, payment_purpose)
-                    for rule in self.filter_rules
-                )
-                
-                if is_spende:
-                    spenden_transactions.append(txn)
+    def matches_transaction(self, txn: Dict) -> bool:
+        """Match transactions with donation keywords and positive amounts using CSV rules."""
+        payment_purpose = txn.get('paymt_purpose', '') or ''
+        amount = float(txn.get('amount', 0))
+        
+        # Must be income (positive)
+        if amount <= 0:
+            return False
         
-        return spenden_transactions
+        # Get payer name from raw data
+        raw_data = get_transaction_raw_data(txn)
+        payee_payer_name = raw_data.get('payeePayerName', '')
+        
+        # Check if any filter rule matches
+        return self.filter_matcher.match_any({
+            'payer_name': payee_payer_name,
+            'purpose': payment_purpose
+        })
     
     def build_voucher_plan_item(
         self,
@@ -185,7 +209,7 @@ class SpendenVoucherCreator(VoucherCreatorBase):
     ) -> Dict:
         """Build voucher plan item for a Spenden transaction."""
         # Parse raw data to get payeePayerName
-        raw_data = json.loads(transaction.get('raw_data', '{}'))
+        raw_data = get_transaction_raw_data(transaction)
         payee_payer_name = raw_data.get('payeePayerName', 'Unknown')
         
         # Determine donation type and cost centre using CSV rules
@@ -196,7 +220,7 @@ class SpendenVoucherCreator(VoucherCreatorBase):
         )
         
         # Find matching contact (donor) - IMPORTANT for tax tracking!
-        contact = self._find_spenden_contact(payee_payer_name)
+        contact_match = self._find_spenden_contact(payee_payer_name)
         
         return {
             'transaction_id': transaction['id'],
@@ -206,7 +230,8 @@ class SpendenVoucherCreator(VoucherCreatorBase):
             'payee_payer_name': payee_payer_name,
             'donation_type': donation_type,
             'cost_centre': cost_centre,
-            'contact': contact,
+            'contact': contact_match['contact'] if contact_match else None,
+            'contact_score': contact_match['score'] if contact_match else None,
             'voucher_number': voucher_number,
             'accounting_type': self.accounting_type
         }
@@ -313,15 +338,18 @@ class SpendenVoucherCreator(VoucherCreatorBase):
         Returns:
             Tuple of (donation_type, cost_centre)
         """
-        # Check type rules in priority order
-        for rule in self.type_rules:
-            if rule.matches(payer_name, payment_purpose or ''):
-                # Found matching rule
-                cost_centre = self.cost_centres.get(rule.cost_centre_name)
-                if cost_centre:
-                    return (rule.donation_type, cost_centre)
-                else:
-                    print(f"⚠️  Warning: Rule matched but cost centre not found: {rule.cost_centre_name}")
+        # Check the matching type rules in priority order
+        matching_indices = self.type_matcher.match_all({
+            'payer_name': payer_name,
+            'purpose': payment_purpose or ''
+        })
+        for index in matching_indices:
+            rule = self.type_rules[index]
+            cost_centre = self.cost_centres.get(rule.cost_centre_name)
+            if cost_centre:
+                return (rule.donation_type, cost_centre)
+            else:
+                print(f"⚠️  Warning: Rule matched but cost centre not found: {rule.cost_centre_name}")
         
         # Fallback: should not happen if rules are properly configured with a catch-all rule
         print(f"⚠️  Warning: No matching type rule for payer='{payer_name}' purpose='{payment_purpose}'")
@@ -334,10 +362,10 @@ class SpendenVoucherCreator(VoucherCreatorBase):
     
     def _find_spenden_contact(self, payee_name: str) -> Optional[Dict]:
         """
-        Find contact for Spenden (prefer Customers for income).
+        Find contact match for Spenden (prefer Customers for income).
         Uses enhanced matching with first-name prioritization for multi-name payees.
         """
-        return find_contact_by_name(self.db, payee_name, prefer_category=2)
+        return find_contact_match(self.db, payee_name, prefer_category=2)
 
 
 def main():
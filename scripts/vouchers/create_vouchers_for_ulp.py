@@ -9,8 +9,7 @@ REFACTORED VERSION using VoucherCreatorBase.
 """
 import os
 import sys
-import json
-from typing import List, Dict
+from typing import Dict
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,7 +17,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.vouchers.voucher_creator_base import VoucherCreatorBase
-from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_by_name
+from src.vouchers.voucher_utils import find_cost_centre_by_name, find_contact_match, get_transaction_raw_data
 
 
 # Custom mappings for ÜLP script
@@ -43,17 +42,9 @@ class UlpVoucherCreator(VoucherCreatorBase):
         # Will match both "Ehrenamtspauschale" and "Übungsleiterpauschale"
         return "pauschale"
     
-    def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """Filter transactions containing ÜLP, Übungsleiterpauschale or Ehrenamtspauschale."""
-        ulp_transactions = []
-        for txn in all_transactions:
-            payment_purpose = txn.get('paymt_purpose', '') or ''
-            payment_purpose_lower = payment_purpose.lower()
-            if ('ülp' in payment_purpose_lower or 
-                'übungsleiterpauschale' in payment_purpose_lower or
-                'ehrenamtspauschale' in payment_purpose_lower):
-                ulp_transactions.append(txn)
-        return ulp_transactions
+    def get_rule_target(self) -> str:
+        """Return the target name in config/creator_rules.csv."""
+        return 'ulp'
     
     def build_voucher_plan_item(
         self,
@@ -63,7 +54,7 @@ class UlpVoucherCreator(VoucherCreatorBase):
     ) -> Dict:
         """Build voucher plan item for a ÜLP transaction."""
         # Parse raw data to get payeePayerName
-        raw_data = json.loads(transaction.get('raw_data', '{}'))
+        raw_data = get_transaction_raw_data(transaction)
         payee_payer_name = raw_data.get('payeePayerName', 'Unknown')
         
         # Check if this is a ÜLP transaction (for special cost centre rule)
@@ -74,7 +65,7 @@ class UlpVoucherCreator(VoucherCreatorBase):
         cost_centre = self._find_ulp_cost_centre(payee_payer_name, is_ulp)
         
         # Find matching contact (supplier)
-        contact = self._find_ulp_contact(payee_payer_name)
+        contact_match = self._find_ulp_contact(payee_payer_name)
         
         return {
             'transaction_id': transaction['id'],
@@ -83,7 +74,8 @@ class UlpVoucherCreator(VoucherCreatorBase):
             'payment_purpose': transaction['paymt_purpose'],
             'payee_payer_name': payee_payer_name,
             'cost_centre': cost_centre,
-            'contact': contact,
+            'contact': contact_match['contact'] if contact_match else None,
+            'contact_score': contact_match['score'] if contact_match else None,
             'voucher_number': voucher_number,
             'accounting_type': self.accounting_type
         }
@@ -105,8 +97,8 @@ class UlpVoucherCreator(VoucherCreatorBase):
         )
     
     def _find_ulp_contact(self, payee_name: str) -> dict:
-        """Find contact for ÜLP transactions (prefer Suppliers for expenses)."""
-        return find_contact_by_name(
+        """Find contact match for ÜLP transactions (prefer Suppliers for expenses)."""
+        return find_contact_match(
             self.db,
             payee_name,
             prefer_category=3,
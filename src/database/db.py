@@ -1,21 +1,33 @@
 """SQLite database operations for storing SevDesk transactions."""
 import sqlite3
 import json
+import re
 from typing import Dict, List, Optional
 from datetime import datetime
 
 
+def _to_float(value) -> Optional[float]:
+    """Convert an API amount (string or number) to float, keeping empty values as None."""
+    return float(value) if value not in (None, '') else None
+
+
 class TransactionDB:
     """SQLite database handler for SevDesk transactions."""
     
-    def __init__(self, db_path: str = "transactions.db"):
+    # Tables whose changes are tracked in the data_versions table
+    VERSIONED_TABLES = ('contacts',)
+    
+    def __init__(self, db_path: str = "transactions.db", check_same_thread: bool = True):
         """
         Initialize the database connection.
         
         Args:
             db_path: Path to the SQLite database file (default: transactions.db)
+            check_same_thread: If False, the connection may be used from other
+                threads (the caller must serialize access)
         """
         self.db_path = db_path
+        self.check_same_thread = check_same_thread
         self.conn = None
         self.cursor = None
         self._connect()
@@ -23,7 +35,7 @@ class TransactionDB:
     
     def _connect(self):
         """Establish database connection."""
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=self.check_same_thread)
         self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
         self.cursor = self.conn.cursor()
     
@@ -156,14 +168,212 @@ class TransactionDB:
             CREATE INDEX IF NOT EXISTS idx_supplier_number ON contacts(supplier_number)
         ''')
         
+        # Create vouchers table (local mirror of the SevDesk vouchers)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS vouchers (
+                id TEXT PRIMARY KEY,
+                object_name TEXT,
+                create_date TEXT,
+                update_date TEXT,
+                voucher_number TEXT,
+                voucher_date TEXT,
+                description TEXT,
+                status INTEGER,
+                credit_debit TEXT,
+                voucher_type TEXT,
+                sum_net REAL,
+                sum_gross REAL,
+                paid_amount REAL,
+                pay_date TEXT,
+                cost_centre_id TEXT,
+                supplier_id TEXT,
+                supplier_name TEXT,
+                raw_data TEXT,
+                loaded_at TEXT
+            )
+        ''')
+        
+        # Create indexes for the voucher queries
+        for column in ('status', 'cost_centre_id', 'credit_debit', 'paid_amount', 'voucher_number'):
+            self.cursor.execute(f'''
+                CREATE INDEX IF NOT EXISTS idx_voucher_{column} ON vouchers({column})
+            ''')
+        
+        # Combined index for "open vouchers of a cost centre" (e.g. Bar-Kollekten)
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_voucher_open_by_cost_centre
+            ON vouchers(status, cost_centre_id, credit_debit, paid_amount)
+        ''')
+        
+        # Create voucher positions table
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS voucher_positions (
+                id TEXT PRIMARY KEY,
+                voucher_id TEXT NOT NULL,
+                accounting_type_id TEXT,
+                cost_centre_id TEXT,
+                tax_rate REAL,
+                sum_net REAL,
+                sum_gross REAL,
+                comment TEXT,
+                raw_data TEXT,
+                loaded_at TEXT
+            )
+        ''')
+        
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_voucher_position_voucher ON voucher_positions(voucher_id)
+        ''')
+        
+        # Create data versions table (bumped by triggers whenever a table changes)
+        # Used to invalidate in-memory caches such as the contact matcher index
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS data_versions (
+                entity TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        # Create voucher number ledger (one row per allocated B-YYYY-NR number)
+        # status: 'reserved' (handed out), 'used' (voucher created), 'abandoned' (free again)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS voucher_number_ledger (
+                year INTEGER NOT NULL,
+                number INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                session_id TEXT,
+                voucher_id TEXT,
+                reserved_at TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (year, number)
+            )
+        ''')
+        
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_voucher_number_status ON voucher_number_ledger(status)
+        ''')
+        
+        # Last known state of the remote voucher numbers per year
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS voucher_number_sync (
+                year INTEGER PRIMARY KEY,
+                remote_high_water INTEGER NOT NULL DEFAULT 0,
+                last_remote_voucher_id TEXT,
+                synced_at TEXT
+            )
+        ''')
+        
+        # Journals keyed without the creator (one row per run and transaction) are
+        # rebuilt below: several voucher types may plan the same transaction in one run
+        self.cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'voucher_journal'"
+        )
+        row = self.cursor.fetchone()
+        migrate_journal = bool(row and 'UNIQUE (run_id, transaction_id)' in row['sql'])
+        if migrate_journal:
+            self.cursor.execute('ALTER TABLE voucher_journal RENAME TO voucher_journal_old')
+        
+        # Write-ahead journal of voucher creation (planned -> creating -> created -> booked)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS voucher_journal (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                creator TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                transaction_id TEXT NOT NULL,
+                voucher_number TEXT,
+                plan_json TEXT NOT NULL,
+                check_account_id TEXT,
+                sev_client_id TEXT,
+                is_income INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                voucher_id TEXT,
+                error TEXT,
+                created_at TEXT,
+                updated_at TEXT,
+                UNIQUE (run_id, creator, transaction_id)
+            )
+        ''')
+        
+        if migrate_journal:
+            self.cursor.execute('INSERT INTO voucher_journal SELECT * FROM voucher_journal_old')
+            self.cursor.execute('DROP TABLE voucher_journal_old')
+        
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_voucher_journal_status ON voucher_journal(status)
+        ''')
+        
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_voucher_journal_transaction ON voucher_journal(transaction_id)
+        ''')
+        
+        # Results of marking existing vouchers as paid (Bar-Kollekten), one row per voucher and run
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS payment_journal (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                voucher_id TEXT NOT NULL,
+                voucher_date TEXT,
+                amount REAL,
+                check_account_id TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at TEXT,
+                updated_at TEXT,
+                UNIQUE (run_id, voucher_id)
+            )
+        ''')
+        
+        # Incremental sync cursor per mirrored table (see scripts/loaders/load_vouchers.py)
+        # cursor: newest update date seen by the last completed pass
+        # pass_started_at: set while a pass is unfinished (the cursor is not advanced yet)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_state (
+                entity TEXT PRIMARY KEY,
+                cursor TEXT,
+                pass_started_at TEXT,
+                synced_at TEXT
+            )
+        ''')
+        
+        # Last completed reload per table (see scripts/loaders/reload_data.py)
+        # mode: 'full' (table replaced) or 'delta' (only new and changed rows loaded)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS reload_metadata (
+                entity TEXT PRIMARY KEY,
+                reloaded_at TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                fetched INTEGER NOT NULL DEFAULT 0,
+                item_count INTEGER NOT NULL DEFAULT 0,
+                high_water TEXT
+            )
+        ''')
+        
+        for entity in self.VERSIONED_TABLES:
+            self.cursor.execute(
+                'INSERT OR IGNORE INTO data_versions (entity, version) VALUES (?, 0)',
+                (entity,)
+            )
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                self.cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS trg_{entity}_{event.lower()}_version
+                    AFTER {event} ON {entity}
+                    BEGIN
+                        UPDATE data_versions SET version = version + 1 WHERE entity = '{entity}';
+                    END
+                ''')
+        
         self.conn.commit()
     
-    def insert_transaction(self, transaction: Dict) -> bool:
+    def insert_transaction(self, transaction: Dict, commit: bool = True) -> bool:
         """
         Insert or update a transaction in the database.
         
         Args:
             transaction: Transaction dictionary from SevDesk API
+            commit: If False, the caller commits (e.g. once per batch)
             
         Returns:
             True if successful, False otherwise
@@ -222,7 +432,8 @@ class TransactionDB:
                 )
             ''', data)
             
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
             return True
         except Exception as e:
             print(f"Error inserting transaction {transaction.get('id')}: {e}")
@@ -240,8 +451,9 @@ class TransactionDB:
         """
         count = 0
         for transaction in transactions:
-            if self.insert_transaction(transaction):
+            if self.insert_transaction(transaction, commit=False):
                 count += 1
+        self.conn.commit()
         return count
     
     def get_transaction(self, transaction_id: str) -> Optional[Dict]:
@@ -566,12 +778,13 @@ class TransactionDB:
         self.cursor.execute('SELECT * FROM categories ORDER BY priority, name')
         return [dict(row) for row in self.cursor.fetchall()]
     
-    def insert_contact(self, contact: Dict) -> bool:
+    def insert_contact(self, contact: Dict, commit: bool = True) -> bool:
         """
         Insert or update a contact in the database.
         
         Args:
             contact: Contact dictionary from SevDesk API
+            commit: If False, the caller commits (e.g. once per batch)
             
         Returns:
             True if successful, False otherwise
@@ -616,7 +829,8 @@ class TransactionDB:
                 )
             ''', data)
             
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
             return True
         except Exception as e:
             print(f"Error inserting contact {contact.get('id')}: {e}")
@@ -634,8 +848,9 @@ class TransactionDB:
         """
         count = 0
         for contact in contacts:
-            if self.insert_contact(contact):
+            if self.insert_contact(contact, commit=False):
                 count += 1
+        self.conn.commit()
         return count
     
     def get_all_contacts(self) -> List[Dict]:
@@ -662,6 +877,815 @@ class TransactionDB:
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    def insert_voucher(self, voucher: Dict, commit: bool = True) -> bool:
+        """
+        Insert or update a voucher in the database.
+        
+        Args:
+            voucher: Voucher dictionary from SevDesk API
+            commit: If False, the caller commits (e.g. once per batch)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            cost_centre = voucher.get('costCentre') or {}
+            supplier = voucher.get('supplier') or {}
+            
+            data = {
+                'id': str(voucher.get('id')),
+                'object_name': voucher.get('objectName'),
+                'create_date': voucher.get('create'),
+                'update_date': voucher.get('update'),
+                # Our B-YYYY-NR numbers live in voucherNumber or description
+                'voucher_number': voucher.get('voucherNumber') or voucher.get('description'),
+                'voucher_date': voucher.get('voucherDate'),
+                'description': voucher.get('description'),
+                'status': int(voucher['status']) if voucher.get('status') not in (None, '') else None,
+                'credit_debit': voucher.get('creditDebit'),
+                'voucher_type': voucher.get('voucherType'),
+                'sum_net': _to_float(voucher.get('sumNet')),
+                'sum_gross': _to_float(voucher.get('sumGross')),
+                'paid_amount': _to_float(voucher.get('paidAmount')) or 0.0,
+                'pay_date': voucher.get('payDate'),
+                'cost_centre_id': str(cost_centre.get('id')) if cost_centre.get('id') else None,
+                'supplier_id': str(supplier.get('id')) if supplier.get('id') else None,
+                'supplier_name': voucher.get('supplierName'),
+                'raw_data': json.dumps(voucher),
+                'loaded_at': datetime.now().isoformat()
+            }
+            
+            self.cursor.execute('''
+                INSERT OR REPLACE INTO vouchers (
+                    id, object_name, create_date, update_date, voucher_number,
+                    voucher_date, description, status, credit_debit, voucher_type,
+                    sum_net, sum_gross, paid_amount, pay_date, cost_centre_id,
+                    supplier_id, supplier_name, raw_data, loaded_at
+                ) VALUES (
+                    :id, :object_name, :create_date, :update_date, :voucher_number,
+                    :voucher_date, :description, :status, :credit_debit, :voucher_type,
+                    :sum_net, :sum_gross, :paid_amount, :pay_date, :cost_centre_id,
+                    :supplier_id, :supplier_name, :raw_data, :loaded_at
+                )
+            ''', data)
+            
+            if commit:
+                self.conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error inserting voucher {voucher.get('id')}: {e}")
+            return False
+    
+    def bulk_insert_vouchers(self, vouchers: List[Dict]) -> int:
+        """
+        Insert multiple vouchers in a single transaction.
+        
+        Args:
+            vouchers: List of voucher dictionaries
+            
+        Returns:
+            Number of vouchers successfully inserted
+        """
+        count = 0
+        for voucher in vouchers:
+            if self.insert_voucher(voucher, commit=False):
+                count += 1
+        self.conn.commit()
+        return count
+    
+    def get_voucher(self, voucher_id: str) -> Optional[Dict]:
+        """
+        Get a voucher by ID.
+        
+        Args:
+            voucher_id: The voucher ID
+            
+        Returns:
+            Voucher dictionary or None if not found
+        """
+        self.cursor.execute('SELECT * FROM vouchers WHERE id = ?', (str(voucher_id),))
+        row = self.cursor.fetchone()
+        return dict(row) if row else None
+    
+    def get_vouchers(
+        self,
+        status: Optional[int] = None,
+        cost_centre_ids: Optional[List[str]] = None,
+        credit_debit: Optional[str] = None,
+        paid_amount: Optional[float] = None,
+        voucher_number: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Query vouchers from the local mirror (all filters are optional and indexed).
+        
+        Args:
+            status: Voucher status (e.g. 100)
+            cost_centre_ids: Only vouchers of these cost centres
+            credit_debit: 'D' (income) or 'C' (expense)
+            paid_amount: Exact paid amount (e.g. 0 for "payment not recorded")
+            voucher_number: Exact voucher number (e.g. 'B-2025-42')
+            
+        Returns:
+            List of voucher dictionaries, most recently created first
+        """
+        conditions = []
+        params = []
+        
+        if status is not None:
+            conditions.append('status = ?')
+            params.append(status)
+        if cost_centre_ids is not None:
+            if not cost_centre_ids:
+                return []
+            conditions.append(f"cost_centre_id IN ({', '.join('?' * len(cost_centre_ids))})")
+            params.extend(str(cc_id) for cc_id in cost_centre_ids)
+        if credit_debit is not None:
+            conditions.append('credit_debit = ?')
+            params.append(credit_debit)
+        if paid_amount is not None:
+            conditions.append('paid_amount = ?')
+            params.append(paid_amount)
+        if voucher_number is not None:
+            conditions.append('voucher_number = ?')
+            params.append(voucher_number)
+        
+        query = 'SELECT * FROM vouchers'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY create_date DESC, id DESC'
+        
+        self.cursor.execute(query, params)
+        return [dict(row) for row in self.cursor.fetchall()]
+    
+    def get_voucher_update_dates(self, voucher_ids: List[str]) -> Dict[str, str]:
+        """
+        Get the stored update timestamps of vouchers.
+        
+        Args:
+            voucher_ids: List of voucher IDs
+            
+        Returns:
+            Dictionary of voucher ID -> update date (only for known vouchers)
+        """
+        if not voucher_ids:
+            return {}
+        placeholders = ', '.join('?' * len(voucher_ids))
+        self.cursor.execute(
+            f'SELECT id, update_date FROM vouchers WHERE id IN ({placeholders})',
+            [str(voucher_id) for voucher_id in voucher_ids]
+        )
+        return {row['id']: row['update_date'] for row in self.cursor.fetchall()}
+    
+    def delete_voucher(self, voucher_id: str) -> bool:
+        """
+        Remove a voucher and its positions from the local mirror (e.g. deleted in SevDesk).
+        
+        Args:
+            voucher_id: The voucher ID
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.cursor.execute('DELETE FROM voucher_positions WHERE voucher_id = ?', (str(voucher_id),))
+            self.cursor.execute('DELETE FROM vouchers WHERE id = ?', (str(voucher_id),))
+            self.conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error deleting voucher {voucher_id}: {e}")
+            return False
+    
+    def get_sync_state(self, entity: str) -> Optional[Dict]:
+        """
+        Get the incremental sync state of a mirrored table.
+        
+        Args:
+            entity: Table name (e.g. 'vouchers')
+        
+        Returns:
+            Dictionary with cursor, pass_started_at and synced_at, or None if never synced
+        """
+        self.cursor.execute('SELECT * FROM sync_state WHERE entity = ?', (entity,))
+        row = self.cursor.fetchone()
+        return dict(row) if row else None
+    
+    def start_sync_pass(self, entity: str) -> bool:
+        """
+        Record that a sync pass started (the cursor is kept until it completes).
+        
+        Args:
+            entity: Table name (e.g. 'vouchers')
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.cursor.execute('''
+                INSERT INTO sync_state (entity, pass_started_at) VALUES (?, ?)
+                ON CONFLICT(entity) DO UPDATE SET pass_started_at = excluded.pass_started_at
+            ''', (entity, datetime.now().isoformat()))
+            self.conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error recording sync start of {entity}: {e}")
+            return False
+    
+    def complete_sync_pass(self, entity: str, cursor: Optional[str]) -> bool:
+        """
+        Record a completed sync pass and advance the cursor.
+        
+        Args:
+            entity: Table name (e.g. 'vouchers')
+            cursor: Newest update date seen by the pass (kept if None)
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.cursor.execute('''
+                UPDATE sync_state
+                SET cursor = COALESCE(?, cursor), pass_started_at = NULL, synced_at = ?
+                WHERE entity = ?
+            ''', (cursor, datetime.now().isoformat(), entity))
+            self.conn.commit()
+            return self.cursor.rowcount > 0
+        except Exception as e:
+            print(f"Error recording sync completion of {entity}: {e}")
+            return False
+    
+    def get_highest_voucher_number(self, year: int) -> int:
+        """
+        Get the highest B-YYYY-NR number of a year in the local voucher mirror.
+        
+        Args:
+            year: Voucher number year
+            
+        Returns:
+            Highest number or 0 if none found
+        """
+        prefix = f'B-{year}-'
+        self.cursor.execute(
+            'SELECT voucher_number FROM vouchers WHERE voucher_number LIKE ?',
+            (prefix + '%',)
+        )
+        highest = 0
+        for row in self.cursor.fetchall():
+            suffix = re.match(r'\d+', row['voucher_number'][len(prefix):])
+            if suffix:
+                highest = max(highest, int(suffix.group(0)))
+        return highest
+    
+    def replace_voucher_positions(self, voucher_id: str, positions: List[Dict], commit: bool = True) -> int:
+        """
+        Replace the stored positions of a voucher.
+        
+        Args:
+            voucher_id: The voucher ID
+            positions: List of voucher position dictionaries from SevDesk API
+            commit: If False, the caller commits or rolls back (errors are raised)
+            
+        Returns:
+            Number of positions stored
+        """
+        try:
+            now = datetime.now().isoformat()
+            rows = []
+            for position in positions:
+                accounting_type = position.get('accountingType') or {}
+                cost_centre = position.get('costCentre') or {}
+                rows.append({
+                    'id': str(position.get('id')),
+                    'voucher_id': str(voucher_id),
+                    'accounting_type_id': str(accounting_type.get('id')) if accounting_type.get('id') else None,
+                    'cost_centre_id': str(cost_centre.get('id')) if cost_centre.get('id') else None,
+                    'tax_rate': _to_float(position.get('taxRate')),
+                    'sum_net': _to_float(position.get('sumNet')),
+                    'sum_gross': _to_float(position.get('sumGross')),
+                    'comment': position.get('comment'),
+                    'raw_data': json.dumps(position),
+                    'loaded_at': now
+                })
+            
+            self.cursor.execute('DELETE FROM voucher_positions WHERE voucher_id = ?', (str(voucher_id),))
+            self.cursor.executemany('''
+                INSERT OR REPLACE INTO voucher_positions (
+                    id, voucher_id, accounting_type_id, cost_centre_id, tax_rate,
+                    sum_net, sum_gross, comment, raw_data, loaded_at
+                ) VALUES (
+                    :id, :voucher_id, :accounting_type_id, :cost_centre_id, :tax_rate,
+                    :sum_net, :sum_gross, :comment, :raw_data, :loaded_at
+                )
+            ''', rows)
+            if commit:
+                self.conn.commit()
+            return len(rows)
+        except Exception as e:
+            if not commit:
+                # Rolled back by the caller together with the rest of its batch
+                raise
+            self.conn.rollback()
+            print(f"Error storing positions of voucher {voucher_id}: {e}")
+            return 0
+    
+    def get_voucher_positions(self, voucher_id: str) -> List[Dict]:
+        """
+        Get the stored positions of a voucher.
+        
+        Args:
+            voucher_id: The voucher ID
+            
+        Returns:
+            List of voucher position dictionaries
+        """
+        self.cursor.execute(
+            'SELECT * FROM voucher_positions WHERE voucher_id = ? ORDER BY id',
+            (str(voucher_id),)
+        )
+        return [dict(row) for row in self.cursor.fetchall()]
+    
+    def get_data_version(self, entity: str) -> int:
+        """
+        Get the change counter of a versioned table.
+        
+        The counter is incremented by triggers on every insert, update or delete,
+        so callers can cheaply detect whether cached data is still current.
+        
+        Args:
+            entity: Table name (see VERSIONED_TABLES)
+            
+        Returns:
+            Current version number (0 if unknown)
+        """
+        self.cursor.execute('SELECT version FROM data_versions WHERE entity = ?', (entity,))
+        row = self.cursor.fetchone()
+        return row['version'] if row else 0
+    
+    def get_voucher_number_sync(self, year: int) -> Optional[Dict]:
+        """
+        Get the last known remote voucher number state for a year.
+        
+        Args:
+            year: Voucher number year
+            
+        Returns:
+            Sync dictionary or None if the year was never synced
+        """
+        self.cursor.execute('SELECT * FROM voucher_number_sync WHERE year = ?', (year,))
+        row = self.cursor.fetchone()
+        return dict(row) if row else None
+    
+    def update_voucher_number_sync(
+        self,
+        year: int,
+        remote_high_water: int,
+        last_remote_voucher_id: Optional[str]
+    ) -> bool:
+        """
+        Record the remote voucher number state for a year.
+        The high-water mark never decreases.
+        
+        Args:
+            year: Voucher number year
+            remote_high_water: Highest number found in the remote vouchers
+            last_remote_voucher_id: ID of the newest remote voucher
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.cursor.execute('''
+                INSERT INTO voucher_number_sync (year, remote_high_water, last_remote_voucher_id, synced_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(year) DO UPDATE SET
+                    remote_high_water = MAX(remote_high_water, excluded.remote_high_water),
+                    last_remote_voucher_id = excluded.last_remote_voucher_id,
+                    synced_at = excluded.synced_at
+            ''', (year, remote_high_water, last_remote_voucher_id, datetime.now().isoformat()))
+            self.conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error updating voucher number sync for {year}: {e}")
+            return False
+    
+    def reserve_voucher_numbers(
+        self,
+        year: int,
+        count: int,
+        floor: int,
+        session_id: str,
+        stale_before: Optional[str] = None
+    ) -> List[int]:
+        """
+        Reserve consecutive voucher numbers in the ledger.
+        
+        Runs in an IMMEDIATE transaction, so concurrent processes sharing the
+        database file are serialized and never receive the same number.
+        Numbers are allocated above both the floor (remote high-water mark)
+        and every reserved or used number; abandoned numbers may be reused,
+        unless an unfinished voucher journal item still holds them (they are
+        released when an interrupted run exits, but `--resume` creates them).
+        
+        Args:
+            year: Voucher number year
+            count: Number of voucher numbers to reserve
+            floor: Highest number already used remotely
+            session_id: Identifier of the reserving process
+            stale_before: Reservations older than this timestamp are abandoned first
+            
+        Returns:
+            List of reserved numbers
+        """
+        now = datetime.now().isoformat()
+        self.conn.commit()
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            if stale_before:
+                self.cursor.execute('''
+                    UPDATE voucher_number_ledger
+                    SET status = 'abandoned', updated_at = ?
+                    WHERE status = 'reserved' AND reserved_at < ?
+                ''', (now, stale_before))
+            
+            self.cursor.execute('''
+                SELECT COALESCE(MAX(number), 0) AS highest FROM voucher_number_ledger
+                WHERE year = ? AND status IN ('reserved', 'used')
+            ''', (year,))
+            highest = max(self.cursor.fetchone()['highest'], floor)
+            
+            prefix = f"B-{year}-"
+            self.cursor.execute('''
+                SELECT voucher_number FROM voucher_journal
+                WHERE status IN ('planned', 'creating', 'created') AND voucher_number LIKE ?
+            ''', (f"{prefix}%",))
+            for row in self.cursor.fetchall():
+                suffix = row['voucher_number'][len(prefix):]
+                if suffix.isdigit():
+                    highest = max(highest, int(suffix))
+            
+            numbers = list(range(highest + 1, highest + 1 + count))
+            self.cursor.executemany('''
+                INSERT OR REPLACE INTO voucher_number_ledger (
+                    year, number, status, session_id, voucher_id, reserved_at, updated_at
+                ) VALUES (?, ?, 'reserved', ?, NULL, ?, ?)
+            ''', [(year, number, session_id, now, now) for number in numbers])
+            self.conn.commit()
+            return numbers
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def claim_voucher_numbers(
+        self,
+        year: int,
+        numbers: List[int],
+        floor: int,
+        session_id: str
+    ) -> List[int]:
+        """
+        Reserve specific voucher numbers again (e.g. the numbers of a saved plan).
+        
+        Numbers that are used, reserved by another session or not above the
+        floor (remote high-water mark) are not claimed.
+        
+        Args:
+            year: Voucher number year
+            numbers: Voucher numbers to reserve
+            floor: Highest number already used remotely
+            session_id: Identifier of the reserving process
+            
+        Returns:
+            List of numbers that could not be claimed (empty if all were claimed)
+        """
+        now = datetime.now().isoformat()
+        self.conn.commit()
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            conflicts = []
+            for number in numbers:
+                self.cursor.execute('''
+                    SELECT status, session_id FROM voucher_number_ledger
+                    WHERE year = ? AND number = ?
+                ''', (year, number))
+                row = self.cursor.fetchone()
+                taken = row is not None and (
+                    row['status'] == 'used'
+                    or (row['status'] == 'reserved' and row['session_id'] != session_id)
+                )
+                if taken or number <= floor:
+                    conflicts.append(number)
+            
+            if not conflicts:
+                self.cursor.executemany('''
+                    INSERT OR REPLACE INTO voucher_number_ledger (
+                        year, number, status, session_id, voucher_id, reserved_at, updated_at
+                    ) VALUES (?, ?, 'reserved', ?, NULL, ?, ?)
+                ''', [(year, number, session_id, now, now) for number in numbers])
+            self.conn.commit()
+            return conflicts
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def mark_voucher_number_used(self, year: int, number: int, voucher_id: Optional[str] = None) -> bool:
+        """
+        Mark a voucher number as used by a created voucher.
+        
+        Args:
+            year: Voucher number year
+            number: Voucher number
+            voucher_id: ID of the created voucher
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            now = datetime.now().isoformat()
+            self.cursor.execute('''
+                INSERT INTO voucher_number_ledger (
+                    year, number, status, voucher_id, reserved_at, updated_at
+                ) VALUES (?, ?, 'used', ?, ?, ?)
+                ON CONFLICT(year, number) DO UPDATE SET
+                    status = 'used',
+                    voucher_id = excluded.voucher_id,
+                    updated_at = excluded.updated_at
+            ''', (year, number, voucher_id, now, now))
+            self.conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error marking voucher number B-{year}-{number} as used: {e}")
+            return False
+    
+    def abandon_voucher_numbers(self, session_id: str) -> int:
+        """
+        Release all numbers still reserved by a session.
+        
+        Args:
+            session_id: Identifier of the reserving process
+            
+        Returns:
+            Number of released voucher numbers
+        """
+        try:
+            self.cursor.execute('''
+                UPDATE voucher_number_ledger
+                SET status = 'abandoned', updated_at = ?
+                WHERE status = 'reserved' AND session_id = ?
+            ''', (datetime.now().isoformat(), session_id))
+            self.conn.commit()
+            return self.cursor.rowcount
+        except Exception as e:
+            print(f"Error releasing voucher numbers: {e}")
+            return 0
+    
+    def add_journal_items(self, items: List[Dict]) -> int:
+        """
+        Record planned voucher creations in the journal.
+        
+        Args:
+            items: Dictionaries with run_id, creator, position, transaction_id,
+                voucher_number, plan (plan item dict), check_account_id,
+                sev_client_id and is_income
+            
+        Returns:
+            Number of recorded items
+        """
+        now = datetime.now().isoformat()
+        try:
+            self.cursor.executemany('''
+                INSERT OR IGNORE INTO voucher_journal (
+                    run_id, creator, position, transaction_id, voucher_number,
+                    plan_json, check_account_id, sev_client_id, is_income,
+                    status, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'planned', ?, ?)
+            ''', [(
+                item['run_id'],
+                item['creator'],
+                item['position'],
+                str(item['transaction_id']),
+                item.get('voucher_number'),
+                json.dumps(item['plan'], default=str),
+                item.get('check_account_id'),
+                item.get('sev_client_id'),
+                1 if item.get('is_income') else 0,
+                now,
+                now
+            ) for item in items])
+            self.conn.commit()
+            return len(items)
+        except Exception as e:
+            print(f"Error recording journal items: {e}")
+            return 0
+    
+    def update_journal_item(
+        self,
+        run_id: str,
+        creator: str,
+        transaction_id: str,
+        status: str,
+        voucher_id: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """
+        Update the state of a journal item.
+        
+        Args:
+            run_id: Run that planned the item
+            creator: Voucher type that planned the item
+            transaction_id: Transaction ID of the item
+            status: New status (planned, creating, created, booked, failed)
+            voucher_id: Voucher ID (kept if None)
+            error: Error message of the last failed step (cleared if None)
+            
+        Returns:
+            True if the item was updated
+        """
+        try:
+            self.cursor.execute('''
+                UPDATE voucher_journal
+                SET status = ?, voucher_id = COALESCE(?, voucher_id), error = ?, updated_at = ?
+                WHERE run_id = ? AND creator = ? AND transaction_id = ?
+            ''', (status, voucher_id, error, datetime.now().isoformat(), run_id, creator, str(transaction_id)))
+            self.conn.commit()
+            return self.cursor.rowcount > 0
+        except Exception as e:
+            print(f"Error updating journal item {transaction_id}: {e}")
+            return False
+    
+    def get_journal_items(
+        self,
+        statuses: Optional[List[str]] = None,
+        run_id: Optional[str] = None,
+        creator: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get journal items in run and plan order.
+        
+        Args:
+            statuses: Only items with one of these statuses
+            run_id: Only items of this run
+            creator: Only items of this voucher type
+            
+        Returns:
+            List of journal item dictionaries (with the plan item decoded as 'plan')
+        """
+        query = 'SELECT * FROM voucher_journal WHERE 1=1'
+        params = []
+        if statuses:
+            query += f" AND status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        if run_id:
+            query += ' AND run_id = ?'
+            params.append(run_id)
+        if creator:
+            query += ' AND creator = ?'
+            params.append(creator)
+        query += ' ORDER BY id'
+        
+        self.cursor.execute(query, params)
+        items = []
+        for row in self.cursor.fetchall():
+            item = dict(row)
+            item['plan'] = json.loads(item.pop('plan_json'))
+            item['is_income'] = bool(item['is_income'])
+            items.append(item)
+        return items
+    
+    def add_payment_journal_items(self, items: List[Dict]) -> int:
+        """
+        Record vouchers about to be marked as paid.
+        
+        Args:
+            items: Dictionaries with run_id, position, voucher_id, voucher_date,
+                amount and check_account_id
+            
+        Returns:
+            Number of recorded items
+        """
+        now = datetime.now().isoformat()
+        try:
+            self.cursor.executemany('''
+                INSERT OR IGNORE INTO payment_journal (
+                    run_id, position, voucher_id, voucher_date, amount,
+                    check_account_id, status, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, 'pending', ?, ?)
+            ''', [(
+                item['run_id'],
+                item['position'],
+                str(item['voucher_id']),
+                item.get('voucher_date'),
+                item.get('amount'),
+                item.get('check_account_id'),
+                now,
+                now
+            ) for item in items])
+            self.conn.commit()
+            return len(items)
+        except Exception as e:
+            print(f"Error recording payment journal items: {e}")
+            return 0
+    
+    def update_payment_journal_item(
+        self,
+        run_id: str,
+        voucher_id: str,
+        status: str,
+        attempts: int,
+        error: Optional[str] = None
+    ) -> bool:
+        """
+        Update the result of a payment journal item.
+        
+        Args:
+            run_id: Run that marks the voucher
+            voucher_id: Voucher ID
+            status: New status (pending, marked, failed)
+            attempts: Number of attempts so far
+            error: Error message of the last attempt (cleared if None)
+            
+        Returns:
+            True if the item was updated
+        """
+        try:
+            self.cursor.execute('''
+                UPDATE payment_journal
+                SET status = ?, attempts = ?, error = ?, updated_at = ?
+                WHERE run_id = ? AND voucher_id = ?
+            ''', (status, attempts, error, datetime.now().isoformat(), run_id, str(voucher_id)))
+            self.conn.commit()
+            return self.cursor.rowcount > 0
+        except Exception as e:
+            print(f"Error updating payment journal item {voucher_id}: {e}")
+            return False
+    
+    def get_payment_journal_items(
+        self,
+        run_id: Optional[str] = None,
+        statuses: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        Get payment journal items in run and position order.
+        
+        Args:
+            run_id: Only items of this run
+            statuses: Only items with one of these statuses
+            
+        Returns:
+            List of payment journal item dictionaries
+        """
+        query = 'SELECT * FROM payment_journal WHERE 1=1'
+        params = []
+        if run_id:
+            query += ' AND run_id = ?'
+            params.append(run_id)
+        if statuses:
+            query += f" AND status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        query += ' ORDER BY id'
+        
+        self.cursor.execute(query, params)
+        return [dict(row) for row in self.cursor.fetchall()]
+    
+    def record_reload(self, fetched: Dict[str, int], mode: str = 'full') -> bool:
+        """
+        Record a completed reload of some tables.
+        
+        For every table, the number of stored rows and the newest update date
+        (high-water mark) are recorded with the reload time.
+        
+        Args:
+            fetched: Table name -> number of items fetched from the API
+            mode: 'full' or 'delta'
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        now = datetime.now().isoformat()
+        try:
+            for table, count in fetched.items():
+                self.cursor.execute(f'SELECT COUNT(*) AS item_count, MAX(update_date) AS high_water FROM {table}')
+                row = self.cursor.fetchone()
+                self.cursor.execute('''
+                    INSERT OR REPLACE INTO reload_metadata (
+                        entity, reloaded_at, mode, fetched, item_count, high_water
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                ''', (table, now, mode, count, row['item_count'], row['high_water']))
+            self.conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error recording reload metadata: {e}")
+            return False
+    
+    def get_reload_metadata(self) -> Dict[str, Dict]:
+        """
+        Get the last completed reload of every table.
+        
+        Returns:
+            Dictionary of table name -> reload dictionary (reloaded_at, mode,
+            fetched, item_count, high_water)
+        """
+        self.cursor.execute('SELECT * FROM reload_metadata')
+        return {row['entity']: dict(row) for row in self.cursor.fetchall()}
+    
     def close(self):
         """Close the database connection."""
         if self.conn:
@@ -0,0 +1,161 @@
+"""
+Background database writer for paged API loads.
+
+The API pages are handed to a BatchWriter as soon as they arrive; a
+dedicated thread with its own SQLite connection writes them, one database
+transaction per page. Fetching the next page and writing the previous one
+overlap. The queue between them is bounded: if the database falls behind,
+put() blocks the fetching thread until a page is written, so at most
+queue_size pages are held in memory.
+
+Usage:
+    with BatchWriter(db_path, lambda db, rows: db.bulk_insert_transactions(rows)) as writer:
+        for page in client.iter_transaction_pages():
+            writer.put(page)
+    print(writer.stats['rows_per_second'])
+"""
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .db import TransactionDB
+
+
+# Pages waiting for the writer (backpressure limit)
+PIPELINE_QUEUE_SIZE = 4
+
+# Queue marker for the end of the input
+_DONE = object()
+
+
+class BatchWriter:
+    """Writes batches of rows into the database from a background thread."""
+
+    def __init__(
+        self,
+        db_path: str,
+        write_batch: Callable[[TransactionDB, List[Dict]], int],
+        setup: Optional[Callable[[TransactionDB], None]] = None,
+        queue_size: int = PIPELINE_QUEUE_SIZE
+    ):
+        """
+        Initialize the writer (call start() or use it as a context manager).
+
+        Args:
+            db_path: Path to the SQLite database file
+            write_batch: Function writing one batch and committing it, called
+                as write_batch(db, rows); returns the number of written rows
+            setup: Function called once in the writer thread before the
+                first batch (e.g. to clear the table)
+            queue_size: Maximum number of batches waiting to be written
+        """
+        self.db_path = db_path
+        self.write_batch = write_batch
+        self.setup = setup
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._start_time = 0.0
+        self.stats = {
+            'batches': 0,
+            'rows': 0,
+            'written': 0,
+            'write_seconds': 0.0,
+            'wait_seconds': 0.0,
+            'seconds': 0.0,
+            'rows_per_second': 0.0,
+        }
+
+    def start(self):
+        """Start the writer thread."""
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+
+    def put(self, rows: List[Dict]):
+        """
+        Queue a batch for writing (blocks while the queue is full).
+
+        Raises:
+            RuntimeError: If the writer thread failed
+        """
+        self._raise_error()
+        if not rows:
+            return
+        start = time.perf_counter()
+        while True:
+            try:
+                self._queue.put(rows, timeout=0.5)
+                break
+            except queue.Full:
+                # Do not wait for a writer that is gone
+                self._raise_error()
+        self.stats['wait_seconds'] += time.perf_counter() - start
+        self.stats['batches'] += 1
+        self.stats['rows'] += len(rows)
+
+    def close(self) -> Dict:
+        """
+        Write the remaining batches and stop the writer thread.
+
+        Returns:
+            Statistics: batches, rows (queued), written, write_seconds,
+            wait_seconds (time the producer was blocked), seconds and rows_per_second
+
+        Raises:
+            RuntimeError: If the writer thread failed
+        """
+        if self._thread is not None:
+            self._queue.put(_DONE)
+            self._thread.join()
+            self._thread = None
+            self.stats['seconds'] = time.perf_counter() - self._start_time
+            if self.stats['seconds'] > 0:
+                self.stats['rows_per_second'] = self.stats['written'] / self.stats['seconds']
+        self._raise_error()
+        return self.stats
+
+    def _raise_error(self):
+        """Re-raise an error of the writer thread in the calling thread."""
+        if self._error is not None:
+            raise RuntimeError(f"Database writer failed: {self._error}") from self._error
+
+    def _run(self):
+        """Writer thread: drain the queue into the database."""
+        db = None
+        try:
+            db = TransactionDB(db_path=self.db_path)
+            if self.setup is not None:
+                self.setup(db)
+            while True:
+                rows = self._queue.get()
+                if rows is _DONE:
+                    break
+                start = time.perf_counter()
+                self.stats['written'] += self.write_batch(db, rows)
+                self.stats['write_seconds'] += time.perf_counter() - start
+        except BaseException as e:
+            self._error = e
+            # Keep draining, so a blocked producer is released
+            while self._queue.get() is not _DONE:
+                pass
+        finally:
+            if db is not None:
+                db.close()
+
+    def __enter__(self):
+        """Context manager entry (starts the writer thread)."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit (waits for the remaining batches)."""
+        if exc_type is not None and self._thread is not None:
+            # Stop after the queued batches, keep the producer's error
+            try:
+                self.close()
+            except RuntimeError:
+                pass
+            return False
+        self.close()
@@ -0,0 +1,7 @@
+"""Compiled rule matching for the CSV-configured voucher rules."""
+from .matcher import PatternSet, CompiledRuleSet
+from .cache import load_compiled, clear_compiled_cache
+from .engine import Rule, RuleEngine, get_rule_engine
+
+__all__ = ['PatternSet', 'CompiledRuleSet', 'Rule', 'RuleEngine', 'get_rule_engine',
+           'load_compiled', 'clear_compiled_cache']
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Cache of compiled rule sets.
+
+Compiling a rules CSV (parsing the rows and building the automata) is done
+once per rules file version instead of on every start:
+- In-process: the compiled object is kept per file path and reused as long
+  as the file's modification time and size are unchanged
+- On disk: the compiled object is pickled next to the CSV
+  (e.g. config/donation_rules.csv.compiled.pickle) together with the SHA-256
+  hash of the CSV content and of the compiling code (the src/rules modules
+  and the module of the build function), and rebuilt when either hash no
+  longer matches
+
+The pickle files are a local cache only (see .gitignore) and can be deleted
+at any time.
+"""
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+# Bump when the pickled classes change incompatibly
+CACHE_FORMAT_VERSION = 1
+
+# Suffix of the cache file next to the rules file
+CACHE_SUFFIX = '.compiled.pickle'
+
+# Sources of the rules package (the pickled classes live here)
+_RULES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Hashes of the compiling code of this process (source files -> hash)
+_code_hashes: Dict[Tuple[str, ...], str] = {}
+
+# Compiled rule sets of this process ((path, kind) -> (file stamp, value))
+_compiled: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+_compiled_lock = threading.Lock()
+
+
+def get_cache_path(path: str) -> str:
+    """Get the path of the cache file for a rules file."""
+    return path + CACHE_SUFFIX
+
+
+def _file_hash(path: str) -> str:
+    """Get the SHA-256 hash of a file's content."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _code_hash(build: Callable[[str], Any]) -> str:
+    """
+    Get the SHA-256 hash of the code compiling a rule set.
+
+    Covers all modules of src/rules and the module defining the build
+    function, so a code change invalidates cache files written by older code.
+    """
+    paths = sorted(glob.glob(os.path.join(_RULES_DIR, '*.py')))
+    try:
+        build_path = inspect.getsourcefile(build)
+    except TypeError:
+        build_path = None
+    if build_path:
+        build_path = os.path.abspath(build_path)
+        if build_path not in paths:
+            paths.append(build_path)
+
+    key = tuple(paths)
+    code_hash = _code_hashes.get(key)
+    if code_hash is None:
+        digest = hashlib.sha256()
+        for source_path in paths:
+            digest.update(os.path.basename(source_path).encode('utf-8'))
+            with open(source_path, 'rb') as f:
+                digest.update(f.read())
+        code_hash = _code_hashes[key] = digest.hexdigest()
+    return code_hash
+
+
+def _read_cache(cache_path: str, kind: str, file_hash: str):
+    """
+    Read a compiled rule set from its cache file.
+
+    Returns:
+        The cached value or None if missing, outdated or unreadable
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+    if not isinstance(entry, dict):
+        return None
+    if (entry.get('version') != CACHE_FORMAT_VERSION
+            or entry.get('kind') != kind
+            or entry.get('hash') != file_hash):
+        return None
+    return entry.get('value')
+
+
+def _write_cache(cache_path: str, kind: str, file_hash: str, value: Any):
+    """Write a compiled rule set to its cache file (atomically, errors ignored)."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    entry = {
+        'version': CACHE_FORMAT_VERSION,
+        'kind': kind,
+        'hash': file_hash,
+        'value': value,
+    }
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"⚠️  Warning: Could not write rule cache {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_compiled(path: str, kind: str, build: Callable[[str], Any]) -> Tuple[Any, str]:
+    """
+    Get the compiled rule set of a rules file.
+
+    Args:
+        path: Path to the rules CSV
+        kind: Name of the compiled format (several builders may use one file)
+        build: Function compiling the rules file, called as build(path)
+
+    Returns:
+        Tuple of (compiled value, source) where source is 'memory' (already
+        loaded by this process), 'cache' (read from the cache file) or
+        'compiled' (built from the CSV)
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = (path, kind)
+
+    with _compiled_lock:
+        cached = _compiled.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], 'memory'
+
+        cache_path = get_cache_path(path)
+        # The key covers the CSV and the code that compiled it
+        file_hash = f"{_file_hash(path)}:{_code_hash(build)}"
+
+        value = _read_cache(cache_path, kind, file_hash)
+        source = 'cache'
+        if value is None:
+            value = build(path)
+            source = 'compiled'
+            _write_cache(cache_path, kind, file_hash, value)
+
+        _compiled[key] = (stamp, value)
+        return value, source
+
+
+def clear_compiled_cache():
+    """Forget the compiled rule sets of this process (cache files are kept)."""
+    with _compiled_lock:
+        _compiled.clear()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Declarative rule engine for assigning transactions to voucher types.
+
+Rules are read from config/creator_rules.csv (see config/CREATOR_RULES_README.md).
+Each rule names a target voucher type and any combination of:
+- payee_pattern / purpose_pattern: text patterns ('&&' joins several
+  patterns that must all match)
+- match_mode: 'contains', 'startswith' or 'exact'
+- case_fold: '', 'upper' or 'lower' (applied to text and pattern)
+- amount_sign: '', 'positive' (> 0) or 'negative' (< 0)
+- amount_min / amount_max: inclusive bounds on the signed amount
+- check_account_id: exact check account ID
+- priority: lower number = checked first
+
+All text patterns of all rules are compiled into one CompiledRuleSet, so a
+transaction is matched against every rule with one scan per text field.
+"""
+import csv
+import os
+from typing import Dict, List, Optional
+
+from src.rules.cache import load_compiled
+from src.rules.matcher import CompiledRuleSet
+
+
+# Default rules file
+DEFAULT_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'config',
+    'creator_rules.csv'
+)
+
+# Separator for several patterns of one field
+PATTERN_SEPARATOR = '&&'
+
+# Case folding functions
+CASE_FOLDS = {
+    '': lambda text: text,
+    'upper': str.upper,
+    'lower': str.lower,
+}
+
+
+def _parse_amount(value: Optional[str]) -> Optional[float]:
+    """Parse an optional amount bound from CSV."""
+    value = (value or '').strip()
+    return float(value) if value else None
+
+
+class Rule:
+    """A single transaction matching rule from CSV."""
+
+    def __init__(self, rule_dict: Dict):
+        """Initialize rule from CSV row."""
+        self.target = (rule_dict.get('target') or '').strip()
+        self.payee_patterns = self._split_patterns(rule_dict.get('payee_pattern'))
+        self.purpose_patterns = self._split_patterns(rule_dict.get('purpose_pattern'))
+        self.match_mode = (rule_dict.get('match_mode') or 'contains').strip()
+        self.case_fold = (rule_dict.get('case_fold') or '').strip().lower()
+        self.amount_sign = (rule_dict.get('amount_sign') or '').strip().lower()
+        self.amount_min = _parse_amount(rule_dict.get('amount_min'))
+        self.amount_max = _parse_amount(rule_dict.get('amount_max'))
+        self.check_account_id = (rule_dict.get('check_account_id') or '').strip()
+        self.priority = int((rule_dict.get('priority') or '').strip() or 999)
+        self.description = (rule_dict.get('description') or '').strip()
+
+        if self.case_fold not in CASE_FOLDS:
+            raise ValueError(f"Unknown case_fold '{self.case_fold}' in rule for {self.target}")
+        if self.amount_sign not in ('', 'positive', 'negative'):
+            raise ValueError(f"Unknown amount_sign '{self.amount_sign}' in rule for {self.target}")
+
+        fold = CASE_FOLDS[self.case_fold]
+        self.payee_patterns = [fold(p) for p in self.payee_patterns]
+        self.purpose_patterns = [fold(p) for p in self.purpose_patterns]
+
+    @staticmethod
+    def _split_patterns(value: Optional[str]) -> List[str]:
+        """Split a CSV pattern cell into its non-empty patterns."""
+        return [p.strip() for p in (value or '').split(PATTERN_SEPARATOR) if p.strip()]
+
+    def get_conditions(self) -> Dict:
+        """Get the text patterns for CompiledRuleSet (field -> list of (pattern, mode))."""
+        suffix = f":{self.case_fold}" if self.case_fold else ''
+        return {
+            f"payee{suffix}": [(p, self.match_mode) for p in self.payee_patterns],
+            f"purpose{suffix}": [(p, self.match_mode) for p in self.purpose_patterns],
+        }
+
+    def matches_values(self, amount: float, check_account_id: Optional[str]) -> bool:
+        """Check the non-text conditions (amount sign and range, check account)."""
+        if self.amount_sign == 'positive' and not amount > 0:
+            return False
+        if self.amount_sign == 'negative' and not amount < 0:
+            return False
+        if self.amount_min is not None and amount < self.amount_min:
+            return False
+        if self.amount_max is not None and amount > self.amount_max:
+            return False
+        if self.check_account_id and str(check_account_id or '') != self.check_account_id:
+            return False
+        return True
+
+
+class RuleEngine:
+    """
+    All rules compiled into one indexed matcher.
+
+    Usage:
+        engine = RuleEngine.from_csv('config/creator_rules.csv')
+        engine.targets_for(transaction)    # ['gehalt']
+    """
+
+    def __init__(self, rules: List[Rule]):
+        """
+        Compile the rules.
+
+        Args:
+            rules: List of rules (sorted by priority here, stable for equal priorities)
+        """
+        self.rules = sorted(rules, key=lambda r: r.priority)
+        self.targets = {rule.target for rule in self.rules}
+        self._folds = {rule.case_fold for rule in self.rules}
+        self._matcher = CompiledRuleSet(rule.get_conditions() for rule in self.rules)
+
+    @classmethod
+    def from_csv(cls, path: str = DEFAULT_RULES_PATH) -> 'RuleEngine':
+        """
+        Load rules from a CSV file.
+
+        Lines whose target starts with '#' and empty lines are skipped.
+
+        Args:
+            path: Path to the rules CSV
+
+        Returns:
+            RuleEngine instance
+        """
+        rules = []
+        with open(path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                target = (row.get('target') or '').strip()
+                if not target or target.startswith('#'):
+                    continue
+                rules.append(Rule(row))
+        return cls(rules)
+
+    def has_target(self, target: str) -> bool:
+        """Check whether rules exist for a target voucher type."""
+        return target in self.targets
+
+    def match(
+        self,
+        payee: Optional[str],
+        purpose: Optional[str],
+        amount: float = 0.0,
+        check_account_id: Optional[str] = None
+    ) -> List[Rule]:
+        """
+        Get all matching rules in priority order.
+
+        Args:
+            payee: Payee/payer name
+            purpose: Payment purpose
+            amount: Signed amount (income > 0, expense < 0)
+            check_account_id: Check account ID
+
+        Returns:
+            List of matching rules
+        """
+        payee = payee or ''
+        purpose = purpose or ''
+        texts = {}
+        for fold_name in self._folds:
+            fold = CASE_FOLDS[fold_name]
+            suffix = f":{fold_name}" if fold_name else ''
+            texts[f"payee{suffix}"] = fold(payee)
+            texts[f"purpose{suffix}"] = fold(purpose)
+
+        matched = []
+        for index in self._matcher.match_all(texts):
+            rule = self.rules[index]
+            if rule.matches_values(amount, check_account_id):
+                matched.append(rule)
+        return matched
+
+    def match_transaction(self, transaction: Dict) -> List[Rule]:
+        """
+        Get all rules matching a transaction row, in priority order.
+
+        Args:
+            transaction: Transaction dictionary from the database
+
+        Returns:
+            List of matching rules
+        """
+        # Imported here: src.vouchers imports this module
+        from src.vouchers.voucher_utils import get_transaction_raw_data
+
+        raw_data = get_transaction_raw_data(transaction)
+        return self.match(
+            raw_data.get('payeePayerName'),
+            transaction.get('paymt_purpose'),
+            float(transaction.get('amount') or 0),
+            transaction.get('check_account_id')
+        )
+
+    def targets_for(self, transaction: Dict) -> List[str]:
+        """
+        Get the target voucher types of a transaction, in priority order.
+
+        The result is cached in the transaction row, so all voucher creators
+        asking about the same transaction share one evaluation.
+
+        Args:
+            transaction: Transaction dictionary from the database
+
+        Returns:
+            List of target names (without duplicates)
+        """
+        cached = transaction.get('_rule_targets')
+        if cached is not None and cached[0] is self:
+            return cached[1]
+
+        targets = []
+        for rule in self.match_transaction(transaction):
+            if rule.target not in targets:
+                targets.append(rule.target)
+        transaction['_rule_targets'] = (self, targets)
+        return targets
+
+
+def get_rule_engine(path: str = DEFAULT_RULES_PATH) -> RuleEngine:
+    """
+    Get the rule engine for a rules file.
+
+    The compiled engine is cached (see src/rules/cache.py) and rebuilt only
+    when the rules file changes.
+
+    Args:
+        path: Path to the rules CSV
+
+    Returns:
+        RuleEngine instance
+    """
+    engine, _ = load_compiled(path, 'rule_engine', RuleEngine.from_csv)
+    return engine
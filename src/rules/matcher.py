@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Compiled multi-pattern matching for rule files.
+
+Rules from the CSV configuration (e.g. config/donation_rules.csv) test text
+fields against many patterns. Instead of checking every pattern one by one,
+all patterns of a field are compiled into automata and each text is scanned
+once per match mode:
+- contains:   Aho-Corasick automaton (all substrings in one pass)
+- startswith: Trie walked along the start of the text
+- exact:      Hash lookup
+
+Matching is case-sensitive and gives exactly the same results as the
+plain `pattern in text`, `text.startswith(pattern)` and `text == pattern`
+checks. Unknown match modes behave like 'contains'.
+"""
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+# Match modes
+MATCH_CONTAINS = 'contains'
+MATCH_STARTSWITH = 'startswith'
+MATCH_EXACT = 'exact'
+
+
+class _Trie:
+    """Character trie; base of the startswith and Aho-Corasick matchers."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Tuple] = [()]
+
+    def add(self, pattern: str, key: Hashable):
+        """Add a pattern reported as key."""
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._out.append(())
+                self._goto[state][ch] = next_state
+            state = next_state
+        if key not in self._out[state]:
+            self._out[state] += (key,)
+
+    def compile(self):
+        """Finish construction (nothing to do for a plain trie)."""
+
+    def search(self, text: str) -> Set:
+        """Return the keys of all patterns that are a prefix of text."""
+        goto = self._goto
+        out = self._out
+        found = set(out[0])
+        state = 0
+        for ch in text:
+            state = goto[state].get(ch)
+            if state is None:
+                break
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class _AhoCorasick(_Trie):
+    """Aho-Corasick automaton reporting all patterns contained in a text."""
+
+    def __init__(self):
+        super().__init__()
+        self._fail: List[int] = [0]
+
+    def compile(self):
+        """Build failure links and merge outputs along them (breadth-first)."""
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] += tuple(
+                    key for key in self._out[self._fail[next_state]]
+                    if key not in self._out[next_state]
+                )
+
+    def search(self, text: str) -> Set:
+        """Return the keys of all patterns contained in text."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        found = set(out[0])
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class PatternSet:
+    """
+    Many (pattern, match mode) entries compiled for one-pass matching.
+
+    Usage:
+        patterns = PatternSet()
+        patterns.add('Spende', 'contains', key=0)
+        patterns.add('Monatsspende', 'startswith', key=1)
+        patterns.compile()
+        patterns.search('Monatsspende 10')   # {0, 1}
+    """
+
+    def __init__(self):
+        self._contains = _AhoCorasick()
+        self._startswith = _Trie()
+        self._exact: Dict[str, Tuple] = {}
+        self._modes = set()
+        self._compiled = False
+
+    def add(self, pattern: str, mode: str, key: Hashable):
+        """
+        Add a pattern.
+
+        Args:
+            pattern: Pattern text (case-sensitive)
+            mode: 'contains', 'startswith' or 'exact' (anything else = contains)
+            key: Value reported by search() when the pattern matches
+        """
+        if mode == MATCH_EXACT:
+            if key not in self._exact.get(pattern, ()):
+                self._exact[pattern] = self._exact.get(pattern, ()) + (key,)
+            self._modes.add(MATCH_EXACT)
+        elif mode == MATCH_STARTSWITH:
+            self._startswith.add(pattern, key)
+            self._modes.add(MATCH_STARTSWITH)
+        else:
+            self._contains.add(pattern, key)
+            self._modes.add(MATCH_CONTAINS)
+        self._compiled = False
+
+    def compile(self):
+        """Build the automata. Called automatically by search() if needed."""
+        self._contains.compile()
+        self._startswith.compile()
+        self._compiled = True
+
+    def search(self, text: str) -> Set:
+        """
+        Find all patterns matching a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of keys of the matching patterns
+        """
+        if not self._compiled:
+            self.compile()
+
+        found = set()
+        if MATCH_CONTAINS in self._modes:
+            found |= self._contains.search(text)
+        if MATCH_STARTSWITH in self._modes:
+            found |= self._startswith.search(text)
+        if MATCH_EXACT in self._modes:
+            found.update(self._exact.get(text, ()))
+        return found
+
+
+class CompiledRuleSet:
+    """
+    A list of rules compiled into one PatternSet per text field.
+
+    Each rule is a dictionary of field name -> (pattern, match mode), or
+    field name -> list of (pattern, match mode) when a field must contain
+    several patterns. A rule matches when all of its patterns match; a rule
+    without patterns matches every input. Rules keep their list order, so callers that pass
+    rules sorted by priority get matches in priority order.
+
+    Usage:
+        rules = CompiledRuleSet([
+            {'purpose': ('Mission', 'contains')},
+            {'payer_name': ('Karina', 'contains'), 'purpose': ('Für die', 'startswith')},
+            {},  # catch-all
+        ])
+        rules.match_all({'payer_name': 'X', 'purpose': 'Mission 2025'})   # [0, 2]
+    """
+
+    def __init__(self, rules: Iterable[Dict]):
+        """
+        Compile the rules.
+
+        Args:
+            rules: List of dicts field -> (pattern, match mode) or list of them;
+                   empty patterns are ignored
+        """
+        self._fields: Dict[str, PatternSet] = {}
+        self._required: List[int] = []
+        self._unconditional: List[int] = []
+
+        for index, conditions in enumerate(rules):
+            required = 0
+            for field, patterns in conditions.items():
+                if isinstance(patterns, tuple):
+                    patterns = [patterns]
+                for pattern, mode in patterns:
+                    if not pattern:
+                        continue
+                    # Key per pattern, so several patterns of one field count separately
+                    self._fields.setdefault(field, PatternSet()).add(pattern, mode, (index, required))
+                    required += 1
+            self._required.append(required)
+            if required == 0:
+                self._unconditional.append(index)
+
+        for patterns in self._fields.values():
+            patterns.compile()
+
+    def __len__(self) -> int:
+        return len(self._required)
+
+    def _hit_counts(self, texts: Dict[str, Optional[str]]) -> Dict[int, int]:
+        """Count the matching field patterns per rule."""
+        counts: Dict[int, int] = {}
+        for field, patterns in self._fields.items():
+            for index, _ in patterns.search(texts.get(field) or ''):
+                counts[index] = counts.get(index, 0) + 1
+        return counts
+
+    def match_all(self, texts: Dict[str, Optional[str]]) -> List[int]:
+        """
+        Get all matching rules.
+
+        Args:
+            texts: Dict of field name -> text (None counts as empty text)
+
+        Returns:
+            Indices of the matching rules, in rule order
+        """
+        counts = self._hit_counts(texts)
+        matched = [index for index, count in counts.items() if count == self._required[index]]
+        matched.extend(self._unconditional)
+        return sorted(matched)
+
+    def match_any(self, texts: Dict[str, Optional[str]]) -> bool:
+        """
+        Check whether at least one rule matches.
+
+        Args:
+            texts: Dict of field name -> text (None counts as empty text)
+
+        Returns:
+            True if any rule matches
+        """
+        if self._unconditional:
+            return True
+        counts = self._hit_counts(texts)
+        return any(count == self._required[index] for index, count in counts.items())
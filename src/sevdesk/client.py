@@ -1,7 +1,9 @@
 """SevDesk API Client for fetching transactions and other data."""
 import requests
+import threading
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 
 
 class SevDeskClient:
@@ -24,13 +26,21 @@ class SevDeskClient:
         })
         self.rate_limit_delay = 0.1  # 100ms between requests
         self.last_request_time = 0
+        self._rate_limit_lock = threading.Lock()
     
     def _rate_limit(self):
-        """Implement simple rate limiting."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time = time.time()
+        """
+        Implement simple rate limiting.
+        
+        The slots are handed out under a lock, so threads sharing this client
+        together stay within the rate limit.
+        """
+        with self._rate_limit_lock:
+            now = time.time()
+            request_time = max(now, self.last_request_time + self.rate_limit_delay)
+            self.last_request_time = request_time
+        if request_time > now:
+            time.sleep(request_time - now)
     
     def _request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
                  data: Optional[Dict] = None) -> Dict:
@@ -112,7 +122,24 @@ class SevDeskClient:
             List of all transaction dictionaries
         """
         all_transactions = []
-        limit = 1000
+        for transactions in self.iter_transaction_pages(status=status):
+            all_transactions.extend(transactions)
+        
+        print(f"Total transactions fetched: {len(all_transactions)}")
+        return all_transactions
+    
+    def iter_transaction_pages(self, status: Optional[int] = None,
+                               limit: int = 1000) -> Iterator[List[Dict]]:
+        """
+        Fetch transactions page by page.
+        
+        Args:
+            status: Filter by transaction status (100=Open, 200=Linked, 300=Booked)
+            limit: Transactions per request (default: 1000)
+            
+        Yields:
+            Lists of transaction dictionaries
+        """
         offset = 0
         
         while True:
@@ -122,16 +149,13 @@ class SevDeskClient:
             if not transactions:
                 break
             
-            all_transactions.extend(transactions)
+            yield transactions
             
             # If we got fewer transactions than the limit, we've reached the end
             if len(transactions) < limit:
                 break
             
             offset += limit
-        
-        print(f"Total transactions fetched: {len(all_transactions)}")
-        return all_transactions
     
     def get_transaction(self, transaction_id: str) -> Optional[Dict]:
         """
@@ -303,6 +327,95 @@ class SevDeskClient:
         response = self._request('POST', '/Voucher/Factory/saveVoucher', data=voucher_data)
         return response
     
+    def get_vouchers(self, limit: int = 100, offset: int = 0,
+                     status: Optional[int] = None, credit_debit: Optional[str] = None,
+                     order_by: str = 'create') -> List[Dict]:
+        """
+        Fetch one page of vouchers (most recently created first).
+        
+        Args:
+            limit: Maximum number of vouchers to fetch (default: 100)
+            offset: Offset for pagination (default: 0)
+            status: Filter by voucher status (50=Draft/Unpaid, 100=Open/Paid, 1000=Paid)
+            credit_debit: Filter by 'D' (income) or 'C' (expense)
+            order_by: 'create' or 'update' (most recently changed first)
+            
+        Returns:
+            List of voucher dictionaries
+        """
+        params = {
+            'limit': limit,
+            'offset': offset,
+            f'order[{order_by}]': 'DESC'
+        }
+        
+        if status is not None:
+            params['status'] = status
+        if credit_debit is not None:
+            params['creditDebit'] = credit_debit
+        
+        response = self._request('GET', '/Voucher', params=params)
+        
+        if response and 'objects' in response:
+            return response['objects']
+        return []
+    
+    def iter_voucher_pages(self, page_size: int = 100, jobs: int = 1,
+                           status: Optional[int] = None,
+                           credit_debit: Optional[str] = None) -> Iterator[List[Dict]]:
+        """
+        Fetch all pages of vouchers, `jobs` pages at the same time.
+        
+        Pages are requested in waves of `jobs` offsets (all requests share the
+        rate limit) and yielded in order as soon as they arrive, so callers
+        can process the first pages while later ones are still loading.
+        
+        Args:
+            page_size: Vouchers per request (default: 100)
+            jobs: Number of concurrent requests (default: 1)
+            status: Filter by voucher status
+            credit_debit: Filter by 'D' (income) or 'C' (expense)
+            
+        Yields:
+            Lists of voucher dictionaries (most recently created first)
+        """
+        def fetch(offset: int) -> List[Dict]:
+            return self.get_vouchers(limit=page_size, offset=offset,
+                                     status=status, credit_debit=credit_debit)
+        
+        jobs = max(1, jobs)
+        offset = 0
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            while True:
+                offsets = [offset + i * page_size for i in range(jobs)]
+                for vouchers in executor.map(fetch, offsets):
+                    if vouchers:
+                        yield vouchers
+                    # A short page is the last one
+                    if len(vouchers) < page_size:
+                        return
+                offset += jobs * page_size
+    
+    def get_voucher_positions(self, voucher_id: str) -> List[Dict]:
+        """
+        Fetch the positions of a voucher.
+        
+        Args:
+            voucher_id: The voucher ID
+            
+        Returns:
+            List of voucher position dictionaries
+        """
+        params = {
+            'voucher[id]': voucher_id,
+            'voucher[objectName]': 'Voucher'
+        }
+        response = self._request('GET', '/VoucherPos', params=params)
+        
+        if response and 'objects' in response:
+            return response['objects']
+        return []
+    
     def get_all_vouchers(self, limit: int = 1, sort_by_date: bool = True, fetch_all: bool = False) -> List[Dict]:
         """
         Fetch vouchers from SevDesk API.
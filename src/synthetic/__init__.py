@@ -0,0 +1,6 @@
+"""Deterministic synthetic SevDesk data (for benchmarks without customer data)."""
+from .generator import SyntheticDataset, write_dataset, dump_dataset_json, load_donation_purposes
+from .client import SyntheticClient
+
+__all__ = ['SyntheticDataset', 'SyntheticClient', 'write_dataset', 'dump_dataset_json',
+           'load_donation_purposes']
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Offline SevDesk client serving a synthetic dataset.
+
+SyntheticClient answers the API requests of the loaders and voucher
+creators from a SyntheticDataset instead of the network (no rate limit),
+so planning, reloading and voucher creation can be measured without an
+account. Created vouchers and booked transactions are kept in memory.
+"""
+import threading
+from typing import Dict, List, Optional
+
+from src.sevdesk.client import SevDeskClient
+from .generator import SyntheticDataset
+
+
+class SyntheticClient(SevDeskClient):
+    """SevDeskClient answering requests from a synthetic dataset."""
+
+    def __init__(self, dataset: SyntheticDataset):
+        """
+        Initialize the client (the dataset is materialized on first use).
+
+        Args:
+            dataset: Dataset to serve
+        """
+        super().__init__(api_key='synthetic', base_url='synthetic://sevdesk')
+        self.rate_limit_delay = 0
+        self.dataset = dataset
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._entities: Optional[Dict[str, List[Dict]]] = None
+        self._by_id: Dict[str, Dict[str, Dict]] = {}
+
+    def _get_entities(self) -> Dict[str, List[Dict]]:
+        """Materialize the dataset (once)."""
+        with self._lock:
+            if self._entities is None:
+                self._entities = {
+                    'CheckAccountTransaction': self.dataset.transactions(),
+                    'CostCentre': self.dataset.cost_centres(),
+                    'AccountingType': self.dataset.accounting_types(),
+                    'Category': self.dataset.categories(),
+                    'Contact': self.dataset.contacts(),
+                    # The API lists vouchers most recently created first
+                    'Voucher': list(reversed(self.dataset.vouchers())),
+                }
+                self._by_id = {
+                    name: {str(item['id']): item for item in items}
+                    for name, items in self._entities.items()
+                }
+            return self._entities
+
+    def test_connection(self) -> bool:
+        """The synthetic API is always reachable."""
+        return True
+
+    def _request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                 data: Optional[Dict] = None) -> Dict:
+        """
+        Answer a request from the dataset.
+
+        Supported: GET lists (limit, offset, status and creditDebit filters),
+        GET by ID, saving vouchers and booking voucher amounts.
+
+        Raises:
+            NotImplementedError: For any other request
+        """
+        entities = self._get_entities()
+        params = params or {}
+        parts = endpoint.strip('/').split('/')
+        with self._lock:
+            self.requests += 1
+
+        if method == 'GET' and parts[0] == 'VoucherPos':
+            return {'objects': []}
+
+        if method == 'GET' and parts[0] in entities:
+            if len(parts) == 2:
+                item = self._by_id[parts[0]].get(parts[1])
+                return {'objects': [item] if item else []}
+            items = entities[parts[0]]
+            if params.get('status') is not None:
+                items = [item for item in items if str(item.get('status')) == str(params['status'])]
+            if params.get('creditDebit'):
+                items = [item for item in items if item.get('creditDebit') == params['creditDebit']]
+            if params.get('order[update]'):
+                items = sorted(items, key=lambda item: item.get('update') or '', reverse=True)
+            offset = int(params.get('offset', 0))
+            limit = int(params.get('limit', len(items) or 1))
+            return {'objects': items[offset:offset + limit]}
+
+        if method == 'POST' and endpoint == '/Voucher/Factory/saveVoucher':
+            return {'objects': {'voucher': self._save_voucher(data)}}
+
+        if method == 'PUT' and parts[0] == 'Voucher' and parts[-1] == 'bookAmount':
+            return {'objects': self._book_amount(parts[1], data)}
+
+        raise NotImplementedError(f"SyntheticClient does not support {method} {endpoint}")
+
+    def _save_voucher(self, data: Dict) -> Dict:
+        """Store a created voucher (listed first, like the newest voucher)."""
+        voucher_data = data.get('voucher') or {}
+        positions = data.get('voucherPosSave') or []
+        with self._lock:
+            vouchers = self._entities['Voucher']
+            voucher = dict(
+                voucher_data,
+                id=str(60_000_000 + len(vouchers)),
+                objectName='Voucher',
+                sumGross=str(sum(float(pos.get('sumGross') or 0) for pos in positions)),
+                paidAmount='0'
+            )
+            vouchers.insert(0, voucher)
+            self._by_id['Voucher'][voucher['id']] = voucher
+        return voucher
+
+    def _book_amount(self, voucher_id: str, data: Dict) -> Dict:
+        """Mark a voucher as paid and its transaction as booked."""
+        with self._lock:
+            voucher = self._by_id['Voucher'].get(str(voucher_id))
+            if voucher is None:
+                raise NotImplementedError(f"Unknown voucher {voucher_id}")
+            voucher['status'] = '1000'
+            voucher['paidAmount'] = str(data.get('amount'))
+            transaction_id = str((data.get('checkAccountTransaction') or {}).get('id'))
+            transaction = self._by_id['CheckAccountTransaction'].get(transaction_id)
+            if transaction is not None:
+                transaction['status'] = 300
+        return {'id': voucher['id']}
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic SevDesk data for performance measurements.
+
+A SyntheticDataset produces the entities of a church bookkeeping account in
+the JSON shape the SevDesk API (and SevDeskClient) returns:
+- Cost centres and accounting types used by every voucher creator
+- Contacts: organisations, employees and donors with German names (umlauts)
+- Check account transactions covering every creator's patterns (Gehalt,
+  ÜLP, Spenden per config/donation_rules.csv, Krankenkassen, Grace Baptist,
+  Kontaktmission, EBTC, JEK Freizeit, Geldtransit/Bankeinzug, PayPal and
+  bank fees) mixed with transactions no creator claims
+- Existing vouchers with B-YYYY-NR numbers, including unpaid Bar-Kollekten
+
+The same seed and sizes always give the same data. Large entity types are
+generated in chunks with their own random generator, so pages can be
+streamed into a database (see write_dataset()) without holding 1M rows in
+memory and the content does not depend on the page size.
+
+Usage:
+    dataset = SyntheticDataset(transactions=100_000, seed=7)
+    write_dataset(dataset, 'synthetic.db')
+    for page in dataset.iter_transaction_pages():
+        ...
+"""
+import csv
+import json
+import os
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.database.db import TransactionDB
+
+
+# Rows generated with one random generator (independent of the page size)
+CHUNK_SIZE = 1000
+
+# Default donation rules (purposes of generated donations)
+DONATION_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'config',
+    'donation_rules.csv'
+)
+
+# Share of transactions per pattern (relative weights)
+PATTERN_WEIGHTS = {
+    'spenden': 40,
+    'gehalt': 6,
+    'ulp': 3,
+    'krankenkassen': 4,
+    'grace_baptist': 1,
+    'kontaktmission': 1,
+    'ebtc': 1,
+    'jek_freizeit': 3,
+    'bankeinzug': 3,
+    'paypal_purchase': 3,
+    'paypal_fees': 3,
+    'bank_fees': 1,
+    'other': 31,
+}
+
+FIRST_NAMES = [
+    'Jürgen', 'Jörg', 'Günter', 'Björn', 'Sören', 'Ännchen', 'Käthe', 'Jürgen-Paul',
+    'Anna', 'Lukas', 'Maria', 'Johannes', 'Elisabeth', 'Matthias', 'Sophie', 'Tobias',
+    'Hanna', 'Jonas', 'Lea', 'Felix', 'Ruth', 'Daniel', 'Miriam', 'Simon', 'Esther',
+    'Benedikt', 'Gisela', 'Hans-Jürgen', 'Dörte', 'Uwe', 'Heike', 'Rüdiger', 'Bärbel',
+    'Maximilian', 'Charlotte', 'Friedrich', 'Mathilde', 'Konrad', 'Agnes', 'Lorenz',
+]
+
+LAST_NAMES = [
+    'Müller', 'Schäfer', 'Weiß', 'Groß', 'Köhler', 'Bäcker', 'Schröder', 'Krüger',
+    'Hoffmann', 'Schmidt', 'Schneider', 'Fischer', 'Wagner', 'Becker', 'Jäger', 'Löffler',
+    'Hübner', 'Fröhlich', 'Günther', 'Kühn', 'Böhm', 'Lehmann', 'Schulze', 'Keßler',
+    'Dörr', 'Möller', 'Zimmermann', 'Braun', 'Wünsch', 'Vogel', 'Strauß', 'Nüßlein',
+    'Gärtner', 'Häußler', 'Sauer', 'Brückner', 'Öztürk', 'Weiler', 'Krämer', 'Kuß',
+]
+
+MONTHS = [
+    'Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
+    'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember',
+]
+
+# (payee name in transactions, cost centre name) of the fixed employees
+EMPLOYEES = [
+    ('Gwendolyn Ruth Dewhurst', 'Gwen Dewhurst'),
+    ('Samuel Jeanrichard', 'Samuel Jeanrichard (intern)'),
+    ('Tobias Zimmermann', 'Tobias Zimmermann'),
+]
+
+# Cost centres the creators look up by name
+COST_CENTRE_NAMES = [
+    'Gwen Dewhurst', 'Samuel Jeanrichard (intern)', 'Tobias Zimmermann', 'Tobias Zimmermann (ÜLP)',
+    'Tobias Zimmermann (Spende für Tobias)', 'Lohnnebenkosten', 'Wilhelmson', 'Hodzi',
+    'Spendenausgänge', 'Spendeneingänge Konto', 'Spendeneingänge Missionare', 'JEK Freizeiten',
+    'Buchführung, Bankgebühren', 'Bar-Kollekten', 'Bar-Kollekten Missionare', 'Gemeindehaus',
+    'Jugendarbeit', 'Kinderarbeit', 'Musik', 'Mission allgemein',
+]
+
+ACCOUNTING_TYPE_NAMES = [
+    'Lohn / Gehalt', 'Übungsleiterpauschale', 'Spendeneingang', 'Krankenkasse',
+    'Zuwendungen, Spenden für kirchliche, religiöse und gemeinnützige Zwecke',
+    'Durchlaufende Posten', 'Geldtransit', 'Kontoführung / Kartengebühren', 'Miete',
+    'Strom, Gas, Wasser', 'Telefon / Internet', 'Porto', 'Bürobedarf', 'Versicherungen',
+    'Reisekosten', 'Bewirtung', 'Literatur', 'Instandhaltung',
+]
+
+# (name, category ID) of the organisations the creators match
+ORGANISATIONS = [
+    ('Techniker Krankenkasse', 3), ('Bundesknappschaft Ost', 3), ('Verwaltungs-Berufsgenossenschaft', 3),
+    ('GRACE BAPTIST TAMPERE RY', 3), ('KONTAKTMISSION DEUTSCHLAND', 3), ('EBTC', 3),
+    ('70000', 3), ('Paypal Inc.', 3), ('PayPal (Europe) S.a r.l. et Cie, S. C.A.', 3),
+    ('Stadtwerke München', 3), ('Deutsche Telekom AG', 3), ('Christliche Buchhandlung Köln', 3),
+]
+
+# Payees of transactions no creator claims
+OTHER_PAYEES = [
+    ('Stadtwerke München', 'Abschlag Strom {month} {year}'),
+    ('Deutsche Telekom AG', 'Rechnung {month} {year} Kd-Nr 4711'),
+    ('Hausverwaltung Ölmühle GmbH', 'Miete Gemeinderäume {month}'),
+    ('Christliche Buchhandlung Köln', 'Rechnung 2024-{number}'),
+    ('Deutsche Post AG', 'Porto Gemeindebrief'),
+    ('Allianz Versicherungs-AG', 'Beitrag Haftpflicht {year}'),
+    ('Bäckerei Größer', 'Bewirtung Gemeindefest'),
+]
+
+KRANKENKASSEN = ['Techniker Krankenkasse', 'Knappschaft-Bahn-See', 'Verwaltungs-Berufsgenossenschaft']
+
+SHOPS = ['Amazon Marketplace', 'Bücher Schäfer', 'Musikhaus Thomann', 'Büroshop Müller']
+
+
+def load_donation_purposes(path: str = DONATION_RULES_PATH) -> List[Tuple[Optional[str], str, str]]:
+    """
+    Get the donation purposes matched by the donation rules.
+
+    Args:
+        path: Path to donation_rules.csv
+
+    Returns:
+        List of (payer name or None, purpose pattern, match mode); the
+        generic 'Spende' if the file is missing
+    """
+    purposes = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                pattern = (row.get('purpose_pattern') or '').strip()
+                if row.get('rule_type') not in ('filter', 'type') or not pattern:
+                    continue
+                purposes.append((
+                    (row.get('payer_name_pattern') or '').strip() or None,
+                    pattern,
+                    (row.get('match_mode') or 'contains').strip()
+                ))
+    return purposes or [(None, 'Spende', 'contains')]
+
+
+def _person_name(index: int) -> Tuple[str, str]:
+    """Get the (first name, family name) of a generated person (unique per index)."""
+    first_index = index % len(FIRST_NAMES)
+    rest = index // len(FIRST_NAMES)
+    # Shifted per first name, so consecutive persons get different family names
+    family = LAST_NAMES[(rest + first_index * 13) % len(LAST_NAMES)]
+    first = FIRST_NAMES[first_index]
+    rest //= len(LAST_NAMES)
+    if rest:
+        family = f"{family}-{LAST_NAMES[(rest - 1) % len(LAST_NAMES)]}"
+    return first, family
+
+
+def _ascii_upper(name: str) -> str:
+    """Write a name like a bank export does (JÜRGEN -> JUERGEN)."""
+    for umlaut, replacement in (('ä', 'ae'), ('ö', 'oe'), ('ü', 'ue'), ('ß', 'ss'),
+                                ('Ä', 'Ae'), ('Ö', 'Oe'), ('Ü', 'Ue')):
+        name = name.replace(umlaut, replacement)
+    return name.upper()
+
+
+def _iban(rng: random.Random) -> str:
+    """Get a random German IBAN-like account number."""
+    return f"DE{rng.randint(10, 99)}{rng.randint(10 ** 17, 10 ** 18 - 1)}"
+
+
+class SyntheticDataset:
+    """Deterministic synthetic SevDesk entities at a configurable scale."""
+
+    def __init__(
+        self,
+        transactions: int = 1000,
+        contacts: Optional[int] = None,
+        vouchers: Optional[int] = None,
+        seed: int = 42,
+        open_ratio: float = 0.25,
+        start_date: date = date(2024, 1, 1),
+        days: int = 730,
+        pattern_weights: Optional[Dict[str, int]] = None,
+        donation_rules_path: str = DONATION_RULES_PATH
+    ):
+        """
+        Initialize the dataset (nothing is generated yet).
+
+        Args:
+            transactions: Number of check account transactions
+            contacts: Number of contacts (default: one per 20 transactions, at least 50)
+            vouchers: Number of existing vouchers (default: half the transactions)
+            seed: Random seed (same seed and sizes = same data)
+            open_ratio: Share of open transactions (status 100)
+            start_date: Value date of the first transaction and voucher
+            days: Number of days the transactions and vouchers are spread over
+            pattern_weights: Relative share per pattern (see PATTERN_WEIGHTS)
+            donation_rules_path: Donation rules the donation purposes are taken from
+        """
+        self.transaction_count = max(0, transactions)
+        self.contact_count = contacts if contacts is not None else max(50, transactions // 20)
+        self.voucher_count = vouchers if vouchers is not None else transactions // 2
+        self.seed = seed
+        self.open_ratio = open_ratio
+        self.start_date = start_date
+        self.days = max(1, days)
+        weights = pattern_weights or PATTERN_WEIGHTS
+        self.patterns = [name for name in weights if weights[name] > 0]
+        self.weights = [weights[name] for name in self.patterns]
+        self.donation_purposes = load_donation_purposes(donation_rules_path)
+
+        # Employees beyond the fixed ones (each with an own cost centre)
+        extra_employees = min(50, self.transaction_count // 5000)
+        self.employees = list(EMPLOYEES)
+        for index in range(extra_employees):
+            first, family = _person_name(index * 7 + 3)
+            self.employees.append((f"{first} {family}", f"{first} {family}"))
+
+        # Contacts: organisations, employees, donors
+        self.donor_offset = len(ORGANISATIONS) + len(self.employees)
+        self.donor_count = max(1, self.contact_count - self.donor_offset)
+
+    def _rng(self, kind: str, chunk: int = 0) -> random.Random:
+        """Get the random generator of one chunk of an entity type."""
+        return random.Random(f"{self.seed}:{kind}:{chunk}")
+
+    def _date(self, index: int, count: int) -> date:
+        """Get the date of the index-th of count rows (spread evenly, ascending)."""
+        return self.start_date + timedelta(days=(index * self.days) // max(1, count))
+
+    def cost_centres(self) -> List[Dict]:
+        """Get all cost centres."""
+        names = list(COST_CENTRE_NAMES)
+        names.extend(name for _, name in self.employees if name not in names)
+        return [{
+            'id': str(100 + index),
+            'objectName': 'CostCentre',
+            'create': '2023-01-01T00:00:00+01:00',
+            'update': '2023-01-01T00:00:00+01:00',
+            'name': name,
+            'number': str(index + 1),
+            'color': None,
+            'status': '100',
+        } for index, name in enumerate(names)]
+
+    def accounting_types(self) -> List[Dict]:
+        """Get all accounting types."""
+        return [{
+            'id': str(200 + index),
+            'objectName': 'AccountingType',
+            'create': '2023-01-01T00:00:00+01:00',
+            'update': '2023-01-01T00:00:00+01:00',
+            'name': name,
+            'translationCode': None,
+        } for index, name in enumerate(ACCOUNTING_TYPE_NAMES)]
+
+    def categories(self) -> List[Dict]:
+        """Get the contact categories (2 = customer, 3 = supplier)."""
+        return [{
+            'id': str(category_id),
+            'objectName': 'Category',
+            'create': '2023-01-01T00:00:00+01:00',
+            'update': '2023-01-01T00:00:00+01:00',
+            'name': name,
+            'objectType': 'Contact',
+            'priority': str(category_id),
+            'code': None,
+            'color': None,
+        } for category_id, name in ((2, 'Kunde'), (3, 'Lieferant'), (4, 'Partner'))]
+
+    def contacts(self) -> List[Dict]:
+        """Get all contacts (organisations, employees and donors)."""
+        contacts = []
+        for name, category_id in ORGANISATIONS:
+            contacts.append(self._contact(len(contacts), category_id, name=name))
+        for payee_name, _ in self.employees:
+            first, _, family = payee_name.rpartition(' ')
+            contacts.append(self._contact(len(contacts), 3, first=first, family=family))
+        for donor in range(self.donor_count):
+            first, family = _person_name(donor)
+            contacts.append(self._contact(len(contacts), 2, first=first, family=family))
+        return contacts[:max(self.contact_count, self.donor_offset)]
+
+    def _contact(self, index: int, category_id: int, name: str = None,
+                 first: str = None, family: str = None) -> Dict:
+        """Build one contact (organisation with name, person with first/family name)."""
+        return {
+            'id': str(1_000_000 + index),
+            'objectName': 'Contact',
+            'create': '2023-01-01T00:00:00+01:00',
+            'update': '2023-01-01T00:00:00+01:00',
+            'name': name,
+            'surename': first,
+            'familyname': family,
+            'customerNumber': str(10000 + index) if category_id == 2 else None,
+            'supplierNumber': str(70000 + index) if category_id == 3 else None,
+            'category': {'id': str(category_id), 'objectName': 'Category'},
+            'taxNumber': None,
+            'vatNumber': None,
+            'description': None,
+        }
+
+    def iter_transaction_pages(self, page_size: int = CHUNK_SIZE) -> Iterator[List[Dict]]:
+        """Yield all transactions in pages (ascending value date)."""
+        return self._iter_pages(self._transaction_chunk, self.transaction_count, page_size)
+
+    def iter_voucher_pages(self, page_size: int = CHUNK_SIZE) -> Iterator[List[Dict]]:
+        """Yield all vouchers in pages (ascending voucher date)."""
+        return self._iter_pages(self._voucher_chunk, self.voucher_count, page_size)
+
+    def transactions(self) -> List[Dict]:
+        """Get all transactions as one list (for small datasets)."""
+        return [txn for page in self.iter_transaction_pages() for txn in page]
+
+    def vouchers(self) -> List[Dict]:
+        """Get all vouchers as one list (for small datasets)."""
+        return [voucher for page in self.iter_voucher_pages() for voucher in page]
+
+    def _iter_pages(self, build_chunk, count: int, page_size: int) -> Iterator[List[Dict]]:
+        """Generate an entity type chunk by chunk and re-slice it into pages."""
+        page_size = max(1, page_size)
+        page: List[Dict] = []
+        for chunk in range((count + CHUNK_SIZE - 1) // CHUNK_SIZE):
+            for row in build_chunk(chunk, range(chunk * CHUNK_SIZE, min(count, (chunk + 1) * CHUNK_SIZE))):
+                page.append(row)
+                if len(page) == page_size:
+                    yield page
+                    page = []
+        if page:
+            yield page
+
+    def _transaction_chunk(self, chunk: int, indexes: range) -> List[Dict]:
+        """Build the transactions of one chunk."""
+        rng = self._rng('transactions', chunk)
+        transactions = []
+        for index in indexes:
+            value_date = self._date(index, self.transaction_count)
+            pattern = rng.choices(self.patterns, self.weights)[0]
+            payee, purpose, amount = self._transaction_content(rng, pattern, value_date, index)
+            status = 100 if rng.random() < self.open_ratio else rng.choice((200, 300))
+            timestamp = f"{value_date.isoformat()}T00:00:00+01:00"
+            transactions.append({
+                'id': str(10_000_000 + index),
+                'objectName': 'CheckAccountTransaction',
+                'create': timestamp,
+                'update': f"{(value_date + timedelta(days=1)).isoformat()}T08:00:00+01:00",
+                'sevClient': {'id': '1', 'objectName': 'SevClient'},
+                'valueDate': timestamp,
+                'entryDate': timestamp,
+                'paymtPurpose': purpose,
+                'amount': f"{amount:.2f}",
+                'payeePayerName': payee,
+                'payeePayerAcctNo': _iban(rng),
+                'checkAccount': {'id': '1', 'objectName': 'CheckAccount'},
+                'status': status,
+                'sourceTransaction': None,
+                'targetTransaction': None,
+            })
+        return transactions
+
+    def _donor_payer_name(self, rng: random.Random) -> str:
+        """Get the payer name of a donation as a bank export writes it."""
+        first, family = _person_name(rng.randrange(self.donor_count))
+        style = rng.random()
+        if style < 0.1:
+            # Donor without contact
+            first, family = rng.choice(FIRST_NAMES), f"{rng.choice(LAST_NAMES)}-{rng.choice(LAST_NAMES)}"
+        if style < 0.5:
+            return f"{first} {family}"
+        if style < 0.7:
+            return f"{family}, {first}"
+        if style < 0.85:
+            return _ascii_upper(f"{first} {family}")
+        return f"{first} und {rng.choice(FIRST_NAMES)} {family}"
+
+    def _transaction_content(self, rng: random.Random, pattern: str, value_date: date,
+                             index: int) -> Tuple[str, str, float]:
+        """Get (payee/payer name, purpose, amount) of a transaction pattern."""
+        month = MONTHS[value_date.month - 1]
+        period = f"{value_date.month:02d}/{value_date.year}"
+
+        if pattern == 'spenden':
+            payer, purpose, mode = rng.choice(self.donation_purposes)
+            if mode != 'startswith' and rng.random() < 0.5:
+                purpose = f"{rng.choice(('Dauerauftrag', 'Überweisung', 'SEPA'))} {purpose} {month}"
+            else:
+                purpose = f"{purpose} {month} {value_date.year}"
+            amount = rng.choice((5, 10, 20, 25, 30, 50, 100, 150, 200, 500)) + rng.choice((0, 0, 0, 0.5))
+            return payer or self._donor_payer_name(rng), purpose, amount
+        if pattern == 'gehalt':
+            payee, _ = rng.choice(self.employees)
+            return payee, rng.choice((f"Gehalt {period}", f"GEHALT {month}", f"Lohn/Gehalt {month} {value_date.year}")), \
+                -round(rng.uniform(900, 2800), 2)
+        if pattern == 'ulp':
+            purpose = rng.choice((f"ÜLP {month}", f"Übungsleiterpauschale {period}", f"Ehrenamtspauschale {value_date.year}"))
+            return 'Tobias Zimmermann', purpose, -float(rng.choice((100, 150, 250)))
+        if pattern == 'krankenkassen':
+            return rng.choice(KRANKENKASSEN), f"Beitrag {period} Betriebsnr 12345678", -round(rng.uniform(150, 1200), 2)
+        if pattern == 'grace_baptist':
+            return 'GRACE BAPTIST TAMPERE RY', f"Support MISKA WILHELMSSON {month}", -float(rng.choice((100, 200, 300)))
+        if pattern == 'kontaktmission':
+            purpose = rng.choice((f"Hodzi Unterstützung {month}", f"Jeanrichard {period}"))
+            return 'KONTAKTMISSION DEUTSCHLAND', purpose, -float(rng.choice((50, 100, 250)))
+        if pattern == 'ebtc':
+            return 'EBTC e.V.', f"Spende EBTC {month}", -float(rng.choice((50, 75, 100)))
+        if pattern == 'jek_freizeit':
+            first, family = _person_name(rng.randrange(self.donor_count))
+            return f"{first} {family}", f"JEK Freizeit Anmeldung {first}", float(rng.choice((80, 120, 150)))
+        if pattern == 'bankeinzug':
+            return f"BANKEINZUG {rng.randint(100, 999)}", f"Einzahlung Kollekte {value_date.day:02d}.{value_date.month:02d}.", \
+                round(rng.uniform(50, 1500), 2)
+        if pattern == 'paypal_purchase':
+            return 'PayPal (Europe) S.a r.l. et Cie, S. C.A.', f"Ihr Einkauf bei {rng.choice(SHOPS)}", \
+                -round(rng.uniform(5, 250), 2)
+        if pattern == 'paypal_fees':
+            return 'Paypal Inc.', f"Gebühren zu Zahlung {index:08d}", -round(rng.uniform(0.35, 5), 2)
+        if pattern == 'bank_fees':
+            quarter = (value_date.month - 1) // 3 + 1
+            return 'Bank', f"Saldo der Abschlussposten QM {quarter:02d}/{value_date.year}", -round(rng.uniform(5, 40), 2)
+
+        payee, purpose = rng.choice(OTHER_PAYEES)
+        return payee, purpose.format(month=month, year=value_date.year, number=index % 10000), \
+            -round(rng.uniform(10, 1500), 2)
+
+    def _voucher_chunk(self, chunk: int, indexes: range) -> List[Dict]:
+        """Build the vouchers of one chunk (B-YYYY-NR numbers ascending per year)."""
+        rng = self._rng('vouchers', chunk)
+        cost_centres = {entry['name']: entry['id'] for entry in self.cost_centres()}
+        vouchers = []
+        for index in indexes:
+            voucher_date = self._date(index, self.voucher_count)
+            voucher_number = f"B-{voucher_date.year}-{index - self._first_voucher_of_year(voucher_date.year) + 1}"
+            timestamp = f"{voucher_date.isoformat()}T00:00:00+01:00"
+
+            # A few unpaid Bar-Kollekten income vouchers, the rest is paid
+            if rng.random() < 0.02:
+                cost_centre = rng.choice(('Bar-Kollekten', 'Bar-Kollekten Missionare'))
+                credit_debit, status, paid = 'D', '100', False
+            else:
+                cost_centre = rng.choice(COST_CENTRE_NAMES)
+                credit_debit, status, paid = rng.choice(('C', 'D')), '1000', True
+            amount = round(rng.uniform(5, 2000), 2)
+
+            vouchers.append({
+                'id': str(50_000_000 + index),
+                'objectName': 'Voucher',
+                'create': timestamp,
+                'update': timestamp,
+                'voucherNumber': voucher_number if rng.random() < 0.5 else None,
+                'voucherDate': timestamp,
+                'description': voucher_number,
+                'status': status,
+                'creditDebit': credit_debit,
+                'voucherType': 'VOU',
+                'sumNet': f"{amount:.2f}",
+                'sumGross': f"{amount:.2f}",
+                'paidAmount': f"{amount:.2f}" if paid else '0',
+                'payDate': timestamp if paid else None,
+                'costCentre': {'id': cost_centres[cost_centre], 'objectName': 'CostCentre'},
+                'supplier': None,
+                'supplierName': None,
+            })
+        return vouchers
+
+    def _first_voucher_of_year(self, year: int) -> int:
+        """Get the index of the first voucher dated in a year."""
+        days = (date(year, 1, 1) - self.start_date).days
+        if days <= 0:
+            return 0
+        # Smallest index whose date falls on or after January 1st
+        return -(-days * self.voucher_count // self.days)
+
+    def summary(self) -> Dict[str, int]:
+        """Get the number of rows per entity type."""
+        return {
+            'transactions': self.transaction_count,
+            'cost_centres': len(self.cost_centres()),
+            'accounting_types': len(ACCOUNTING_TYPE_NAMES),
+            'categories': 3,
+            'contacts': len(self.contacts()),
+            'vouchers': self.voucher_count,
+        }
+
+
+def write_dataset(dataset: SyntheticDataset, db_path: str, page_size: int = CHUNK_SIZE) -> Dict[str, int]:
+    """
+    Write a synthetic dataset into a TransactionDB file.
+
+    The tables are filled like a reload and the reload is recorded, so the
+    voucher creators can run on the file with --no-reload.
+
+    Args:
+        dataset: Dataset to write
+        db_path: Path to the SQLite database file
+        page_size: Rows per database transaction
+
+    Returns:
+        Number of written rows per table
+    """
+    counts = {}
+    with TransactionDB(db_path=db_path) as db:
+        counts['cost_centres'] = db.bulk_insert_cost_centres(dataset.cost_centres())
+        counts['accounting_types'] = db.bulk_insert_accounting_types(dataset.accounting_types())
+        counts['categories'] = db.bulk_insert_categories(dataset.categories())
+        counts['contacts'] = db.bulk_insert_contacts(dataset.contacts())
+        counts['transactions'] = sum(
+            db.bulk_insert_transactions(page) for page in dataset.iter_transaction_pages(page_size)
+        )
+        counts['vouchers'] = sum(
+            db.bulk_insert_vouchers(page) for page in dataset.iter_voucher_pages(page_size)
+        )
+        db.record_reload(counts, mode='synthetic')
+    return counts
+
+
+def dump_dataset_json(dataset: SyntheticDataset, directory: str) -> Dict[str, str]:
+    """
+    Write a synthetic dataset as API responses ({"objects": [...]}), one file per entity type.
+
+    Transactions and vouchers are written page by page (large files are
+    never held in memory).
+
+    Args:
+        dataset: Dataset to write
+        directory: Output directory (created if missing)
+
+    Returns:
+        Dictionary of entity type -> written file path
+    """
+    os.makedirs(directory, exist_ok=True)
+    entities = {
+        'CostCentre': iter([dataset.cost_centres()]),
+        'AccountingType': iter([dataset.accounting_types()]),
+        'Category': iter([dataset.categories()]),
+        'Contact': iter([dataset.contacts()]),
+        'CheckAccountTransaction': dataset.iter_transaction_pages(),
+        'Voucher': dataset.iter_voucher_pages(),
+    }
+    paths = {}
+    for name, pages in entities.items():
+        path = os.path.join(directory, f"{name}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"objects": [')
+            first = True
+            for page in pages:
+                for item in page:
+                    f.write(('' if first else ',') + '\n' + json.dumps(item, ensure_ascii=False))
+                    first = False
+            f.write('\n]}\n')
+        paths[name] = path
+    return paths
@@ -5,6 +5,10 @@ This package provides the base classes and utilities for creating
 vouchers from SevDesk transactions.
 """
 from .voucher_creator_base import VoucherCreatorBase
+from .voucher_numbers import VoucherNumberAllocator
+from .classifier import TransactionClassifier
+from .run_context import RunContext
+from .journal import VoucherJournal, PaymentJournal
 from .voucher_utils import (
     generate_voucher_numbers,
     build_voucher_plan_markdown,
@@ -12,16 +16,27 @@ from .voucher_utils import (
     print_voucher_table,
     find_cost_centre_by_name,
     find_contact_by_name,
-    create_voucher_for_transaction
+    find_contact_match,
+    find_contact_candidates,
+    create_voucher_for_transaction,
+    get_transaction_raw_data
 )
 
 __all__ = [
     'VoucherCreatorBase',
+    'VoucherNumberAllocator',
+    'TransactionClassifier',
+    'RunContext',
+    'VoucherJournal',
+    'PaymentJournal',
     'generate_voucher_numbers',
     'build_voucher_plan_markdown',
     'print_console_summary',
     'print_voucher_table',
     'find_cost_centre_by_name',
     'find_contact_by_name',
-    'create_voucher_for_transaction'
+    'find_contact_match',
+    'find_contact_candidates',
+    'create_voucher_for_transaction',
+    'get_transaction_raw_data'
 ]
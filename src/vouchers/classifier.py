@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Single-pass transaction classification for all voucher creators.
+
+Instead of every creator re-reading the open transactions and decoding their
+raw data in its own filter loop, the classifier walks the open transactions
+once and asks every creator's matches_transaction() predicate. The raw JSON
+of each transaction is decoded at most once (cached in the row).
+
+The result contains:
+- partitions: transactions per creator key (in input order)
+- multi_claimed: transactions matched by more than one creator
+- unclaimed: open transactions no creator wants (still need manual booking)
+"""
+from typing import Dict, List, Tuple
+
+from src.vouchers.voucher_utils import get_transaction_raw_data
+
+
+class TransactionClassifier:
+    """Evaluates the predicates of several voucher creators in one pass."""
+
+    def __init__(self, creators: List[Tuple[str, object]]):
+        """
+        Initialize the classifier.
+
+        Args:
+            creators: List of (key, creator instance) tuples, in priority order
+        """
+        self.creators = creators
+
+    def classify(self, transactions: List[Dict]) -> Dict:
+        """
+        Classify transactions by voucher creator.
+
+        Multi-claimed transactions stay in the partition of every creator
+        that matched them, exactly as with separate filter runs.
+
+        Args:
+            transactions: List of open transactions
+
+        Returns:
+            Dictionary with:
+                - partitions: Dict of creator key -> list of transactions
+                - multi_claimed: List of {'transaction', 'claimed_by'} dicts
+                - unclaimed: List of transactions
+                - errors: Dict of creator key -> error message
+                - total: Number of classified transactions
+        """
+        partitions = {key: [] for key, _ in self.creators}
+        multi_claimed = []
+        unclaimed = []
+        errors = {}
+        active = list(self.creators)
+
+        for txn in transactions:
+            # Decode once, shared by all predicates
+            get_transaction_raw_data(txn)
+
+            claimed_by = []
+            for key, creator in list(active):
+                try:
+                    matched = creator.matches_transaction(txn)
+                except Exception as e:
+                    # A broken predicate must not hide the other creators' results
+                    errors[key] = str(e)
+                    active.remove((key, creator))
+                    continue
+                if matched:
+                    partitions[key].append(txn)
+                    claimed_by.append(key)
+
+            if not claimed_by:
+                unclaimed.append(txn)
+            elif len(claimed_by) > 1:
+                multi_claimed.append({'transaction': txn, 'claimed_by': claimed_by})
+
+        return {
+            'partitions': partitions,
+            'multi_claimed': multi_claimed,
+            'unclaimed': unclaimed,
+            'errors': errors,
+            'total': len(transactions),
+        }
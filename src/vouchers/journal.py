@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Write-ahead journal (outbox) of voucher creation.
+
+Every voucher plan item is recorded in the voucher_journal table before the
+API is called, and each step is written as soon as it is done:
+
+    planned -> creating -> created (voucher ID) -> booked
+    (or failed, if SevDesk rejected the voucher)
+
+A transport error while creating (timeout, reset connection, 5xx) leaves
+the item creating: SevDesk may have saved the voucher before the error, so
+the item is resolved like an interrupted one instead of being planned again.
+
+If a run is interrupted, the journal shows exactly which steps are missing.
+`create_all_vouchers.py --resume` finishes them without reloading or
+re-planning:
+- planned:  create and book the voucher
+- creating: the API call may have succeeded before the crash, so the recent
+            vouchers are checked first; then create (if missing) and book
+- created:  only book the voucher to its transaction
+
+Transactions with unfinished journal items are skipped by new runs of the
+same voucher type until they are resumed, so a created-but-unbooked voucher
+never gets a duplicate.
+Their voucher numbers are not handed out to new runs either, and a resume
+reserves them again before creating anything (see claim_journal_voucher_numbers()).
+"""
+import threading
+import uuid
+import requests
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+from src.database.db import TransactionDB
+from src.vouchers.voucher_utils import create_voucher_for_transaction
+
+
+# Journal statuses of items that still need work
+PENDING_STATUSES = ('planned', 'creating', 'created')
+
+# Recent vouchers checked for a voucher created before a crash
+RECENT_VOUCHERS_CHECKED = 100
+
+
+class VoucherJournal:
+    """
+    Records the voucher creation steps of a run in the SQLite database.
+
+    Usage:
+        journal = VoucherJournal('transactions.db')
+        journal.record_planned('Gehalt', voucher_plan, check_account_id, sev_client_id, is_income_for)
+        journal.mark_creating('Gehalt', transaction_id)
+        journal.mark_created('Gehalt', transaction_id, voucher_id)
+        journal.mark_booked('Gehalt', transaction_id)
+
+    Items are keyed by run, creator and transaction: a transaction claimed by
+    several voucher types has one item per type.
+    """
+
+    def __init__(self, db_path: str, run_id: Optional[str] = None):
+        """
+        Initialize the journal.
+
+        Args:
+            db_path: Path to the SQLite database file
+            run_id: ID of this run (generated if not given)
+        """
+        self.db_path = db_path
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        # Used from worker threads too (access is serialized by self._lock)
+        self._db = TransactionDB(db_path=db_path, check_same_thread=False)
+
+    def record_planned(
+        self,
+        creator: str,
+        voucher_plan: List[Dict],
+        check_account_id: str,
+        sev_client_id: str,
+        is_income_for: Callable[[Dict], bool]
+    ) -> int:
+        """
+        Record plan items before any voucher is created.
+
+        Args:
+            creator: Name of the voucher type
+            voucher_plan: Plan items about to be created
+            check_account_id: Check account ID used for booking
+            sev_client_id: SevClient ID used for the vouchers
+            is_income_for: Function deciding income/expense per plan item
+
+        Returns:
+            Number of recorded items
+        """
+        items = [{
+            'run_id': self.run_id,
+            'creator': creator,
+            'position': position,
+            'transaction_id': plan['transaction_id'],
+            'voucher_number': plan.get('voucher_number'),
+            'plan': plan,
+            'check_account_id': check_account_id,
+            'sev_client_id': sev_client_id,
+            'is_income': is_income_for(plan),
+        } for position, plan in enumerate(voucher_plan)]
+
+        with self._lock:
+            return self._db.add_journal_items(items)
+
+    def _update(self, creator: str, transaction_id: str, status: str, run_id: Optional[str] = None,
+                voucher_id: Optional[str] = None, error: Optional[str] = None) -> bool:
+        """Write the new state of an item (of this run unless run_id is given)."""
+        with self._lock:
+            return self._db.update_journal_item(
+                run_id or self.run_id, creator, transaction_id, status, voucher_id=voucher_id, error=error
+            )
+
+    def mark_creating(self, creator: str, transaction_id: str, run_id: Optional[str] = None) -> bool:
+        """Record that the voucher is about to be created."""
+        return self._update(creator, transaction_id, 'creating', run_id)
+
+    def mark_created(self, creator: str, transaction_id: str, voucher_id: str,
+                     run_id: Optional[str] = None) -> bool:
+        """Record the created voucher."""
+        return self._update(creator, transaction_id, 'created', run_id, voucher_id=voucher_id)
+
+    def mark_booked(self, creator: str, transaction_id: str, run_id: Optional[str] = None) -> bool:
+        """Record that the voucher is booked to its transaction."""
+        return self._update(creator, transaction_id, 'booked', run_id)
+
+    def mark_book_failed(self, creator: str, transaction_id: str, error: str,
+                         run_id: Optional[str] = None) -> bool:
+        """Record a failed booking (the item stays created, so it can be resumed)."""
+        return self._update(creator, transaction_id, 'created', run_id, error=error)
+
+    def mark_failed(self, creator: str, transaction_id: str, error: str,
+                    run_id: Optional[str] = None) -> bool:
+        """Record that the voucher could not be created."""
+        return self._update(creator, transaction_id, 'failed', run_id, error=error)
+
+    def mark_outcome_unknown(self, creator: str, transaction_id: str, error: str,
+                             run_id: Optional[str] = None) -> bool:
+        """Record an error after which the voucher may exist (the item stays creating, so it is resumed)."""
+        return self._update(creator, transaction_id, 'creating', run_id, error=error)
+
+    def get_pending_items(self, creator: Optional[str] = None) -> List[Dict]:
+        """Get the unfinished items of all runs (of one voucher type if given), oldest first."""
+        with self._lock:
+            return self._db.get_journal_items(statuses=list(PENDING_STATUSES), creator=creator)
+
+    def get_pending_transaction_ids(self, creator: str) -> Set[str]:
+        """Get the transaction IDs with unfinished items of a voucher type from earlier runs."""
+        return {
+            str(item['transaction_id'])
+            for item in self.get_pending_items(creator)
+            if item['run_id'] != self.run_id
+        }
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class PaymentJournal:
+    """
+    Records the result of every voucher marked as paid in a run.
+
+    Usage:
+        journal = PaymentJournal('transactions.db')
+        journal.record_pending(items)
+        journal.record_result(voucher_id, success=True, attempts=1)
+    """
+
+    def __init__(self, db_path: str, run_id: Optional[str] = None):
+        """
+        Initialize the journal.
+
+        Args:
+            db_path: Path to the SQLite database file
+            run_id: ID of this run (generated if not given)
+        """
+        self.db_path = db_path
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        # Used from worker threads too (access is serialized by self._lock)
+        self._db = TransactionDB(db_path=db_path, check_same_thread=False)
+
+    def record_pending(self, items: List[Dict]) -> int:
+        """
+        Record the vouchers before the first one is marked.
+
+        Args:
+            items: Dictionaries with position, voucher_id, voucher_date,
+                amount and check_account_id
+
+        Returns:
+            Number of recorded items
+        """
+        with self._lock:
+            return self._db.add_payment_journal_items(
+                [dict(item, run_id=self.run_id) for item in items]
+            )
+
+    def record_result(self, voucher_id: str, success: bool, attempts: int,
+                      error: Optional[str] = None) -> bool:
+        """Record the outcome of marking a voucher."""
+        with self._lock:
+            return self._db.update_payment_journal_item(
+                self.run_id, voucher_id, 'marked' if success else 'failed', attempts, error=error
+            )
+
+    def get_items(self) -> List[Dict]:
+        """Get the items of this run in order."""
+        with self._lock:
+            return self._db.get_payment_journal_items(run_id=self.run_id)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def is_rejected(error: Exception) -> bool:
+    """
+    Whether a failed voucher creation definitely did not create a voucher.
+
+    HTTP 4xx answers are rejections, and errors raised before the request
+    was sent are too. Other request errors (timeouts, reset connections,
+    5xx answers, unreadable responses) may come after SevDesk saved it.
+
+    Args:
+        error: Exception raised while creating the voucher
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is not None and 400 <= response.status_code < 500
+    return not isinstance(error, requests.exceptions.RequestException)
+
+
+def find_created_voucher(client, item: Dict) -> Optional[str]:
+    """
+    Look for a voucher created for a journal item whose creation was interrupted.
+
+    The most recent vouchers are compared by description, date and amount.
+
+    Args:
+        client: SevDeskClient instance
+        item: Journal item
+
+    Returns:
+        Voucher ID or None if no matching voucher exists
+    """
+    plan = item['plan']
+    description = plan.get('description', plan.get('voucher_number'))
+    voucher_date = (plan.get('transaction_date') or '')[:10]
+    amount = round(abs(float(plan.get('amount') or 0)), 2)
+
+    for voucher in client.get_vouchers(limit=RECENT_VOUCHERS_CHECKED):
+        voucher_amount = voucher.get('sumGross') or voucher.get('sumNet') or 0
+        if (voucher.get('description') == description
+                and (voucher.get('voucherDate') or '')[:10] == voucher_date
+                and round(abs(float(voucher_amount)), 2) == amount):
+            return str(voucher.get('id'))
+    return None
+
+
+def claim_journal_voucher_numbers(client, journal: VoucherJournal, allocator, items: List[Dict]) -> List[str]:
+    """
+    Reserve the voucher numbers of pending journal items again before resuming.
+
+    The interrupted process released its reservations when it exited. Items
+    interrupted while creating are checked for their voucher first; numbers
+    of items that already have a voucher are recorded as used.
+
+    Args:
+        client: SevDeskClient instance
+        journal: Voucher journal
+        allocator: VoucherNumberAllocator of the database
+        items: Pending journal items (updated in place for found vouchers)
+
+    Returns:
+        List of numbers that are no longer available (empty if all were claimed)
+    """
+    to_claim = []
+    for item in items:
+        voucher_number = item['plan'].get('voucher_number')
+        if item['status'] == 'creating' and not item.get('voucher_id'):
+            voucher_id = find_created_voucher(client, item)
+            if voucher_id:
+                journal.mark_created(item['creator'], item['transaction_id'], voucher_id, run_id=item['run_id'])
+                item['status'] = 'created'
+                item['voucher_id'] = voucher_id
+        if not voucher_number:
+            continue
+        if item.get('voucher_id'):
+            allocator.mark_used(voucher_number, item['voucher_id'])
+        else:
+            to_claim.append(voucher_number)
+
+    if not to_claim:
+        return []
+    return allocator.claim(client, to_claim)
+
+
+def resume_journal_item(client, journal: VoucherJournal, item: Dict, index: int, total: int) -> bool:
+    """
+    Finish the missing steps of one journal item.
+
+    Args:
+        client: SevDeskClient instance
+        journal: Voucher journal
+        item: Pending journal item
+        index: Position in the resume run (1-based)
+        total: Number of items in the resume run
+
+    Returns:
+        True if the voucher is created and booked now
+    """
+    plan = item['plan']
+    run_id = item['run_id']
+    creator = item['creator']
+    transaction_id = item['transaction_id']
+    voucher_id = item.get('voucher_id')
+
+    print(f"[{index}/{total}] {item['creator']}: transaction {transaction_id} "
+          f"({plan.get('voucher_number')}, {item['status']})...")
+
+    try:
+        if item['status'] == 'creating' and not voucher_id:
+            voucher_id = find_created_voucher(client, item)
+            if voucher_id:
+                print(f"    ✓ Found voucher created before the interruption: {voucher_id}")
+                journal.mark_created(creator, transaction_id, voucher_id, run_id=run_id)
+
+        if not voucher_id:
+            journal.mark_creating(creator, transaction_id, run_id=run_id)
+            response = create_voucher_for_transaction(
+                client,
+                plan,
+                item['check_account_id'],
+                item['sev_client_id'],
+                is_income=item['is_income']
+            )
+            if not response or 'objects' not in response:
+                print(f"    ❌ Failed: Unexpected response format")
+                journal.mark_failed(creator, transaction_id, 'Unexpected response format', run_id=run_id)
+                print()
+                return False
+            voucher_id = response['objects'].get('voucher', {}).get('id')
+            journal.mark_created(creator, transaction_id, voucher_id, run_id=run_id)
+            print(f"    ✓ Voucher created successfully! ID: {voucher_id}")
+    except Exception as e:
+        if is_rejected(e):
+            print(f"    ❌ Failed: {str(e)}")
+            journal.mark_failed(creator, transaction_id, str(e), run_id=run_id)
+        else:
+            print(f"    ❌ Failed, the voucher may exist: {str(e)}")
+            journal.mark_outcome_unknown(creator, transaction_id, str(e), run_id=run_id)
+        print()
+        return False
+
+    try:
+        client.book_voucher_amount(
+            voucher_id=voucher_id,
+            transaction_id=transaction_id,
+            check_account_id=item['check_account_id'],
+            amount=plan['amount'],
+            date=plan['transaction_date'][:10],
+            is_income=item['is_income']
+        )
+        journal.mark_booked(creator, transaction_id, run_id=run_id)
+        print(f"    ✓ Voucher booked and linked to transaction!")
+        print()
+        return True
+    except Exception as e:
+        print(f"    ⚠️  Warning: Failed to book/link voucher: {str(e)}")
+        journal.mark_book_failed(creator, transaction_id, str(e), run_id=run_id)
+        print()
+        return False
@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""
+Name matching engine for resolving payee names to contacts.
+
+This module provides a pluggable similarity engine used by
+find_contact_by_name():
+- A trigram index for fast candidate generation (no full scan needed)
+- Jaro-Winkler and token-set similarity scorers (normalized to 0.0 - 1.0)
+- A "tiered" mode that reproduces the original hand-written scoring
+  (exact = 1000, substring = 500, word overlap, +10000 category bonus);
+  its candidates come from the name, trigram and word indexes, so only
+  contacts the tier rules can match are looked at. A common name still
+  looks at every contact sharing a word with it, so on very large contact
+  lists only the "fuzzy" mode (bounded by MAX_CANDIDATES) is sub-millisecond
+
+The mode and an optional minimum score are chosen per run with
+--match-mode/--match-threshold or CONTACT_MATCH_MODE/CONTACT_MATCH_THRESHOLD
+(see configure_contact_matching()); the voucher creators use them for all
+contact lookups.
+
+The index is built once per contacts snapshot and reused for every lookup.
+Resolution results are memoized per (name, prefer_category, mapping set) in a
+run-scoped cache that is invalidated automatically when contacts change.
+"""
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Dict, List, Optional
+
+
+# Matching modes
+MODE_TIERED = 'tiered'  # Original tier logic (compatible default)
+MODE_FUZZY = 'fuzzy'    # Trigram candidates + similarity scoring
+
+MATCH_MODES = (MODE_TIERED, MODE_FUZZY)
+
+DEFAULT_MATCH_MODE = MODE_TIERED
+DEFAULT_SCORER = 'jaro_winkler'
+DEFAULT_TOP_K = 5
+
+# Trigram candidate generation limits
+MAX_CANDIDATES = 15      # Candidates scored per alternative
+MAX_POSTINGS = 2000      # Skip trigrams shared by more contacts than this
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(name: str) -> str:
+    """Normalize name by removing punctuation, diacritics and extra spaces (memoized)."""
+    # Normalize unicode (e.g., ß → ss)
+    name = unicodedata.normalize('NFKD', name)
+    # Remove diacritics
+    name = ''.join([c for c in name if not unicodedata.combining(c)])
+    # Replace ß with ss
+    name = name.replace('ß', 'ss').replace('ẞ', 'SS')
+    # Remove commas, dots, and extra spaces
+    name = re.sub(r'[,.]', ' ', name)
+    # Normalize whitespace
+    name = ' '.join(name.split())
+    return name.lower()
+
+
+def search_alternatives(payee_name: str) -> List[str]:
+    """
+    Build the normalized search alternatives for a payee name.
+
+    Handles "lastname, firstname" format by adding the reversed name.
+
+    Args:
+        payee_name: Raw payee name
+
+    Returns:
+        List of normalized names (original first)
+    """
+    alternatives = [normalize_name(payee_name.lower().strip())]
+    if ',' in payee_name:
+        parts = [p.strip() for p in payee_name.split(',')]
+        if len(parts) == 2:
+            alternatives.append(normalize_name(f"{parts[1]} {parts[0]}"))
+    return alternatives
+
+
+def trigrams(text: str) -> set:
+    """Return the set of padded character trigrams of a normalized string."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def jaro_winkler(a: str, b: str, prefix_scale: float = 0.1) -> float:
+    """
+    Compute the Jaro-Winkler similarity of two strings.
+
+    Returns:
+        Similarity between 0.0 (no similarity) and 1.0 (identical)
+    """
+    if a == b:
+        return 1.0
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return 0.0
+
+    match_distance = max(max(len_a, len_b) // 2 - 1, 0)
+    a_matches = [False] * len_a
+    b_matches = [False] * len_b
+    matches = 0
+
+    for i, char in enumerate(a):
+        start = max(0, i - match_distance)
+        end = min(i + match_distance + 1, len_b)
+        for j in range(start, end):
+            if not b_matches[j] and b[j] == char:
+                a_matches[i] = b_matches[j] = True
+                matches += 1
+                break
+
+    if not matches:
+        return 0.0
+
+    # Count transpositions
+    transpositions = 0
+    j = 0
+    for i in range(len_a):
+        if a_matches[i]:
+            while not b_matches[j]:
+                j += 1
+            if a[i] != b[j]:
+                transpositions += 1
+            j += 1
+
+    jaro = (matches / len_a + matches / len_b + (matches - transpositions / 2) / matches) / 3
+
+    # Winkler prefix bonus (up to 4 characters)
+    prefix = 0
+    for char_a, char_b in zip(a[:4], b[:4]):
+        if char_a != char_b:
+            break
+        prefix += 1
+
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def token_sort_similarity(a: str, b: str) -> float:
+    """Jaro-Winkler similarity that ignores word order."""
+    score = jaro_winkler(a, b)
+    sorted_a = ' '.join(sorted(a.split()))
+    sorted_b = ' '.join(sorted(b.split()))
+    if score < 1.0 and (sorted_a != a or sorted_b != b):
+        score = max(score, jaro_winkler(sorted_a, sorted_b))
+    return score
+
+
+def token_set_similarity(a: str, b: str) -> float:
+    """
+    Token-set similarity: compares the shared words against each side's
+    remaining words, so extra middle names or suffixes cost little.
+    """
+    words_a = set(a.split())
+    words_b = set(b.split())
+    common = ' '.join(sorted(words_a & words_b))
+    rest_a = ' '.join(sorted(words_a - words_b))
+    rest_b = ' '.join(sorted(words_b - words_a))
+
+    combined_a = f"{common} {rest_a}".strip()
+    combined_b = f"{common} {rest_b}".strip()
+
+    scores = [jaro_winkler(combined_a, combined_b)]
+    if common:
+        scores.append(jaro_winkler(common, combined_a))
+        scores.append(jaro_winkler(common, combined_b))
+    return max(scores)
+
+
+SCORERS: Dict[str, Callable[[str, str], float]] = {
+    'jaro_winkler': token_sort_similarity,
+    'token_set': token_set_similarity,
+}
+
+
+def _category_of(contact: Dict):
+    """Get the category ID of a contact (API dict or database row)."""
+    if isinstance(contact.get('category'), dict):
+        return contact.get('category', {}).get('id')
+    return contact.get('category_id')
+
+
+class ContactMatcher:
+    """
+    Indexed contact matcher for a fixed snapshot of contacts.
+
+    Build once per contacts snapshot (see get_contact_matcher()), then call
+    match() for each payee name.
+    """
+
+    def __init__(self, contacts: List[Dict], scorer: str = DEFAULT_SCORER):
+        """
+        Build the matcher index.
+
+        Args:
+            contacts: List of contact dictionaries (as returned by the database)
+            scorer: Name of the similarity scorer (see SCORERS)
+        """
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown scorer '{scorer}' (available: {', '.join(SCORERS)})")
+
+        self.scorer_name = scorer
+        self.scorer = SCORERS[scorer]
+        self.contacts = contacts
+
+        # Precomputed per-contact data (same order as contacts)
+        self.entries = []
+        self.by_normalized: Dict[str, List[int]] = defaultdict(list)
+        self.trigram_index: Dict[str, List[int]] = defaultdict(list)
+        self.word_index: Dict[str, List[int]] = defaultdict(list)
+
+        for contact in contacts:
+            contact_name = contact.get('name', '')
+            if not contact_name:
+                continue
+
+            normalized = normalize_name(contact_name)
+            parts = normalized.split()
+            index = len(self.entries)
+            self.entries.append({
+                'contact': contact,
+                'normalized': normalized,
+                'parts': parts,
+                'words': set(parts),
+                'category_id': _category_of(contact),
+            })
+            self.by_normalized[normalized].append(index)
+            for gram in trigrams(normalized):
+                self.trigram_index[gram].append(index)
+            for word in set(parts):
+                self.word_index[word].append(index)
+
+    def score(self, alternatives: List[str], normalized: str) -> float:
+        """Score a normalized contact name against all search alternatives."""
+        return max(self.scorer(alt, normalized) for alt in alternatives)
+
+    def match(
+        self,
+        payee_name: str,
+        prefer_category: Optional[int] = None,
+        custom_mappings: Optional[Dict[str, str]] = None,
+        mode: str = DEFAULT_MATCH_MODE,
+        top_k: int = DEFAULT_TOP_K,
+        threshold: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Find the best matching contacts for a payee name.
+
+        Args:
+            payee_name: Name to search for
+            prefer_category: Category ID to prefer (2=Customer, 3=Supplier)
+            custom_mappings: Optional dict of custom exact name mappings
+            mode: MODE_TIERED (original scoring) or MODE_FUZZY (trigram + similarity)
+            top_k: Maximum number of candidates to return
+            threshold: Minimum normalized score (0.0 - 1.0) to accept a candidate
+
+        Returns:
+            List of match dicts sorted best first, with keys:
+                - contact: Contact dict
+                - score: Normalized similarity (0.0 - 1.0)
+                - method: 'mapping', 'exact', 'partial', 'words' or 'fuzzy'
+        """
+        if not payee_name:
+            return []
+
+        alternatives = search_alternatives(payee_name)
+
+        # Check custom mappings first (exact match)
+        if custom_mappings:
+            for search_term, target_name in custom_mappings.items():
+                if normalize_name(search_term) == alternatives[0]:
+                    for index in self.by_normalized.get(normalize_name(target_name), []):
+                        return [{
+                            'contact': self.entries[index]['contact'],
+                            'score': 1.0,
+                            'method': 'mapping'
+                        }]
+
+        if mode == MODE_TIERED:
+            # Only the returned candidates need a score (all of them for a threshold)
+            candidates = self._match_tiered(alternatives, prefer_category,
+                                            limit=None if threshold is not None else top_k)
+        elif mode == MODE_FUZZY:
+            candidates = self._match_fuzzy(alternatives, prefer_category)
+        else:
+            raise ValueError(f"Unknown match mode '{mode}'")
+
+        if threshold is not None:
+            candidates = [c for c in candidates if c['score'] >= threshold]
+
+        return candidates[:top_k]
+
+    def _tiered_candidates(self, alternatives: List[str], search_words: set) -> Optional[List[int]]:
+        """
+        Find the contacts the tier rules can match, using the indexes.
+
+        Returns:
+            Contact indexes in contact order, or None if all contacts must be
+            scanned (a search alternative shorter than a trigram)
+        """
+        # An empty normalized name is part of every search name
+        indexes = set(self.by_normalized.get('', []))
+
+        for search_alt in alternatives:
+            if len(search_alt) < 3:
+                return None
+
+            # Contact name within the search name (exact matches included)
+            for start in range(len(search_alt)):
+                for end in range(start + 1, len(search_alt) + 1):
+                    hits = self.by_normalized.get(search_alt[start:end])
+                    if hits:
+                        indexes.update(hits)
+
+            # Search name within the contact name: the contact has all its trigrams
+            postings = [self.trigram_index.get(search_alt[i:i + 3], ()) for i in range(len(search_alt) - 2)]
+            indexes.update(
+                index for index in min(postings, key=len)
+                if search_alt in self.entries[index]['normalized']
+            )
+
+        # Word overlap
+        for word in search_words:
+            indexes.update(self.word_index.get(word, ()))
+
+        return sorted(indexes)
+
+    def _match_tiered(self, alternatives: List[str], prefer_category: Optional[int],
+                      limit: Optional[int] = None) -> List[Dict]:
+        """
+        Original tier scoring: exact > partial > word overlap, with category bonus.
+
+        The result equals a scan of all contacts; only the first `limit`
+        candidates get a similarity score (None = all).
+        """
+        search_normalized = alternatives[0]
+        search_parts = search_normalized.split()
+        search_words = set(search_parts)
+
+        candidate_indexes = self._tiered_candidates(alternatives, search_words)
+        if candidate_indexes is None:
+            entries = self.entries
+        else:
+            entries = [self.entries[index] for index in candidate_indexes]
+
+        candidate_matches = []
+
+        for entry in entries:
+            contact_normalized = entry['normalized']
+            contact_words = entry['words']
+            category_bonus = 10000 if prefer_category and str(entry['category_id']) == str(prefer_category) else 0
+
+            priority = None
+            method = None
+
+            # Try exact match first with any search alternative
+            for i, search_alt in enumerate(alternatives):
+                if search_alt == contact_normalized:
+                    priority, method = 1000 - i, 'exact'
+                    break
+
+            # Try partial match
+            if priority is None:
+                for i, search_alt in enumerate(alternatives):
+                    if search_alt in contact_normalized or contact_normalized in search_alt:
+                        priority, method = 500 - i, 'partial'
+                        break
+
+            # Fuzzy word matching
+            if priority is None and search_words and contact_words:
+                common_words = search_words & contact_words
+                word_score = len(common_words)
+
+                if contact_words.issubset(search_words):
+                    word_score += 10
+
+                # Check first word matching for multi-word names
+                if len(search_words) >= 2 and len(contact_words) >= 2:
+                    contact_parts = entry['parts']
+                    if common_words and search_parts[0] not in contact_parts and contact_parts[0] not in search_parts:
+                        word_score = 0
+
+                if word_score > 0:
+                    priority, method = word_score, 'words'
+
+            if priority is not None:
+                candidate_matches.append((priority + category_bonus, method, entry))
+
+        # Stable sort keeps contact order for equal priorities
+        candidate_matches.sort(key=lambda x: x[0], reverse=True)
+        if limit is not None:
+            candidate_matches = candidate_matches[:limit]
+
+        return [
+            {
+                'contact': entry['contact'],
+                'score': self.score(alternatives, entry['normalized']),
+                'method': method
+            }
+            for _, method, entry in candidate_matches
+        ]
+
+    def _match_fuzzy(self, alternatives: List[str], prefer_category: Optional[int]) -> List[Dict]:
+        """Trigram candidate generation followed by similarity scoring."""
+        candidate_indexes = set()
+
+        for search_alt in alternatives:
+            # Exact normalized hits are always candidates
+            candidate_indexes.update(self.by_normalized.get(search_alt, []))
+
+            # Rank trigrams by selectivity and skip overly common ones
+            postings = [
+                self.trigram_index[gram]
+                for gram in trigrams(search_alt)
+                if gram in self.trigram_index
+            ]
+            if not postings:
+                continue
+            postings.sort(key=len)
+            selective = [p for p in postings if len(p) <= MAX_POSTINGS] or postings[:1]
+
+            # Count shared trigrams per contact (C-speed) and keep the best
+            overlap = Counter(chain.from_iterable(selective))
+            candidate_indexes.update(index for index, _ in overlap.most_common(MAX_CANDIDATES))
+
+        scored = []
+        for index in candidate_indexes:
+            entry = self.entries[index]
+            preferred = bool(prefer_category) and str(entry['category_id']) == str(prefer_category)
+            scored.append((preferred, self.score(alternatives, entry['normalized']), -index, entry))
+
+        scored.sort(key=lambda x: x[:3], reverse=True)
+
+        return [
+            {'contact': entry['contact'], 'score': score, 'method': 'fuzzy'}
+            for _, score, _, entry in scored
+        ]
+
+
+# Cache of the contact matcher for the current contacts snapshot
+_contact_matcher_state = {
+    'key': None,
+    'matcher': None,
+}
+
+# Run-scoped cache of contact resolution results
+# Results are only valid for one contacts snapshot and are dropped
+# automatically as soon as the contacts table changes (e.g. after a reload)
+_resolution_cache = {
+    'snapshot': None,
+    'results': {},
+    'hits': 0,
+    'misses': 0,
+    'invalidations': 0,
+}
+_resolution_lock = threading.Lock()
+
+
+def _contacts_snapshot_key(db) -> Optional[tuple]:
+    """
+    Identify the contacts snapshot of a database.
+    
+    Returns:
+        Tuple of (database key, contacts version), or None if the database
+        cannot report changes (then nothing may be cached)
+    """
+    get_version = getattr(db, 'get_data_version', None)
+    if get_version is None:
+        return None
+    db_key = id(db) if db.db_path == ':memory:' else db.db_path
+    return (db_key, get_version('contacts'))
+
+
+def get_contact_matcher(db, scorer: str = DEFAULT_SCORER) -> ContactMatcher:
+    """
+    Get a contact matcher for the database's current contacts.
+
+    The matcher is cached and rebuilt only when the contacts table changes
+    (tracked via TransactionDB.get_data_version('contacts')).
+
+    Args:
+        db: Database connection
+        scorer: Name of the similarity scorer
+
+    Returns:
+        ContactMatcher instance
+    """
+    global _contact_matcher_state
+
+    snapshot = _contacts_snapshot_key(db)
+    if snapshot is None:
+        # Unknown database object: cannot detect changes, so don't cache
+        return ContactMatcher(db.get_all_contacts(), scorer=scorer)
+
+    key = snapshot + (scorer,)
+    if _contact_matcher_state['key'] != key:
+        _contact_matcher_state = {
+            'key': key,
+            'matcher': ContactMatcher(db.get_all_contacts(), scorer=scorer),
+        }
+
+    return _contact_matcher_state['matcher']
+
+
+def resolve_contact_candidates(
+    db,
+    payee_name: str,
+    prefer_category: Optional[int] = None,
+    custom_mappings: Optional[Dict[str, str]] = None,
+    mode: str = DEFAULT_MATCH_MODE,
+    top_k: int = DEFAULT_TOP_K,
+    threshold: Optional[float] = None,
+    scorer: str = DEFAULT_SCORER
+) -> List[Dict]:
+    """
+    Resolve contact candidates for a payee name, memoizing the result.
+    
+    Repeated lookups with the same name, preferred category, mapping set and
+    matching options are served from the run-scoped cache until the contacts
+    table changes. See ContactMatcher.match() for arguments and return value.
+    """
+    snapshot = _contacts_snapshot_key(db)
+    if snapshot is None:
+        return get_contact_matcher(db, scorer).match(
+            payee_name, prefer_category, custom_mappings, mode, top_k, threshold
+        )
+
+    key = (
+        payee_name,
+        prefer_category,
+        tuple(custom_mappings.items()) if custom_mappings else None,
+        mode,
+        top_k,
+        threshold,
+        scorer,
+    )
+
+    with _resolution_lock:
+        if _resolution_cache['snapshot'] != snapshot:
+            if _resolution_cache['snapshot'] is not None:
+                _resolution_cache['invalidations'] += 1
+            _resolution_cache['snapshot'] = snapshot
+            _resolution_cache['results'] = {}
+
+        cached = _resolution_cache['results'].get(key)
+        if cached is not None:
+            _resolution_cache['hits'] += 1
+            return cached
+        _resolution_cache['misses'] += 1
+
+    result = get_contact_matcher(db, scorer).match(
+        payee_name, prefer_category, custom_mappings, mode, top_k, threshold
+    )
+
+    with _resolution_lock:
+        if _resolution_cache['snapshot'] == snapshot:
+            _resolution_cache['results'][key] = result
+
+    return result
+
+
+def reset_contact_cache():
+    """
+    Reset the contact resolution cache and its counters.
+    Call this at the start of a run to get per-run statistics.
+    """
+    global _resolution_cache
+    with _resolution_lock:
+        _resolution_cache = {
+            'snapshot': None,
+            'results': {},
+            'hits': 0,
+            'misses': 0,
+            'invalidations': 0,
+        }
+
+
+def get_contact_cache_stats() -> Dict:
+    """
+    Get statistics of the contact resolution cache.
+    
+    Returns:
+        Dictionary with hits, misses, invalidations, entries and hit_rate
+    """
+    with _resolution_lock:
+        hits = _resolution_cache['hits']
+        misses = _resolution_cache['misses']
+        return {
+            'hits': hits,
+            'misses': misses,
+            'invalidations': _resolution_cache['invalidations'],
+            'entries': len(_resolution_cache['results']),
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+
+# Contact matching options of the current run (see configure_contact_matching())
+_match_settings = {
+    'mode': DEFAULT_MATCH_MODE,
+    'threshold': None,
+}
+
+
+def get_match_settings() -> Dict:
+    """
+    Get the contact matching options of the current run.
+
+    Returns:
+        Dictionary with mode and threshold (None = no minimum score)
+    """
+    return dict(_match_settings)
+
+
+def configure_contact_matching(args=None):
+    """
+    Set the contact matching options of the current run.
+
+    Command-line options (see add_match_arguments()) take precedence over
+    the CONTACT_MATCH_MODE and CONTACT_MATCH_THRESHOLD environment variables
+    (e.g. from .env); without either, the tiered mode without a threshold is used.
+
+    Args:
+        args: Parsed arguments with match_mode and match_threshold (None = environment only)
+
+    Raises:
+        ValueError: If the mode is unknown or the threshold is not between 0 and 1
+    """
+    mode = getattr(args, 'match_mode', None) or os.getenv('CONTACT_MATCH_MODE') or DEFAULT_MATCH_MODE
+    threshold = getattr(args, 'match_threshold', None)
+    if threshold is None and os.getenv('CONTACT_MATCH_THRESHOLD'):
+        threshold = float(os.getenv('CONTACT_MATCH_THRESHOLD'))
+
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Unknown contact match mode '{mode}' (use {' or '.join(MATCH_MODES)})")
+    if threshold is not None and not 0.0 <= threshold <= 1.0:
+        raise ValueError(f"Contact match threshold must be between 0 and 1, got {threshold}")
+
+    _match_settings['mode'] = mode
+    _match_settings['threshold'] = threshold
+
+
+def add_match_arguments(parser):
+    """
+    Add --match-mode and --match-threshold to an argument parser.
+
+    Args:
+        parser: argparse.ArgumentParser
+    """
+    parser.add_argument(
+        '--match-mode',
+        choices=MATCH_MODES,
+        default=None,
+        help=f'Contact matching: {MODE_TIERED} (original scoring) or {MODE_FUZZY} '
+             f'(trigram candidates, fastest on large contact lists) '
+             f'(default: CONTACT_MATCH_MODE or {DEFAULT_MATCH_MODE})'
+    )
+    parser.add_argument(
+        '--match-threshold',
+        type=float,
+        default=None,
+        metavar='SCORE',
+        help='Minimum contact match score from 0 to 1; weaker matches leave the contact empty '
+             '(default: CONTACT_MATCH_THRESHOLD or none)'
+    )
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Saved voucher plans (plan artifacts).
+
+A plan run of create_all_vouchers.py writes the reviewed plan twice: as
+voucher_plan_all.md (for people) and as voucher_plan_all.json (for
+`--create-all --from-plan`). The JSON artifact contains everything needed to
+create the vouchers without reloading or re-planning:
+- Per voucher type: accounting type, check account and SevClient IDs
+- The plan items with their voucher numbers
+- The update date and amount of each planned transaction
+- A fingerprint of the database snapshot the plan was computed from
+
+Before the saved plan is executed, only the planned transactions are fetched
+from the API (see check_plan_staleness). Transactions that are no longer
+open or changed since planning are dropped from the run.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.database.db import TransactionDB
+from src.vouchers.verification import fetch_transactions, VERIFY_JOBS
+
+
+# Bump when the artifact layout changes incompatibly
+PLAN_FORMAT_VERSION = 1
+
+# File name of the plan artifact (next to voucher_plan_all.md)
+PLAN_ARTIFACT_NAME = 'voucher_plan_all.json'
+
+
+def _canonical_json(value) -> str:
+    """Serialize a value with sorted keys (stable across runs)."""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def compute_plan_id(types: List[Dict]) -> str:
+    """
+    Get the ID of a plan (short hash of its voucher types and items).
+
+    The ID is shown in voucher_plan_all.md and when the plan is executed,
+    so the executed plan can be matched with the reviewed one.
+    """
+    content = [{
+        'key': entry['key'],
+        'accounting_type_id': (entry.get('accounting_type') or {}).get('id'),
+        'voucher_plan': entry['voucher_plan'],
+    } for entry in types]
+    return hashlib.sha256(_canonical_json(content).encode('utf-8')).hexdigest()[:12]
+
+
+def compute_snapshot_fingerprint(db: TransactionDB) -> Dict:
+    """
+    Fingerprint the database snapshot a plan is computed from.
+
+    Args:
+        db: Database connection
+
+    Returns:
+        Dictionary with the number and a hash of the open transactions
+        (ID, update date, amount) and the counts of the reference data
+    """
+    open_transactions = db.get_all_transactions(status=100)
+    rows = sorted(
+        (str(txn['id']), str(txn.get('update_date') or ''), str(txn.get('amount')))
+        for txn in open_transactions
+    )
+    return {
+        'open_transactions': len(rows),
+        'open_transactions_hash': hashlib.sha256(_canonical_json(rows).encode('utf-8')).hexdigest(),
+        'accounting_types': len(db.get_all_accounting_types()),
+        'contacts': len(db.get_all_contacts()),
+    }
+
+
+def build_plan_artifact(results: List[Dict], db: TransactionDB) -> Dict:
+    """
+    Build the plan artifact of a master plan run.
+
+    Args:
+        results: Planning results of the master creator (with voucher numbers)
+        db: Database connection the plan was computed from
+
+    Returns:
+        Plan artifact dictionary
+    """
+    types = []
+    for result in results:
+        if 'error' in result or not result['voucher_plan']:
+            continue
+
+        voucher_plan = result['voucher_plan']
+        check_account_id = None
+        sev_client_id = None
+        transactions = {}
+        for plan in voucher_plan:
+            txn = db.get_transaction(str(plan['transaction_id']))
+            if not txn:
+                continue
+            transactions[str(plan['transaction_id'])] = {
+                'update_date': txn.get('update_date'),
+                'amount': txn.get('amount'),
+            }
+            if check_account_id is None:
+                raw_data = json.loads(txn.get('raw_data') or '{}')
+                check_account_id = (raw_data.get('checkAccount') or {}).get('id')
+                sev_client_id = (raw_data.get('sevClient') or {}).get('id')
+
+        types.append({
+            'key': result['key'],
+            'icon': result['icon'],
+            'name': result['name'],
+            'accounting_type': result.get('accounting_type'),
+            'check_account_id': check_account_id,
+            'sev_client_id': sev_client_id,
+            'voucher_plan': voucher_plan,
+            'transactions': transactions,
+        })
+
+    # Round-trip through JSON, so the ID is computed from the saved values
+    types = json.loads(_canonical_json(types))
+
+    return {
+        'version': PLAN_FORMAT_VERSION,
+        'plan_id': compute_plan_id(types),
+        'created_at': datetime.now().isoformat(),
+        'fingerprint': compute_snapshot_fingerprint(db),
+        'types': types,
+    }
+
+
+def save_plan_artifact(artifact: Dict, path: str) -> str:
+    """
+    Write a plan artifact (atomically).
+
+    Returns:
+        Path of the written file
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, ensure_ascii=False, indent=2, default=str)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_plan_artifact(path: str) -> Dict:
+    """
+    Read a plan artifact.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not a plan artifact of this version
+            or its content does not match its plan ID
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            artifact = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Plan file {path} is not valid JSON: {e}")
+
+    if not isinstance(artifact, dict) or artifact.get('version') != PLAN_FORMAT_VERSION:
+        raise ValueError(
+            f"Plan file {path} has an unsupported format "
+            f"(expected version {PLAN_FORMAT_VERSION}); please re-run the planning"
+        )
+    if compute_plan_id(artifact.get('types', [])) != artifact.get('plan_id'):
+        raise ValueError(f"Plan file {path} was modified after planning; please re-run the planning")
+    return artifact
+
+
+def check_plan_staleness(client, artifact: Dict, jobs: int = VERIFY_JOBS) -> Dict:
+    """
+    Re-verify only the transactions of a saved plan.
+
+    A plan item is stale if its transaction is no longer open, cannot be
+    fetched, or its amount or update date changed since planning. Stale
+    items are removed from the artifact's plans.
+
+    Args:
+        client: SevDeskClient instance
+        artifact: Plan artifact (updated in place)
+        jobs: Number of concurrent requests
+
+    Returns:
+        Dictionary with 'checked' (count) and 'stale' (list of
+        {'type', 'transaction_id', 'voucher_number', 'reason'})
+    """
+    transaction_ids = [
+        str(plan['transaction_id'])
+        for entry in artifact['types']
+        for plan in entry['voucher_plan']
+    ]
+    fetched = fetch_transactions(client, transaction_ids, jobs=jobs)
+
+    stale = []
+    for entry in artifact['types']:
+        current_plan = []
+        for plan in entry['voucher_plan']:
+            txn_id = str(plan['transaction_id'])
+            reason = _stale_reason(fetched.get(txn_id) or {}, entry['transactions'].get(txn_id))
+            if reason:
+                stale.append({
+                    'type': entry['name'],
+                    'transaction_id': txn_id,
+                    'voucher_number': plan.get('voucher_number'),
+                    'reason': reason,
+                })
+            else:
+                current_plan.append(plan)
+        entry['voucher_plan'] = current_plan
+
+    return {'checked': len(set(transaction_ids)), 'stale': stale}
+
+
+def _stale_reason(result: Dict, planned: Optional[Dict]) -> Optional[str]:
+    """Get why a planned transaction is stale (None if it is unchanged)."""
+    txn = result.get('transaction')
+    if not txn:
+        return f"not found ({result['error']})" if result.get('error') else 'not found'
+
+    try:
+        status = int(txn.get('status'))
+    except (TypeError, ValueError):
+        status = txn.get('status')
+    if status != 100:
+        return f"no longer open (status {status})"
+
+    if planned is None:
+        return 'not in the planned snapshot'
+    try:
+        if round(float(txn.get('amount')), 2) != round(float(planned['amount']), 2):
+            return f"amount changed ({planned['amount']} → {txn.get('amount')})"
+    except (TypeError, ValueError):
+        return 'amount changed'
+    if planned.get('update_date') and txn.get('update') and txn.get('update') != planned['update_date']:
+        return 'changed since planning'
+    return None
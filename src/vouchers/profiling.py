@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Phase timing and profiling of voucher runs.
+
+PhaseTimer measures named phases of a run (reload, filtering, contact
+matching, voucher numbers, markdown, creation, ...) as nested spans:
+
+    timer = get_phase_timer()
+    with timer.span('plan'):
+        with timer.span('contact matching'):
+            ...
+
+Spans with the same path are added up (calls and seconds), so a span can
+be opened for every contact lookup. A span opened in a worker thread
+without an open span of its own is nested under the span currently open in
+the thread that created the timer (e.g. the parallel planning of types).
+
+Optionally (--profile) every top-level phase is run under cProfile and its
+statistics are written per phase (.prof for pstats/snakeviz and a .txt
+summary), and tracemalloc records the peak memory of every span. The timer
+of the current run is process-wide (see get_phase_timer()).
+"""
+import os
+import re
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+# Lines of the per-phase .txt profile summary
+PROFILE_SUMMARY_LINES = 30
+
+
+class PhaseTimer:
+    """
+    Nested phase timer with optional cProfile and tracemalloc per phase.
+
+    Usage:
+        timer = PhaseTimer(profile_dir='profiles/run', trace_memory=True)
+        with timer.span('reload'):
+            ...
+        timer.print_table()
+        timer.close()
+    """
+
+    def __init__(self, profile_dir: Optional[str] = None, trace_memory: bool = False):
+        """
+        Initialize the timer.
+
+        Args:
+            profile_dir: Directory for the cProfile output of every top-level
+                phase (None = no cProfile)
+            trace_memory: Record the peak memory of every span with tracemalloc
+        """
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+        self.spans: Dict[tuple, Dict] = {}
+        self.profile_files: List[str] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._owner = threading.get_ident()
+        self._owner_stack: List[Dict] = []
+        self._profiled_phases = 0
+        self._started_tracemalloc = False
+        self._start = time.perf_counter()
+
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def _get_stack(self) -> List[Dict]:
+        """Get the open spans of the current thread."""
+        if threading.get_ident() == self._owner:
+            return self._owner_stack
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _get_parent_path(self, stack: List[Dict]) -> tuple:
+        """Get the path of the innermost open span (of the owner thread if none is open)."""
+        if stack:
+            return stack[-1]['path']
+        if threading.get_ident() != self._owner and self._owner_stack:
+            return self._owner_stack[-1]['path']
+        return ()
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        Measure a phase (nested in the phase currently open).
+
+        Args:
+            name: Phase name (e.g. 'reload', 'plan: Spenden')
+        """
+        stack = self._get_stack()
+        path = self._get_parent_path(stack) + (name,)
+        frame = {'path': path, 'peak': 0}
+
+        if self.trace_memory:
+            # The parent keeps the peak reached so far; the counter restarts for this span
+            _, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+
+        profiler = None
+        if self.profile_dir and not stack and threading.get_ident() == self._owner:
+            # Only top-level phases of the owner thread (cProfile cannot be nested)
+            profiler = cProfile.Profile()
+
+        with self._lock:
+            # Registered when opened, so phases are listed in the order they started
+            entry = self.spans.get(path)
+            if entry is None:
+                entry = self.spans[path] = {
+                    'name': name,
+                    'path': path,
+                    'depth': len(path) - 1,
+                    'calls': 0,
+                    'seconds': 0.0,
+                    'peak_bytes': 0,
+                }
+
+        stack.append(frame)
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            seconds = time.perf_counter() - start
+            stack.pop()
+
+            peak = 0
+            if self.trace_memory:
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                if stack:
+                    stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+
+            with self._lock:
+                entry['calls'] += 1
+                entry['seconds'] += seconds
+                entry['peak_bytes'] = max(entry['peak_bytes'], peak)
+
+            if profiler is not None:
+                self._write_profile(name, profiler)
+
+    def _write_profile(self, name: str, profiler: cProfile.Profile):
+        """Write the cProfile statistics of a top-level phase (.prof and .txt)."""
+        self._profiled_phases += 1
+        slug = re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_') or 'phase'
+        base = os.path.join(self.profile_dir, f"{self._profiled_phases:02d}_{slug}")
+        try:
+            profiler.dump_stats(f"{base}.prof")
+            with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+                f.write(f"Phase: {name}\n\n")
+                stats = pstats.Stats(profiler, stream=f)
+                stats.sort_stats('cumulative').print_stats(PROFILE_SUMMARY_LINES)
+            self.profile_files.append(f"{base}.prof")
+        except Exception as e:
+            print(f"⚠️  Warning: Could not write the profile of {name}: {e}")
+
+    def get_spans(self) -> List[Dict]:
+        """
+        Get the measured spans, each followed by its nested spans.
+
+        Returns:
+            List of span dictionaries (name, path, depth, calls, seconds, peak_bytes)
+        """
+        with self._lock:
+            spans = list(self.spans.values())
+        # Children after their parent, siblings in the order they were first opened
+        order = {span['path']: index for index, span in enumerate(spans)}
+        return sorted(spans, key=lambda span: [order[span['path'][:i + 1]]
+                                               for i in range(len(span['path']))])
+
+    def print_table(self):
+        """Print the time (and peak memory) of every phase."""
+        spans = self.get_spans()
+        if not spans:
+            return
+        total = time.perf_counter() - self._start
+        memory_header = f" {'Peak memory':>12}" if self.trace_memory else ''
+        width = 70 + (13 if self.trace_memory else 0)
+
+        print()
+        print("=" * width)
+        print("⏱️  PHASE TIMINGS")
+        print("=" * width)
+        print(f"{'Phase':<44} {'Calls':>6} {'Time':>9} {'Share':>7}{memory_header}")
+        print("-" * width)
+        for span in spans:
+            label = ('  ' * span['depth'] + span['name'])[:44]
+            share = span['seconds'] / total if total > 0 else 0.0
+            line = f"{label:<44} {span['calls']:>6} {span['seconds']:>8.2f}s {share:>7.1%}"
+            if self.trace_memory:
+                line += f" {span['peak_bytes'] / (1024 * 1024):>9.1f} MiB"
+            print(line)
+        print("-" * width)
+        top_level = sum(span['seconds'] for span in spans if span['depth'] == 0)
+        print(f"Wall time: {total:.2f}s (top-level phases: {top_level:.2f}s; "
+              f"phases of parallel jobs can add up to more than their parent)")
+        if self.trace_memory:
+            peak = max(span['peak_bytes'] for span in spans)
+            print(f"Peak traced memory: {peak / (1024 * 1024):.1f} MiB (tracemalloc, all threads)")
+        if self.profile_files:
+            print(f"Profiles: {len(self.profile_files)} phase(s) in {self.profile_dir} "
+                  f"(view with: python -m pstats <file>.prof)")
+
+    def close(self):
+        """Stop tracemalloc (if this timer started it)."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+
+# Timer of the current run (a plain timer until a run sets its own)
+_phase_timer = {'timer': None}
+
+
+def get_phase_timer() -> PhaseTimer:
+    """Get the phase timer of the current run (created on first use)."""
+    if _phase_timer['timer'] is None:
+        _phase_timer['timer'] = PhaseTimer()
+    return _phase_timer['timer']
+
+
+def set_phase_timer(timer: Optional[PhaseTimer]):
+    """
+    Set the phase timer of the current run.
+
+    Args:
+        timer: Timer used by all spans of this process (None = a new plain timer on next use)
+    """
+    _phase_timer['timer'] = timer
+
+
+def start_run_timer(args=None) -> PhaseTimer:
+    """
+    Start the phase timer of a run from the command-line arguments.
+
+    Args:
+        args: Parsed arguments with profile and profile_memory (see
+            add_profile_arguments()); None = timing only
+
+    Returns:
+        The new timer (also returned by get_phase_timer())
+    """
+    profile = getattr(args, 'profile', None)
+    profile_dir = None
+    if profile:
+        profile_dir = os.path.join(profile, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    timer = PhaseTimer(profile_dir=profile_dir, trace_memory=bool(getattr(args, 'profile_memory', False)))
+    set_phase_timer(timer)
+    return timer
+
+
+def add_profile_arguments(parser):
+    """
+    Add --profile and --profile-memory to an argument parser.
+
+    Args:
+        parser: argparse.ArgumentParser
+    """
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='profiles',
+        default=None,
+        metavar='DIR',
+        help='Write cProfile statistics of every top-level phase (main thread) to DIR/<timestamp>/ '
+             '(default DIR: profiles)'
+    )
+    parser.add_argument(
+        '--profile-memory',
+        action='store_true',
+        help='Record the peak memory of every phase with tracemalloc (slower)'
+    )
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Registry of the voucher creators run by create_all_vouchers.py.
+
+The creators are listed in a manifest (module and class name) and imported
+only when they are used, so selecting a few types with `--only` or running
+a saved plan imports just those creator modules.
+
+To add a voucher type, add its creator to CREATOR_MANIFEST; the position
+in the list is the order of planning, voucher numbers and the report.
+"""
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+
+# (key, module, class name, icon, description)
+CREATOR_MANIFEST = [
+    ('gehalt', 'scripts.vouchers.create_vouchers_for_gehalt', 'GehaltVoucherCreator',
+     '💰', 'Gehalt (Salaries)'),
+    ('ulp', 'scripts.vouchers.create_vouchers_for_ulp', 'UlpVoucherCreator',
+     '🎓', 'ÜLP (Übungsleiterpauschale)'),
+    ('spenden', 'scripts.vouchers.create_vouchers_for_spenden', 'SpendenVoucherCreator',
+     '💝', 'Spenden (Donations)'),
+    ('krankenkassen', 'scripts.vouchers.create_vouchers_for_krankenkassen', 'KrankenkassenVoucherCreator',
+     '🏥', 'Krankenkassen (Health Insurance)'),
+    ('grace_baptist', 'scripts.vouchers.create_vouchers_for_grace_baptist', 'GraceBaptistVoucherCreator',
+     '⛪', 'Grace Baptist'),
+    ('kontaktmission', 'scripts.vouchers.create_vouchers_for_kontaktmission', 'KontaktmissionVoucherCreator',
+     '🌍', 'Kontaktmission'),
+    ('ebtc', 'scripts.vouchers.create_vouchers_for_ebtc', 'EBTCVoucherCreator',
+     '📚', 'EBTC (Donations)'),
+    ('jek_freizeit', 'scripts.vouchers.create_vouchers_for_jek_freizeit', 'JEKFreizeitVoucherCreator',
+     '🏕️', 'JEK Freizeit'),
+    ('geldtransit', 'scripts.vouchers.create_vouchers_for_geldtransit', 'GeldtransitVoucherCreator',
+     '🏦', 'Geldtransit'),
+    ('fees', 'scripts.vouchers.create_vouchers_for_fees', 'FeesVoucherCreator',
+     '💳', 'Fees'),
+]
+
+_MANIFEST_BY_KEY = {entry[0]: entry for entry in CREATOR_MANIFEST}
+
+
+def get_creator_keys() -> List[str]:
+    """Get the keys of all registered voucher types (in manifest order)."""
+    return [entry[0] for entry in CREATOR_MANIFEST]
+
+
+def get_creator_names() -> Dict[str, str]:
+    """Get the display name ('icon description') of every voucher type (no imports)."""
+    return {key: f"{icon} {description}" for key, _, _, icon, description in CREATOR_MANIFEST}
+
+
+def parse_creator_selection(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated list of voucher type keys (e.g. 'spenden,gehalt').
+
+    Returns:
+        Selected keys in manifest order, or None if value is empty (all types)
+
+    Raises:
+        ValueError: If a key is not registered
+    """
+    if not value:
+        return None
+    keys = [key.strip().lower() for key in value.split(',') if key.strip()]
+    unknown = [key for key in keys if key not in _MANIFEST_BY_KEY]
+    if unknown:
+        raise ValueError(
+            f"Unknown voucher type(s): {', '.join(unknown)} "
+            f"(available: {', '.join(get_creator_keys())})"
+        )
+    return [key for key in get_creator_keys() if key in keys]
+
+
+def load_creator_class(key: str):
+    """
+    Import the creator class of a voucher type.
+
+    Raises:
+        KeyError: If the key is not registered
+    """
+    _, module_name, class_name, _, _ = _MANIFEST_BY_KEY[key]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def get_creator_entries(keys: Optional[List[str]] = None) -> List[Tuple[str, str, str]]:
+    """
+    Get the selected voucher types without importing their creators.
+
+    Args:
+        keys: Voucher type keys (None = all types)
+
+    Returns:
+        List of (key, icon, description) tuples in manifest order
+    """
+    return [
+        (key, icon, description)
+        for key, _, _, icon, description in CREATOR_MANIFEST
+        if keys is None or key in keys
+    ]
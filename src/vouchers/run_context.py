@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Shared run context for voucher creators.
+
+A RunContext owns everything the voucher creators of one run have in common:
+- Environment (loaded once)
+- One SevDesk API client (one HTTP session for all creators)
+- One database connection with snapshots of the reference data
+  (accounting types, cost centres, contacts)
+- The voucher number allocator and the voucher creation journal
+- The data reload (done at most once, skipped if the stored data is fresh
+  enough for the reload policy)
+
+Creators get the context injected with VoucherCreatorBase.use_context();
+without a context they set everything up for themselves as before.
+"""
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from src.sevdesk.client import SevDeskClient
+from src.database.db import TransactionDB
+from src.vouchers.voucher_numbers import VoucherNumberAllocator
+from src.vouchers.journal import VoucherJournal
+from src.vouchers.voucher_utils import get_voucher_number_allocator
+from scripts.loaders.reload_data import reload_if_stale
+
+
+class SnapshotDB(TransactionDB):
+    """
+    Database connection serving the reference data from in-memory snapshots.
+
+    Accounting types, cost centres and contacts are read once and shared by
+    all users of the connection. Call refresh_snapshots() after reloading
+    reference data.
+    """
+
+    # Reference data methods served from snapshots
+    SNAPSHOT_METHODS = ('get_all_accounting_types', 'get_all_cost_centres', 'get_all_contacts')
+
+    def __init__(self, db_path: str = "transactions.db", snapshots: Optional[Dict[str, List[Dict]]] = None):
+        """
+        Initialize the database connection.
+
+        Args:
+            db_path: Path to the SQLite database file
+            snapshots: Snapshot dictionary to share with another connection
+        """
+        self._snapshots: Dict[str, List[Dict]] = snapshots if snapshots is not None else {}
+        self.snapshot_loads = 0
+        super().__init__(db_path=db_path)
+
+    def _snapshot(self, method_name: str) -> List[Dict]:
+        """Get a snapshot, reading it from the database on first use."""
+        if method_name not in self._snapshots:
+            self._snapshots[method_name] = getattr(TransactionDB, method_name)(self)
+            self.snapshot_loads += 1
+        # Callers get their own list, the dictionaries are shared
+        return list(self._snapshots[method_name])
+
+    def get_all_accounting_types(self) -> List[Dict]:
+        """Get all accounting types (snapshot)."""
+        return self._snapshot('get_all_accounting_types')
+
+    def get_all_cost_centres(self) -> List[Dict]:
+        """Get all cost centres (snapshot)."""
+        return self._snapshot('get_all_cost_centres')
+
+    def get_all_contacts(self) -> List[Dict]:
+        """Get all contacts (snapshot)."""
+        return self._snapshot('get_all_contacts')
+
+    def load_snapshots(self):
+        """Read all snapshots now (e.g. before other threads share them)."""
+        for method_name in self.SNAPSHOT_METHODS:
+            self._snapshot(method_name)
+
+    def refresh_snapshots(self):
+        """Drop the snapshots, so they are read again on next use."""
+        self._snapshots.clear()
+
+
+class RunContext:
+    """
+    Resources shared by all voucher creators of one run.
+
+    Usage:
+        with RunContext.from_environment() as context:
+            creator = GehaltVoucherCreator()
+            creator.use_context(context)
+            context.reload_data()
+            creator.find_accounting_type(context.db)
+    """
+
+    def __init__(self, api_key: str, api_url: str = 'https://my.sevdesk.de/api/v1',
+                 db_path: str = 'transactions.db', client: Optional[SevDeskClient] = None):
+        """
+        Initialize the run context. Client and database are opened on first use.
+
+        Args:
+            api_key: SevDesk API key
+            api_url: SevDesk API base URL
+            db_path: Path to the SQLite database file
+            client: Client to use instead of connecting (e.g. SyntheticClient)
+        """
+        self.api_key = api_key
+        self.api_url = api_url
+        self.db_path = db_path
+        self.data_reloaded = False
+        # Keyword arguments of reload_if_stale() (see get_reload_policy())
+        self.reload_policy: Dict = {}
+        self._client: Optional[SevDeskClient] = client
+        self._db: Optional[SnapshotDB] = None
+        self._journal: Optional[VoucherJournal] = None
+        self._lock = threading.RLock()
+        self._thread_local = threading.local()
+
+    @classmethod
+    def from_environment(cls) -> 'RunContext':
+        """
+        Create a run context from the environment (.env is loaded once here).
+
+        Raises:
+            ValueError: If SEVDESK_API_KEY is not set
+        """
+        load_dotenv()
+
+        api_key = os.getenv('SEVDESK_API_KEY')
+        if not api_key:
+            raise ValueError("SEVDESK_API_KEY not found in environment variables.")
+
+        return cls(
+            api_key=api_key,
+            api_url=os.getenv('SEVDESK_API_URL', 'https://my.sevdesk.de/api/v1'),
+            db_path=os.getenv('DB_PATH', 'transactions.db')
+        )
+
+    @property
+    def client(self) -> SevDeskClient:
+        """The shared SevDesk API client."""
+        with self._lock:
+            if self._client is None:
+                print(f"Connecting to SevDesk API at {self.api_url}...")
+                self._client = SevDeskClient(api_key=self.api_key, base_url=self.api_url)
+                print("✓ Connected")
+                print()
+            return self._client
+
+    @property
+    def db(self) -> SnapshotDB:
+        """
+        The shared database connection (or the connection of the current
+        worker thread, see thread_database()).
+        """
+        thread_db = getattr(self._thread_local, 'db', None)
+        if thread_db is not None:
+            return thread_db
+
+        with self._lock:
+            if self._db is None:
+                print(f"Opening database: {self.db_path}")
+                self._db = SnapshotDB(db_path=self.db_path)
+            return self._db
+
+    def prepare_shared_resources(self):
+        """
+        Open the client and database and load the reference data snapshots,
+        e.g. before worker threads start using them.
+        """
+        self.client
+        self.db.load_snapshots()
+
+    @contextmanager
+    def thread_database(self):
+        """
+        Give the current worker thread its own database connection.
+
+        SQLite connections cannot be shared between threads; the thread's
+        connection shares the reference data snapshots of the main
+        connection (call prepare_shared_resources() before starting the threads).
+        Inside the with block, db and open_database() return the thread's
+        connection.
+        """
+        with self._lock:
+            snapshots = self._db._snapshots if self._db is not None else None
+
+        thread_db = SnapshotDB(db_path=self.db_path, snapshots=snapshots)
+        self._thread_local.db = thread_db
+        try:
+            yield thread_db
+        finally:
+            self._thread_local.db = None
+            thread_db.close()
+
+    @property
+    def allocator(self) -> VoucherNumberAllocator:
+        """The voucher number allocator of the database."""
+        return get_voucher_number_allocator(self.db_path)
+
+    @property
+    def journal(self) -> VoucherJournal:
+        """The voucher creation journal of this run."""
+        with self._lock:
+            if self._journal is None:
+                self._journal = VoucherJournal(self.db_path)
+            return self._journal
+
+    def open_database(self):
+        """
+        Get the shared database connection for use in a with statement.
+        The connection stays open when the with block ends.
+        """
+        return nullcontext(self.db)
+
+    def reload_data(self) -> bool:
+        """
+        Reload all data from SevDesk API (at most once per run).
+
+        The reload policy may reuse the stored data instead; it then counts
+        as reloaded for this run.
+
+        Returns:
+            True if the data is loaded, False if the reload failed
+        """
+        with self._lock:
+            if self.data_reloaded:
+                print("(Skipping data reload - already done)")
+                print()
+                return True
+
+            if not reload_if_stale(db_path=self.db_path, api_key=self.api_key, api_url=self.api_url,
+                                   **self.reload_policy):
+                print("Error: Failed to reload data from API")
+                return False
+            print()
+            print("=" * 80)
+            print()
+
+            self.data_reloaded = True
+            if self._db is not None:
+                self._db.refresh_snapshots()
+            return True
+
+    def get_stats(self) -> Dict:
+        """Get counts of the shared resources (for the run summary)."""
+        return {
+            'client_opened': self._client is not None,
+            'db_opened': self._db is not None,
+            'snapshot_loads': self._db.snapshot_loads if self._db is not None else 0,
+        }
+
+    def close(self):
+        """Close the database connections and the API session."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+            if self._client is not None:
+                session = getattr(self._client, 'session', None)
+                if session is not None:
+                    session.close()
+                self._client = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Per-thread console output for parallel voucher processing.
+
+Worker threads print a lot (the creators report every step). To keep the
+console readable, the output of each worker is collected in a buffer and
+written by the main thread in a fixed order, so a parallel run prints the
+same text as a sequential one.
+
+Usage:
+    results = map_in_order(process_item, items, jobs=4)
+"""
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, List
+
+
+class ThreadOutput:
+    """sys.stdout replacement sending the writes of capturing threads to their buffer."""
+
+    def __init__(self, stream):
+        """
+        Initialize the router.
+
+        Args:
+            stream: Stream receiving the output of non-capturing threads
+        """
+        self.stream = stream
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        """Write to the current thread's buffer, or to the stream."""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        """Flush the stream (buffers need no flushing)."""
+        if getattr(self._local, 'buffer', None) is None:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        """Delegate everything else (encoding, isatty, ...) to the stream."""
+        return getattr(self.stream, name)
+
+    @contextmanager
+    def capture(self):
+        """Collect the current thread's output in a StringIO buffer."""
+        buffer = io.StringIO()
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+
+@contextmanager
+def route_thread_output():
+    """Install a ThreadOutput as sys.stdout for the duration of the with block."""
+    router = ThreadOutput(sys.stdout)
+    sys.stdout = router
+    try:
+        yield router
+    finally:
+        sys.stdout = router.stream
+
+
+def map_in_order(func: Callable, items: Iterable, jobs: int) -> List:
+    """
+    Call func for each item in a thread pool of `jobs` workers.
+
+    The output printed by each call is written to the console in item
+    order as soon as all previous items are done, so the console shows
+    the same text as a sequential loop.
+
+    Args:
+        func: Function called as func(item)
+        items: Items to process
+        jobs: Number of worker threads
+
+    Returns:
+        List of the results in item order (exceptions are re-raised)
+    """
+    results = []
+    with route_thread_output() as output:
+        def run(item):
+            with output.capture() as buffer:
+                try:
+                    return func(item), None, buffer
+                except Exception as e:
+                    return None, e, buffer
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(run, item) for item in items]
+            for future in futures:
+                result, error, buffer = future.result()
+                output.stream.write(buffer.getvalue())
+                if error is not None:
+                    raise error
+                results.append(result)
+
+    return results
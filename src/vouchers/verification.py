@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Verification of transaction statuses after voucher creation.
+
+Only the transactions of the created vouchers are fetched from the API
+(one request per transaction, several at the same time, in batches) and only
+their rows are updated in the local database. The cost depends on the number
+of created vouchers, not on the size of the transaction history.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from src.database.db import TransactionDB
+
+
+# Transactions fetched per batch
+VERIFY_BATCH_SIZE = 25
+
+# Concurrent requests (the client's rate limit still applies)
+VERIFY_JOBS = 4
+
+# Transaction status names
+STATUS_NAMES = {100: 'Open', 200: 'Linked', 1000: 'Booked'}
+
+
+def fetch_transactions(
+    client,
+    transaction_ids: Iterable[str],
+    jobs: int = VERIFY_JOBS,
+    batch_size: int = VERIFY_BATCH_SIZE
+) -> Dict[str, Dict]:
+    """
+    Fetch transactions by ID.
+
+    Args:
+        client: SevDeskClient instance
+        transaction_ids: Transaction IDs (duplicates are fetched once)
+        jobs: Number of concurrent requests
+        batch_size: Number of transactions per batch
+
+    Returns:
+        Dictionary of transaction ID -> {'transaction': dict or None, 'error': str or None,
+        'not_found': True if the API answered 404 (e.g. the transaction was deleted)}
+    """
+    ids = list(dict.fromkeys(str(tid) for tid in transaction_ids))
+    results: Dict[str, Dict] = {}
+
+    def fetch(transaction_id: str) -> Dict:
+        try:
+            return {'transaction': client.get_transaction(transaction_id), 'error': None, 'not_found': False}
+        except requests.exceptions.HTTPError as e:
+            not_found = e.response is not None and e.response.status_code == 404
+            return {'transaction': None, 'error': str(e), 'not_found': not_found}
+        except Exception as e:
+            return {'transaction': None, 'error': str(e), 'not_found': False}
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            for transaction_id, result in zip(batch, executor.map(fetch, batch)):
+                results[transaction_id] = result
+
+    return results
+
+
+def verify_created_vouchers(
+    client,
+    db: TransactionDB,
+    created_vouchers: List[Dict],
+    jobs: int = VERIFY_JOBS
+) -> Dict:
+    """
+    Check that the transactions of created vouchers left the open status.
+
+    Prints one line per voucher (in the order of created_vouchers) and
+    stores the fetched transactions in the database.
+
+    Args:
+        client: SevDeskClient instance
+        db: Database connection (only the fetched rows are updated)
+        created_vouchers: Created vouchers (dicts with 'plan' containing 'transaction_id')
+        jobs: Number of concurrent requests
+
+    Returns:
+        Dictionary with counts: checked, changed, unchanged, missing, updated,
+        and 'outcomes' (transaction ID -> 'changed', 'unchanged' or 'missing')
+    """
+    transaction_ids = [str(created['plan']['transaction_id']) for created in created_vouchers]
+    stats = {'checked': 0, 'changed': 0, 'unchanged': 0, 'missing': 0, 'updated': 0, 'outcomes': {}}
+    if not transaction_ids:
+        return stats
+
+    print(f"Fetching {len(set(transaction_ids))} transaction(s) from API...")
+    fetched = fetch_transactions(client, transaction_ids, jobs=jobs)
+    print()
+
+    for txn_id in transaction_ids:
+        stats['checked'] += 1
+        result = fetched.get(txn_id) or {}
+        txn: Optional[Dict] = result.get('transaction')
+
+        if txn:
+            old_status = 100  # Was open
+            new_status = txn.get('status')
+            try:
+                new_status = int(new_status)
+            except (TypeError, ValueError):
+                pass
+            status_name = STATUS_NAMES.get(new_status, f'Unknown ({new_status})')
+
+            if new_status != old_status:
+                outcome = 'changed'
+                print(f"✓ Transaction {txn_id}: {old_status} → {new_status} ({status_name})")
+            else:
+                outcome = 'unchanged'
+                print(f"⚠️  Transaction {txn_id}: Still at status {new_status} ({status_name})")
+        else:
+            outcome = 'missing'
+            reason = f" ({result['error']})" if result.get('error') else ''
+            print(f"❌ Transaction {txn_id}: Not found{reason}")
+
+        stats[outcome] += 1
+        stats['outcomes'][txn_id] = outcome
+
+    print()
+
+    # Update only the verified transactions
+    print("Updating local database...")
+    updated = [result['transaction'] for result in fetched.values() if result.get('transaction')]
+    stats['updated'] = db.bulk_insert_transactions(updated)
+    print(f"✓ Updated {stats['updated']} transactions in database")
+    print()
+
+    return stats
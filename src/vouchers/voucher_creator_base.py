@@ -7,21 +7,28 @@ eliminating code duplication and providing a consistent interface.
 """
 import os
 import sys
-import json
 import argparse
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from src.sevdesk.client import SevDeskClient
 from src.database.db import TransactionDB
-from scripts.loaders.reload_data import reload_all_data
+from src.rules.engine import RuleEngine, get_rule_engine
+from src.vouchers.run_context import RunContext
+from scripts.loaders.reload_data import reload_if_stale, add_reload_policy_arguments, get_reload_policy
 from src.vouchers.voucher_utils import (
     generate_voucher_numbers,
     build_voucher_plan_markdown,
     print_console_summary,
     print_voucher_table,
-    create_voucher_for_transaction
+    create_voucher_for_transaction,
+    get_transaction_raw_data
 )
+from src.vouchers.thread_output import map_in_order
+from src.vouchers.journal import VoucherJournal, is_rejected
+from src.vouchers.verification import verify_created_vouchers, VERIFY_JOBS
+from src.vouchers.profiling import get_phase_timer, start_run_timer, add_profile_arguments
+from src.vouchers.name_matching import add_match_arguments, configure_contact_matching
 
 
 class VoucherCreatorBase(ABC):
@@ -29,7 +36,7 @@ class VoucherCreatorBase(ABC):
     Abstract base class for voucher creation scripts.
     
     Provides common functionality for:
-    - Environment setup
+    - Environment setup (or a shared RunContext, see use_context())
     - Database initialization
     - Transaction filtering
     - Voucher plan generation
@@ -39,7 +46,8 @@ class VoucherCreatorBase(ABC):
     Subclasses must implement:
     - get_script_name(): Return script name (e.g., "Gehalt")
     - get_accounting_type_name(): Return accounting type to search for
-    - filter_transactions(): Filter relevant transactions
+    - get_rule_target(): Name of the voucher type in config/creator_rules.csv
+      (or matches_transaction()/filter_transactions() for a custom filter)
     - build_voucher_plan_item(): Build a single voucher plan item
     """
     
@@ -52,6 +60,22 @@ class VoucherCreatorBase(ABC):
         self.db: Optional[TransactionDB] = None
         self.accounting_type: Optional[Dict] = None
         self.args: Optional[argparse.Namespace] = None
+        self._rule_engine: Optional[RuleEngine] = None
+        self.context: Optional[RunContext] = None
+        self._journal: Optional[VoucherJournal] = None
+    
+    def use_context(self, context: RunContext):
+        """
+        Use the client, database and data reload of a shared run context
+        instead of setting them up for this creator.
+        
+        Args:
+            context: Run context shared by all creators of a run
+        """
+        self.context = context
+        self.api_key = context.api_key
+        self.api_url = context.api_url
+        self.db_path = context.db_path
         
     @abstractmethod
     def get_script_name(self) -> str:
@@ -69,7 +93,46 @@ class VoucherCreatorBase(ABC):
         """
         pass
     
-    @abstractmethod
+    def get_rule_target(self) -> Optional[str]:
+        """
+        Get the target name of this voucher type in config/creator_rules.csv.
+        Return None if the creator implements its own filter instead.
+        """
+        return None
+    
+    def get_rule_engine(self) -> RuleEngine:
+        """Get the shared rule engine (loaded from config/creator_rules.csv)."""
+        if self._rule_engine is None:
+            self._rule_engine = get_rule_engine()
+        return self._rule_engine
+    
+    def matches_transaction(self, transaction: Dict) -> bool:
+        """
+        Check whether a single transaction belongs to this voucher type.
+        
+        By default the rules configured for get_rule_target() decide. Subclasses
+        may instead override this predicate or filter_transactions().
+        
+        Args:
+            transaction: Open transaction dictionary
+            
+        Returns:
+            True if the transaction should get a voucher of this type
+        """
+        target = self.get_rule_target()
+        if target:
+            engine = self.get_rule_engine()
+            if not engine.has_target(target):
+                raise ValueError(f"No rules configured for '{target}' in config/creator_rules.csv")
+            return target in engine.targets_for(transaction)
+        
+        if type(self).filter_transactions is VoucherCreatorBase.filter_transactions:
+            raise NotImplementedError(
+                f"{type(self).__name__} must define get_rule_target(), "
+                "matches_transaction() or filter_transactions()"
+            )
+        return bool(self.filter_transactions([transaction]))
+    
     def filter_transactions(self, all_transactions: List[Dict]) -> List[Dict]:
         """
         Filter transactions to find relevant ones for this voucher type.
@@ -80,7 +143,7 @@ class VoucherCreatorBase(ABC):
         Returns:
             List of filtered transactions
         """
-        pass
+        return [txn for txn in all_transactions if self.matches_transaction(txn)]
     
     @abstractmethod
     def build_voucher_plan_item(
@@ -174,10 +237,24 @@ class VoucherCreatorBase(ABC):
             action='store_true',
             help='Create all vouchers'
         )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            metavar='N',
+            help='Create N vouchers at the same time (default: 1)'
+        )
+        add_reload_policy_arguments(parser)
+        add_match_arguments(parser)
+        add_profile_arguments(parser)
         return parser
     
     def load_environment(self):
         """Load environment variables and validate."""
+        if self.context is not None:
+            # Already loaded by the run context
+            return
+        
         load_dotenv()
         
         self.api_key = os.getenv('SEVDESK_API_KEY')
@@ -196,10 +273,15 @@ class VoucherCreatorBase(ABC):
         print()
     
     def reload_data(self) -> bool:
-        """Reload all data from SevDesk API."""
-        print("Reloading all data from SevDesk API...")
-        print()
-        if not reload_all_data(db_path=self.db_path, api_key=self.api_key, api_url=self.api_url):
+        """
+        Reload all data from SevDesk API, unless the reload policy of the
+        arguments (--max-data-age, --no-reload, --delta) allows reusing it.
+        """
+        if self.context is not None:
+            return self.context.reload_data()
+        
+        if not reload_if_stale(db_path=self.db_path, api_key=self.api_key, api_url=self.api_url,
+                               **get_reload_policy(self.args)):
             print("Error: Failed to reload data from API")
             return False
         print()
@@ -209,13 +291,25 @@ class VoucherCreatorBase(ABC):
     
     def initialize_api_client(self):
         """Initialize the SevDesk API client."""
+        if self.context is not None:
+            self.client = self.context.client
+            return
+        
         print(f"Connecting to SevDesk API at {self.api_url}...")
         self.client = SevDeskClient(api_key=self.api_key, base_url=self.api_url)
         print("✓ Connected")
         print()
     
     def open_database(self) -> TransactionDB:
-        """Open database connection."""
+        """
+        Open database connection.
+        
+        With a run context the shared connection is returned; it stays open
+        when the with block ends.
+        """
+        if self.context is not None:
+            return self.context.open_database()
+        
         print(f"Opening database: {self.db_path}")
         return TransactionDB(db_path=self.db_path)
     
@@ -270,24 +364,71 @@ class VoucherCreatorBase(ABC):
             print("No matching transactions found. Exiting.")
             return []
         
-        # Generate voucher numbers
+        with get_phase_timer().span('voucher numbers'):
+            voucher_numbers = self.allocate_voucher_numbers(len(filtered_transactions))
+        return self.build_voucher_plan(filtered_transactions, voucher_numbers)
+    
+    def allocate_voucher_numbers(self, count: int) -> List[str]:
+        """
+        Reserve voucher numbers for this creator's plan.
+        
+        Args:
+            count: Number of voucher numbers needed
+            
+        Returns:
+            List of voucher number strings
+        """
         print("Generating voucher numbers...")
-        voucher_numbers = generate_voucher_numbers(self.client, len(filtered_transactions))
+        voucher_numbers = generate_voucher_numbers(
+            self.client,
+            count,
+            db_path=self.db_path
+        )
         print(f"✓ Generated {len(voucher_numbers)} voucher numbers (starting: {voucher_numbers[0]})")
         print()
+        return voucher_numbers
+    
+    def build_voucher_plan(
+        self,
+        filtered_transactions: List[Dict],
+        voucher_numbers: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        Build the voucher plan items.
         
-        # Build voucher plan
+        Args:
+            filtered_transactions: List of filtered transactions
+            voucher_numbers: Voucher numbers per transaction, or None to leave
+                the numbers empty for assign_voucher_numbers()
+            
+        Returns:
+            List of voucher plan items
+        """
         voucher_plan = []
-        for i, txn in enumerate(filtered_transactions):
-            plan_item = self.build_voucher_plan_item(
-                transaction=txn,
-                voucher_number=voucher_numbers[i],
-                index=i
-            )
-            voucher_plan.append(plan_item)
+        with get_phase_timer().span('build plan'):
+            for i, txn in enumerate(filtered_transactions):
+                plan_item = self.build_voucher_plan_item(
+                    transaction=txn,
+                    voucher_number=voucher_numbers[i] if voucher_numbers else None,
+                    index=i
+                )
+                voucher_plan.append(plan_item)
         
         return voucher_plan
     
+    def assign_voucher_numbers(self, voucher_plan: List[Dict]):
+        """
+        Reserve voucher numbers for a plan built without numbers.
+        
+        Args:
+            voucher_plan: Voucher plan items (updated in place)
+        """
+        if not voucher_plan:
+            return
+        voucher_numbers = self.allocate_voucher_numbers(len(voucher_plan))
+        for plan_item, voucher_number in zip(voucher_plan, voucher_numbers):
+            plan_item['voucher_number'] = voucher_number
+    
     def save_voucher_plan_markdown(self, voucher_plan: List[Dict]) -> str:
         """
         Save voucher plan to markdown file.
@@ -393,6 +534,11 @@ class VoucherCreatorBase(ABC):
         """
         Create vouchers according to plan.
         
+        With --jobs N, up to N vouchers are created and booked at the same
+        time. Each voucher is still booked right after its own creation, all
+        workers share the client's rate limit, and results and console output
+        stay in plan order.
+        
         Args:
             voucher_plan: List of voucher plan items
             check_account_id: Check account ID from transaction
@@ -409,67 +555,165 @@ class VoucherCreatorBase(ABC):
         # Determine which vouchers to create
         vouchers_to_create = [voucher_plan[0]] if self.args.create_single else voucher_plan
         
+        # Transactions with unfinished steps of an interrupted run must be
+        # resumed first, otherwise they could get a second voucher
+        journal = self.get_journal()
+        pending = journal.get_pending_transaction_ids(self.get_script_name())
+        skipped = [plan for plan in vouchers_to_create if str(plan['transaction_id']) in pending]
+        if skipped:
+            print(f"⚠️  Skipping {len(skipped)} transaction(s) with unfinished vouchers from an interrupted run")
+            print("   Finish them first: python3 scripts/vouchers/create_all_vouchers.py --resume")
+            print()
+            vouchers_to_create = [plan for plan in vouchers_to_create
+                                  if str(plan['transaction_id']) not in pending]
+        
         print(f"Creating {len(vouchers_to_create)} voucher(s)...")
         print()
         
+        # Write-ahead: record all items before the first API call
+        journal.record_planned(
+            self.get_script_name(),
+            vouchers_to_create,
+            check_account_id,
+            sev_client_id,
+            self.is_income_for_plan
+        )
+        
+        total = len(vouchers_to_create)
+        items = [(i, plan, total, check_account_id, sev_client_id)
+                 for i, plan in enumerate(vouchers_to_create, 1)]
+        
+        jobs = min(self.get_creation_jobs(), total)
+        if jobs > 1:
+            outcomes = map_in_order(lambda item: self.create_voucher_item(*item), items, jobs)
+        else:
+            outcomes = [self.create_voucher_item(*item) for item in items]
+        
         created_vouchers = []
         failed_vouchers = []
-        is_income = self.is_income_voucher()
-        
-        for i, plan in enumerate(vouchers_to_create, 1):
-            print(f"[{i}/{len(vouchers_to_create)}] Creating voucher for transaction {plan['transaction_id']}...")
-            print(f"    Amount: €{plan['amount']:,.2f}")
-            print(f"    Payee/Payer: {plan['payee_payer_name']}")
-            if plan.get('cost_centre'):
-                print(f"    Cost Centre: {plan['cost_centre']['name']}")
-            if plan.get('contact'):
-                print(f"    Contact: {plan['contact']['name']}")
+        for (_, plan, _, _, _), created in zip(items, outcomes):
+            if created is not None:
+                created_vouchers.append(created)
+            else:
+                failed_vouchers.append(plan)
+        
+        return created_vouchers, failed_vouchers
+    
+    def get_journal(self) -> VoucherJournal:
+        """Get the voucher creation journal (shared via the run context)."""
+        if self.context is not None:
+            return self.context.journal
+        if self._journal is None:
+            self._journal = VoucherJournal(self.db_path)
+        return self._journal
+    
+    def get_creation_jobs(self) -> int:
+        """Number of vouchers created at the same time (--jobs, default 1)."""
+        return max(1, getattr(self.args, 'jobs', 1) or 1)
+    
+    def is_income_for_plan(self, plan: Dict) -> bool:
+        """
+        Whether a single voucher is income (True) or expense (False).
+        Override if a voucher type has both (e.g., Geldtransit).
+        
+        Args:
+            plan: Voucher plan item
+        """
+        return self.is_income_voucher()
+    
+    def print_plan_item_details(self, plan: Dict):
+        """Print the details of a voucher before it is created."""
+        print(f"    Amount: €{plan['amount']:,.2f}")
+        print(f"    Payee/Payer: {plan['payee_payer_name']}")
+        if plan.get('cost_centre'):
+            print(f"    Cost Centre: {plan['cost_centre']['name']}")
+        if plan.get('contact'):
+            print(f"    Contact: {plan['contact']['name']}")
+    
+    def create_voucher_item(
+        self,
+        index: int,
+        plan: Dict,
+        total: int,
+        check_account_id: str,
+        sev_client_id: str
+    ) -> Optional[Dict]:
+        """
+        Create a single voucher and book it to its transaction.
+        
+        Args:
+            index: Position of the voucher in the creation run (1-based)
+            plan: Voucher plan item
+            total: Number of vouchers in the creation run
+            check_account_id: Check account ID from transaction
+            sev_client_id: SevClient ID from transaction
             
-            try:
-                response = create_voucher_for_transaction(
-                    self.client,
-                    plan,
-                    check_account_id,
-                    sev_client_id,
-                    is_income=is_income
-                )
+        Returns:
+            Created voucher dictionary (plan, voucher_id, response) or None if it failed
+        """
+        print(f"[{index}/{total}] Creating voucher for transaction {plan['transaction_id']}...")
+        self.print_plan_item_details(plan)
+        
+        is_income = self.is_income_for_plan(plan)
+        journal = self.get_journal()
+        creator = self.get_script_name()
+        transaction_id = plan['transaction_id']
+        created = None
+        
+        try:
+            journal.mark_creating(creator, transaction_id)
+            response = create_voucher_for_transaction(
+                self.client,
+                plan,
+                check_account_id,
+                sev_client_id,
+                is_income=is_income
+            )
+            
+            if response and 'objects' in response:
+                # Extract voucher ID from nested structure
+                voucher_id = response['objects'].get('voucher', {}).get('id')
+                journal.mark_created(creator, transaction_id, voucher_id)
+                print(f"    ✓ Voucher created successfully! ID: {voucher_id}")
+                
+                # Book voucher amount to link it to the transaction
+                print(f"    Booking voucher amount to link to transaction...")
+                try:
+                    book_response = self.client.book_voucher_amount(
+                        voucher_id=voucher_id,
+                        transaction_id=plan['transaction_id'],
+                        check_account_id=check_account_id,
+                        amount=plan['amount'],
+                        date=plan['transaction_date'][:10],
+                        is_income=is_income
+                    )
+                    journal.mark_booked(creator, transaction_id)
+                    print(f"    ✓ Voucher booked and linked to transaction!")
+                except Exception as link_error:
+                    journal.mark_book_failed(creator, transaction_id, str(link_error))
+                    print(f"    ⚠️  Warning: Failed to book/link voucher: {str(link_error)}")
                 
-                if response and 'objects' in response:
-                    # Extract voucher ID from nested structure
-                    voucher_id = response['objects'].get('voucher', {}).get('id')
-                    print(f"    ✓ Voucher created successfully! ID: {voucher_id}")
-                    
-                    # Book voucher amount to link it to the transaction
-                    print(f"    Booking voucher amount to link to transaction...")
-                    try:
-                        book_response = self.client.book_voucher_amount(
-                            voucher_id=voucher_id,
-                            transaction_id=plan['transaction_id'],
-                            check_account_id=check_account_id,
-                            amount=plan['amount'],
-                            date=plan['transaction_date'][:10],
-                            is_income=is_income
-                        )
-                        print(f"    ✓ Voucher booked and linked to transaction!")
-                    except Exception as link_error:
-                        print(f"    ⚠️  Warning: Failed to book/link voucher: {str(link_error)}")
-                    
-                    created_vouchers.append({
-                        'plan': plan,
-                        'voucher_id': voucher_id,
-                        'response': response
-                    })
-                else:
-                    print(f"    ❌ Failed: Unexpected response format")
-                    failed_vouchers.append(plan)
-                    
-            except Exception as e:
+                created = {
+                    'plan': plan,
+                    'voucher_id': voucher_id,
+                    'response': response
+                }
+            else:
+                journal.mark_failed(creator, transaction_id, 'Unexpected response format')
+                print(f"    ❌ Failed: Unexpected response format")
+                
+        except Exception as e:
+            if is_rejected(e):
+                journal.mark_failed(creator, transaction_id, str(e))
                 print(f"    ❌ Failed: {str(e)}")
-                failed_vouchers.append(plan)
-            
-            print()
+            else:
+                # SevDesk may have saved the voucher: keep the item for --resume
+                journal.mark_outcome_unknown(creator, transaction_id, str(e))
+                print(f"    ❌ Failed, the voucher may exist: {str(e)}")
+                print("       Check it with: python3 scripts/vouchers/create_all_vouchers.py --resume")
         
-        return created_vouchers, failed_vouchers
+        print()
+        return created
     
     def print_creation_summary(
         self,
@@ -487,46 +731,26 @@ class VoucherCreatorBase(ABC):
         print()
     
     def verify_transaction_statuses(self, created_vouchers: List[Dict]):
-        """Verify that transactions have been updated after voucher creation."""
+        """
+        Verify that transactions have been updated after voucher creation.
+        
+        Only the transactions of the created vouchers are fetched and updated
+        (see src/vouchers/verification.py).
+        """
         if not created_vouchers:
             return
         
         print("Verifying transaction statuses...")
         print()
         
-        # Reload transactions from API
-        print("Reloading transactions from API...")
         try:
-            updated_transactions = self.client.get_all_transactions(status=None)
-            print(f"✓ Loaded {len(updated_transactions)} transactions")
-            print()
-            
-            # Check each created voucher's transaction
-            for created in created_vouchers:
-                txn_id = created['plan']['transaction_id']
-                txn = next((t for t in updated_transactions if t.get('id') == txn_id), None)
-                
-                if txn:
-                    old_status = 100  # Was open
-                    new_status = txn.get('status')
-                    status_name = {100: 'Open', 200: 'Linked', 1000: 'Booked'}.get(new_status, f'Unknown ({new_status})')
-                    
-                    if new_status != old_status:
-                        print(f"✓ Transaction {txn_id}: {old_status} → {new_status} ({status_name})")
-                    else:
-                        print(f"⚠️  Transaction {txn_id}: Still at status {new_status} ({status_name})")
-                else:
-                    print(f"❌ Transaction {txn_id}: Not found in updated data")
-            
-            print()
-            
-            # Update database
-            print("Updating local database...")
-            with TransactionDB(db_path=self.db_path) as db_update:
-                inserted = db_update.bulk_insert_transactions(updated_transactions)
-                print(f"✓ Updated {inserted} transactions in database")
-            print()
-            
+            with self.open_database() as db_update:
+                verify_created_vouchers(
+                    self.client,
+                    db_update,
+                    created_vouchers,
+                    jobs=max(self.get_creation_jobs(), VERIFY_JOBS)
+                )
         except Exception as e:
             print(f"❌ Error during verification: {str(e)}")
             print()
@@ -541,32 +765,59 @@ class VoucherCreatorBase(ABC):
         """
         Main execution flow.
         This is the entry point that orchestrates the entire process.
+        
+        The phases are timed (see src/vouchers/profiling.py) and their
+        timings are printed at the end; --profile also writes cProfile
+        statistics per phase, --profile-memory records peak memory.
         """
         # Setup
         parser = self.setup_argument_parser()
         self.args = parser.parse_args()
         
+        # Contact matching options of this run (command line or .env)
+        load_dotenv()
+        try:
+            configure_contact_matching(self.args)
+        except ValueError as e:
+            parser.error(str(e))
+        
+        timer = start_run_timer(self.args)
+        try:
+            self._run(timer)
+        finally:
+            timer.print_table()
+            timer.close()
+    
+    def _run(self, timer):
+        """Execution flow of run() (phases are measured with timer)."""
         self.load_environment()
         self.print_header()
         
         # Reload data
-        if not self.reload_data():
+        with timer.span('reload'):
+            reloaded = self.reload_data()
+        if not reloaded:
             sys.exit(1)
         
         # Initialize API client
-        self.initialize_api_client()
+        with timer.span('connect'):
+            self.initialize_api_client()
         
         # Open database and process
         with self.open_database() as db:
             self.db = db
             
             # Find accounting type
-            if not self.find_accounting_type(db):
+            with timer.span('accounting type'):
+                found = self.find_accounting_type(db)
+            if not found:
                 sys.exit(1)
             
             # Get and filter transactions
-            all_transactions = self.get_open_transactions(db)
-            filtered_transactions = self.filter_transactions(all_transactions)
+            with timer.span('load transactions'):
+                all_transactions = self.get_open_transactions(db)
+            with timer.span('filter'):
+                filtered_transactions = self.filter_transactions(all_transactions)
             
             if not filtered_transactions:
                 print("No matching transactions found. Exiting.")
@@ -576,12 +827,14 @@ class VoucherCreatorBase(ABC):
             print()
             
             # Generate voucher plan
-            voucher_plan = self.generate_voucher_plan(filtered_transactions)
+            with timer.span('plan'):
+                voucher_plan = self.generate_voucher_plan(filtered_transactions)
             if not voucher_plan:
                 return
             
             # Save markdown plan
-            output_file = self.save_voucher_plan_markdown(voucher_plan)
+            with timer.span('markdown'):
+                output_file = self.save_voucher_plan_markdown(voucher_plan)
             
             # If no create flag, just show the plan
             if not self.args.create_single and not self.args.create_all:
@@ -593,22 +846,24 @@ class VoucherCreatorBase(ABC):
                 return
             
             # Get check account and sev client IDs from first transaction
-            first_txn_raw = json.loads(filtered_transactions[0].get('raw_data', '{}'))
+            first_txn_raw = get_transaction_raw_data(filtered_transactions[0])
             check_account_id = first_txn_raw.get('checkAccount', {}).get('id')
             sev_client_id = first_txn_raw.get('sevClient', {}).get('id')
             
             # Create vouchers
-            created_vouchers, failed_vouchers = self.create_vouchers(
-                voucher_plan,
-                check_account_id,
-                sev_client_id
-            )
+            with timer.span('create vouchers'):
+                created_vouchers, failed_vouchers = self.create_vouchers(
+                    voucher_plan,
+                    check_account_id,
+                    sev_client_id
+                )
             
             # Print summary
             self.print_creation_summary(created_vouchers, failed_vouchers)
             
             # Verify transaction statuses
-            self.verify_transaction_statuses(created_vouchers)
+            with timer.span('verify'):
+                self.verify_transaction_statuses(created_vouchers)
             
             # Done
             self.print_footer()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Voucher number allocation (B-YYYY-NR).
+
+The allocator keeps a ledger of reserved, used and abandoned numbers in the
+SQLite database, so numbers survive across processes:
+- Start-up costs a single 1-voucher API request (newest voucher probe)
+- Numbers already present in the local voucher mirror are never handed out
+- The remote vouchers are only re-scanned when a newer voucher than the last
+  synced one exists, and the scan stops at the last known voucher
+- Reservations run in an IMMEDIATE transaction, so parallel processes using
+  the same database never receive the same number
+- Numbers reserved but not used by a process are released when it exits
+"""
+import atexit
+import re
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from src.database.db import TransactionDB
+
+
+# Pattern of our voucher numbers
+VOUCHER_NUMBER_PATTERN = re.compile(r'B-(\d{4})-(\d+)')
+
+# Remote scan settings
+SCAN_PAGE_SIZE = 100
+SCAN_MAX_VOUCHERS = 500
+
+# Reservations of crashed processes are released after this time
+RESERVATION_TTL_HOURS = 12
+
+
+def parse_voucher_number(voucher_number: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a voucher number in format B-YYYY-NR.
+
+    Returns:
+        Tuple of (year, number) or None if the format does not match
+    """
+    match = VOUCHER_NUMBER_PATTERN.match(str(voucher_number or ''))
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def get_newest_remote_voucher_id(client) -> Optional[str]:
+    """Get the ID of the most recently created voucher (single small request)."""
+    response = client._request('GET', '/Voucher', params={
+        'limit': 1,
+        'order[create]': 'DESC'
+    })
+    vouchers = (response or {}).get('objects') or []
+    return str(vouchers[0].get('id')) if vouchers else None
+
+
+def scan_remote_voucher_numbers(
+    client,
+    year: int,
+    stop_at_id: Optional[str] = None,
+    max_vouchers: int = SCAN_MAX_VOUCHERS
+) -> Tuple[int, Optional[str], int]:
+    """
+    Scan the most recent vouchers for the highest B-YYYY-NR number of a year.
+
+    Vouchers are fetched in batches of 100 (most recent first). Without
+    stop_at_id the scan stops at the first batch containing a match; with
+    stop_at_id it only reads the vouchers created since that voucher.
+
+    Args:
+        client: SevDeskClient instance
+        year: Voucher number year
+        stop_at_id: ID of the newest voucher seen by the previous scan
+        max_vouchers: Safety limit of vouchers to check
+
+    Returns:
+        Tuple of (highest number or 0, newest voucher ID, vouchers checked)
+    """
+    offset = 0
+    highest_nr = 0
+    newest_id = None
+    checked = 0
+
+    while offset < max_vouchers:
+        response = client._request('GET', '/Voucher', params={
+            'limit': SCAN_PAGE_SIZE,
+            'offset': offset,
+            'order[create]': 'DESC'
+        })
+
+        if not response or 'objects' not in response:
+            break
+
+        vouchers = response['objects']
+        if not vouchers:
+            break
+
+        if newest_id is None:
+            newest_id = str(vouchers[0].get('id'))
+
+        reached_known = False
+        for voucher in vouchers:
+            if stop_at_id and str(voucher.get('id')) == stop_at_id:
+                reached_known = True
+                break
+            checked += 1
+
+            # Check both voucherNumber and description fields
+            parsed = parse_voucher_number(voucher.get('voucherNumber', '') or voucher.get('description', ''))
+            if parsed and parsed[0] == year:
+                highest_nr = max(highest_nr, parsed[1])
+
+        if reached_known:
+            break
+
+        # Without a known voucher to stop at, the first batch with a match
+        # is enough (sorted by date DESC, recent vouchers are first)
+        if not stop_at_id and highest_nr:
+            break
+
+        if len(vouchers) < SCAN_PAGE_SIZE:
+            break
+
+        offset += SCAN_PAGE_SIZE
+
+    return highest_nr, newest_id, checked
+
+
+class VoucherNumberAllocator:
+    """
+    Allocates voucher numbers from a persistent ledger in the SQLite database.
+
+    Usage:
+        allocator = VoucherNumberAllocator('transactions.db')
+        numbers = allocator.allocate(client, 3)   # ['B-2025-42', ...]
+        allocator.mark_used('B-2025-42', voucher_id)
+        allocator.release()                       # also done at exit
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the allocator.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self.session_id = uuid.uuid4().hex
+        self._synced_years = set()
+        self._lock = threading.Lock()
+        # Used from worker threads too (access is serialized by self._lock)
+        self._db = TransactionDB(db_path=db_path, check_same_thread=False)
+        atexit.register(self.release)
+
+    def sync(self, client, year: int):
+        """
+        Bring the remote high-water mark up to date (at most once per process).
+
+        Only the newest voucher is fetched; the remote vouchers are scanned
+        only if it is newer than the last synced voucher.
+        """
+        if year in self._synced_years:
+            return
+
+        sync_state = self._db.get_voucher_number_sync(year)
+        last_known_id = sync_state['last_remote_voucher_id'] if sync_state else None
+
+        try:
+            newest_id = get_newest_remote_voucher_id(client)
+
+            if sync_state and newest_id == last_known_id:
+                print(f"  → Voucher numbers up to date (B-{year}-{sync_state['remote_high_water']}, no API scan needed)")
+            else:
+                highest_nr, scanned_newest_id, checked = scan_remote_voucher_numbers(
+                    client, year, stop_at_id=last_known_id
+                )
+                self._db.update_voucher_number_sync(year, highest_nr, scanned_newest_id or newest_id)
+                if highest_nr:
+                    print(f"  → Found voucher B-{year}-{highest_nr} (checked {checked} vouchers)")
+                else:
+                    print(f"  → No new B-{year} vouchers found (checked {checked} vouchers)")
+        except Exception as e:
+            # Fall back to the local ledger
+            print(f"⚠️  Warning: Could not sync voucher numbers: {e}")
+
+        self._synced_years.add(year)
+
+    def allocate(self, client, count: int) -> List[str]:
+        """
+        Reserve consecutive voucher numbers for the current year.
+
+        Args:
+            client: SevDeskClient instance (used for the remote sync)
+            count: Number of voucher numbers to reserve
+
+        Returns:
+            List of voucher number strings
+        """
+        if count <= 0:
+            return []
+
+        year = datetime.now().year
+        with self._lock:
+            self.sync(client, year)
+
+            sync_state = self._db.get_voucher_number_sync(year)
+            floor = max(
+                sync_state['remote_high_water'] if sync_state else 0,
+                self._db.get_highest_voucher_number(year)
+            )
+            stale_before = (datetime.now() - timedelta(hours=RESERVATION_TTL_HOURS)).isoformat()
+
+            numbers = self._db.reserve_voucher_numbers(
+                year, count, floor, self.session_id, stale_before=stale_before
+            )
+
+        return [f"B-{year}-{number}" for number in numbers]
+
+    def claim(self, client, voucher_numbers: List[str]) -> List[str]:
+        """
+        Reserve previously allocated numbers again (all or none), e.g. for a saved plan.
+
+        Args:
+            client: SevDeskClient instance (used for the remote sync)
+            voucher_numbers: Voucher number strings
+
+        Returns:
+            List of numbers that are no longer available (empty if all were claimed)
+        """
+        by_year = {}
+        invalid = []
+        for voucher_number in voucher_numbers:
+            parsed = parse_voucher_number(voucher_number)
+            if parsed:
+                by_year.setdefault(parsed[0], []).append(parsed[1])
+            else:
+                invalid.append(voucher_number)
+        if invalid:
+            return invalid
+
+        conflicts = []
+        with self._lock:
+            for year, numbers in by_year.items():
+                self.sync(client, year)
+                sync_state = self._db.get_voucher_number_sync(year)
+                floor = sync_state['remote_high_water'] if sync_state else 0
+                taken = self._db.claim_voucher_numbers(year, numbers, floor, self.session_id)
+                conflicts.extend(f"B-{year}-{number}" for number in taken)
+        return conflicts
+
+    def mark_used(self, voucher_number: str, voucher_id: Optional[str] = None):
+        """Record that a voucher was created with this number."""
+        parsed = parse_voucher_number(voucher_number)
+        if not parsed:
+            return
+        with self._lock:
+            self._db.mark_voucher_number_used(parsed[0], parsed[1], voucher_id)
+
+    def release(self) -> int:
+        """
+        Release all numbers reserved by this process but not used.
+
+        Returns:
+            Number of released voucher numbers
+        """
+        with self._lock:
+            if self._db is None:
+                return 0
+            return self._db.abandon_voucher_numbers(self.session_id)
+
+    def close(self):
+        """Release unused numbers and close the database connection."""
+        self.release()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
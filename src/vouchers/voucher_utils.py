@@ -6,8 +6,44 @@ This module provides common functions for generating voucher plans,
 markdown tables, and other shared functionality across different
 voucher types (ÜLP, Gehalt, Spenden).
 """
+import json
 from datetime import datetime
 from typing import List, Dict, Optional
+from src.vouchers.name_matching import (
+    DEFAULT_TOP_K,
+    get_match_settings,
+    resolve_contact_candidates
+)
+from src.vouchers.profiling import get_phase_timer
+from src.vouchers.voucher_numbers import (
+    SCAN_MAX_VOUCHERS,
+    VoucherNumberAllocator,
+    scan_remote_voucher_numbers
+)
+
+
+# Contact matches below this confidence are flagged in the voucher plan
+LOW_CONFIDENCE_THRESHOLD = 0.8
+
+
+def get_transaction_raw_data(transaction: Dict) -> Dict:
+    """
+    Get the decoded raw API data of a transaction row.
+    
+    The decoded dictionary is cached in the row, so the JSON is parsed only
+    once even if several voucher creators inspect the same transaction.
+    
+    Args:
+        transaction: Transaction dictionary from the database
+        
+    Returns:
+        Raw transaction data dictionary
+    """
+    raw_data = transaction.get('_raw_decoded')
+    if raw_data is None:
+        raw_data = json.loads(transaction.get('raw_data', '{}') or '{}')
+        transaction['_raw_decoded'] = raw_data
+    return raw_data
 
 
 def get_next_voucher_number(client) -> int:
@@ -20,6 +56,7 @@ def get_next_voucher_number(client) -> int:
     - Only continues to next batch if no match found in current batch
     
     This is much faster than fetching all vouchers (typically 1 request vs 40+).
+    Prefer VoucherNumberAllocator, which avoids the scan on most start-ups.
     
     Args:
         client: SevDeskClient instance for fetching vouchers
@@ -27,73 +64,16 @@ def get_next_voucher_number(client) -> int:
     Returns:
         The next number to use (as integer)
     """
-    from datetime import datetime
-    import re
-    
     current_year = datetime.now().year
-    page_size = 100
-    offset = 0
-    highest_nr = 0
-    found_match = False
     
     try:
-        # Fetch vouchers in batches until we find our pattern
-        while True:
-            # Fetch one batch (100 vouchers, sorted by date DESC = most recent first)
-            params = {
-                'limit': page_size,
-                'offset': offset,
-                'order[create]': 'DESC'
-            }
-            
-            response = client._request('GET', '/Voucher', params=params)
-            
-            if not response or 'objects' not in response:
-                break
-            
-            vouchers = response['objects']
-            if not vouchers:
-                break
-            
-            # Search this batch for our pattern
-            for voucher in vouchers:
-                # Check both voucherNumber and description fields
-                voucher_number = voucher.get('voucherNumber', '') or voucher.get('description', '')
-                
-                # Try to parse format B-YYYY-NR
-                match = re.match(r'B-(\d{4})-(\d+)', str(voucher_number))
-                
-                if match:
-                    year = int(match.group(1))
-                    nr = int(match.group(2))
-                    
-                    # Only consider vouchers from current year
-                    if year == current_year:
-                        found_match = True
-                        if nr > highest_nr:
-                            highest_nr = nr
-            
-            # If we found a match in this batch, we can stop
-            # (since sorted by date DESC, recent vouchers are first)
-            if found_match:
-                print(f"  → Found voucher B-{current_year}-{highest_nr} (checked {offset + len(vouchers)} vouchers)")
-                break
-            
-            # No match yet, check if there are more pages
-            if len(vouchers) < page_size:
-                # Last page, no more vouchers
-                break
-            
-            # Move to next batch
-            offset += page_size
-            
-            # Safety limit: stop after checking 500 vouchers
-            if offset >= 500:
-                print(f"  → Checked 500 vouchers, no pattern found. Starting fresh.")
-                break
+        highest_nr, _, checked = scan_remote_voucher_numbers(client, current_year)
         
-        # Return next number
-        if highest_nr == 0:
+        if highest_nr:
+            print(f"  → Found voucher B-{current_year}-{highest_nr} (checked {checked} vouchers)")
+        elif checked >= SCAN_MAX_VOUCHERS:
+            print(f"  → Checked {SCAN_MAX_VOUCHERS} vouchers, no pattern found. Starting fresh.")
+        else:
             print(f"  → No existing vouchers found. Starting with B-{current_year}-1")
         
         return highest_nr + 1
@@ -110,43 +90,66 @@ def get_next_voucher_number(client) -> int:
 _voucher_number_state = {
     'next_number': None,
     'year': None,
+    'allocators': {},
 }
 
 
+def get_voucher_number_allocator(db_path: str) -> VoucherNumberAllocator:
+    """
+    Get the persistent voucher number allocator for a database (one per process).
+    
+    Args:
+        db_path: Path to the SQLite database file
+        
+    Returns:
+        VoucherNumberAllocator instance
+    """
+    allocators = _voucher_number_state['allocators']
+    if db_path not in allocators:
+        allocators[db_path] = VoucherNumberAllocator(db_path)
+    return allocators[db_path]
+
+
 def reset_voucher_number_cache():
     """
     Reset the voucher number cache. 
     Call this if you need to force a refresh from the API.
+    Numbers reserved by this process in the ledger are released.
     """
     global _voucher_number_state
+    for allocator in _voucher_number_state['allocators'].values():
+        allocator.close()
     _voucher_number_state = {
         'next_number': None,
         'year': None,
+        'allocators': {},
     }
 
 
-def generate_voucher_numbers(client, count: int) -> list:
+def generate_voucher_numbers(client, count: int, db_path: Optional[str] = None) -> list:
     """
     Generate a list of consecutive voucher numbers in format B-YYYY-NR.
     
-    This function uses caching to avoid fetching all vouchers multiple times
-    when processing multiple voucher types in batch (e.g., via master script).
+    With db_path, numbers come from the persistent ledger in the database
+    (see VoucherNumberAllocator): they are unique across processes and the
+    remote vouchers are only scanned when new vouchers were created since
+    the last sync.
     
-    On first call: Fetches the last voucher from API and caches the starting number.
-    Subsequent calls: Uses cached number and increments it.
-    
-    This reduces API calls from 6× to 1× when running all voucher creators,
-    improving performance by ~6x (from ~60s to ~10s).
+    Without db_path, the starting number is fetched from the API once per
+    process and cached, then incremented for every following call.
     
     Args:
         client: SevDeskClient instance
         count: Number of voucher numbers to generate
+        db_path: Optional path to the SQLite database holding the ledger
         
     Returns:
         List of voucher number strings
     """
     global _voucher_number_state
-    from datetime import datetime
+    
+    if db_path:
+        return get_voucher_number_allocator(db_path).allocate(client, count)
     
     current_year = datetime.now().year
     
@@ -173,6 +176,18 @@ def generate_voucher_numbers(client, count: int) -> list:
     return voucher_numbers
 
 
+def mark_voucher_number_used(voucher_number: str, voucher_id: Optional[str] = None):
+    """
+    Record a created voucher's number in every active ledger of this process.
+    
+    Args:
+        voucher_number: Voucher number (B-YYYY-NR)
+        voucher_id: ID of the created voucher
+    """
+    for allocator in _voucher_number_state['allocators'].values():
+        allocator.mark_used(voucher_number, voucher_id)
+
+
 def build_voucher_plan_markdown(
     title: str,
     voucher_plan: List[Dict],
@@ -219,6 +234,8 @@ def build_voucher_plan_markdown(
         cost_centre_name = plan['cost_centre']['name'] if plan['cost_centre'] else '❌ NOT FOUND'
         cost_centre_display = f"✅ {cost_centre_name}" if plan['cost_centre'] else cost_centre_name
         contact_display = f"✅ {plan['contact']['name']}" if plan['contact'] else '❌ NOT FOUND'
+        if plan['contact'] and plan.get('contact_score') is not None:
+            contact_display += f" ({plan['contact_score']:.0%})"
         accounting_type_name = plan.get('accounting_type', {}).get('name', 'N/A')
         
         # Truncate purpose to max 40 chars
@@ -254,8 +271,13 @@ def build_voucher_plan_markdown(
     # Check for missing cost centres or contacts
     missing_cost_centres = [p for p in voucher_plan if not p['cost_centre']]
     missing_contacts = [p for p in voucher_plan if not p['contact']]
+    low_confidence_contacts = [
+        p for p in voucher_plan
+        if p['contact'] and p.get('contact_score') is not None
+        and p['contact_score'] < LOW_CONFIDENCE_THRESHOLD
+    ]
     
-    if missing_cost_centres or missing_contacts:
+    if missing_cost_centres or missing_contacts or low_confidence_contacts:
         markdown_lines.append("## ⚠️ Warnings")
         markdown_lines.append("")
         
@@ -276,6 +298,18 @@ def build_voucher_plan_markdown(
             markdown_lines.append("")
             markdown_lines.append("*These vouchers will be created WITHOUT a supplier/customer link.*")
             markdown_lines.append("")
+        
+        if low_confidence_contacts:
+            markdown_lines.append(f"**Contacts matched with low confidence (< {LOW_CONFIDENCE_THRESHOLD:.0%}):**")
+            markdown_lines.append("")
+            for p in low_confidence_contacts:
+                markdown_lines.append(
+                    f"- {p['payee_payer_name']} → {p['contact']['name']} "
+                    f"({p['contact_score']:.0%}, Transaction: {p['transaction_id']})"
+                )
+            markdown_lines.append("")
+            markdown_lines.append("*Please double-check these contact assignments.*")
+            markdown_lines.append("")
     
     # Extra sections (e.g., donation type statistics)
     if extra_sections:
@@ -293,6 +327,7 @@ def build_voucher_plan_markdown(
     markdown_lines.append(f"- **Total Vouchers:** {len(voucher_plan)}")
     markdown_lines.append(f"- **Missing Contacts:** {len(missing_contacts)}")
     markdown_lines.append(f"- **Missing Cost Centres:** {len(missing_cost_centres)}")
+    markdown_lines.append(f"- **Low-Confidence Contacts:** {len(low_confidence_contacts)}")
     markdown_lines.append("")
     
     # Next steps
@@ -447,11 +482,90 @@ def find_cost_centre_by_name(
     return None
 
 
+def find_contact_candidates(
+    db,
+    payee_name: str,
+    prefer_category: Optional[int] = None,
+    custom_mappings: Optional[Dict[str, str]] = None,
+    mode: Optional[str] = None,
+    top_k: int = DEFAULT_TOP_K,
+    threshold: Optional[float] = None
+) -> List[Dict]:
+    """
+    Find the top-k contact candidates for a payee name.
+    
+    Args:
+        db: Database connection
+        payee_name: Name to search for
+        prefer_category: Category ID to prefer (2=Customer, 3=Supplier)
+        custom_mappings: Optional dict of custom exact name mappings
+        mode: 'tiered' (original scoring) or 'fuzzy' (trigram + Jaro-Winkler);
+            None = the mode of the run (see configure_contact_matching())
+        top_k: Maximum number of candidates to return
+        threshold: Minimum confidence score (0.0 - 1.0) to accept a candidate;
+            None = the threshold of the run
+        
+    Returns:
+        List of dicts with keys 'contact', 'score' (0.0 - 1.0) and 'method',
+        best match first
+    """
+    if not payee_name:
+        return []
+    
+    settings = get_match_settings()
+    if mode is None:
+        mode = settings['mode']
+    if threshold is None:
+        threshold = settings['threshold']
+    
+    with get_phase_timer().span('contact matching'):
+        return resolve_contact_candidates(
+            db,
+            payee_name,
+            prefer_category=prefer_category,
+            custom_mappings=custom_mappings,
+            mode=mode,
+            top_k=top_k,
+            threshold=threshold
+        )
+
+
+def find_contact_match(
+    db,
+    payee_name: str,
+    prefer_category: Optional[int] = None,
+    custom_mappings: Optional[Dict[str, str]] = None,
+    mode: Optional[str] = None,
+    threshold: Optional[float] = None
+) -> Optional[Dict]:
+    """
+    Find the best contact match for a payee name, including its confidence.
+    
+    Args:
+        See find_contact_candidates()
+        
+    Returns:
+        Dict with keys 'contact', 'score' and 'method', or None
+    """
+    candidates = find_contact_candidates(
+        db,
+        payee_name,
+        prefer_category=prefer_category,
+        custom_mappings=custom_mappings,
+        mode=mode,
+        top_k=1,
+        threshold=threshold
+    )
+    return candidates[0] if candidates else None
+
+
 def find_contact_by_name(
     db,
     payee_name: str,
     prefer_category: Optional[int] = None,
-    custom_mappings: Optional[Dict[str, str]] = None
+    custom_mappings: Optional[Dict[str, str]] = None,
+    mode: Optional[str] = None,
+    threshold: Optional[float] = None
 ) -> Optional[Dict]:
     """
     Find a contact by payee name using advanced fuzzy matching.
@@ -462,118 +576,23 @@ def find_contact_by_name(
         prefer_category: Category ID to prefer (2=Customer, 3=Supplier)
         custom_mappings: Optional dict of custom exact name mappings
                         e.g., {'gwendolyn ruth dewhurst': 'gwen dewhurst'}
+        mode: 'tiered' (original scoring) or 'fuzzy' (trigram + Jaro-Winkler);
+            None = the mode of the run (see configure_contact_matching())
+        threshold: Minimum confidence score (0.0 - 1.0) to accept a match;
+            None = the threshold of the run
         
     Returns:
         Contact dict or None
     """
-    if not payee_name:
-        return None
-    
-    import re
-    import unicodedata
-    
-    def normalize_name(name):
-        """Normalize name by removing punctuation and extra spaces."""
-        # Normalize unicode (e.g., ß → ss)
-        name = unicodedata.normalize('NFKD', name)
-        # Remove diacritics
-        name = ''.join([c for c in name if not unicodedata.combining(c)])
-        # Replace ß with ss
-        name = name.replace('ß', 'ss').replace('ẞ', 'SS')
-        # Remove commas, dots, and extra spaces
-        name = re.sub(r'[,.]', ' ', name)
-        # Normalize whitespace
-        name = ' '.join(name.split())
-        return name.lower()
-    
-    search_name = payee_name.lower().strip()
-    search_normalized = normalize_name(search_name)
-    all_contacts = db.get_all_contacts()
-    
-    # Check custom mappings first (exact match)
-    if custom_mappings:
-        for search_term, target_name in custom_mappings.items():
-            if normalize_name(search_term) == search_normalized:
-                # Look for exact target name
-                for contact in all_contacts:
-                    if normalize_name(contact.get('name', '')) == normalize_name(target_name):
-                        return contact
-    
-    search_words_list = search_normalized.split()
-    search_words = set(search_words_list)
-    
-    # Handle "lastname, firstname" format by reversing
-    search_alternatives = [search_normalized]
-    if ',' in payee_name:
-        parts = [p.strip() for p in payee_name.split(',')]
-        if len(parts) == 2:
-            reversed_name = f"{parts[1]} {parts[0]}"
-            search_alternatives.append(normalize_name(reversed_name))
-    
-    # Search for matching contact by name
-    candidate_matches = []
-    
-    for contact in all_contacts:
-        contact_name = contact.get('name', '')
-        if not contact_name:
-            continue
-        
-        contact_normalized = normalize_name(contact_name)
-        contact_words = set(contact_normalized.split())
-        category_id = contact.get('category', {}).get('id') if isinstance(contact.get('category'), dict) else contact.get('category_id')
-        
-        # Try exact match first with any search alternative
-        for i, search_alt in enumerate(search_alternatives):
-            if search_alt == contact_normalized:
-                priority = 1000 - i
-                if prefer_category and category_id == prefer_category:
-                    priority += 10000
-                candidate_matches.append((priority, contact))
-                break
-        
-        if candidate_matches and candidate_matches[-1][1] == contact:
-            continue
-        
-        # Try partial match
-        for i, search_alt in enumerate(search_alternatives):
-            if search_alt in contact_normalized or contact_normalized in search_alt:
-                priority = 500 - i
-                if prefer_category and category_id == prefer_category:
-                    priority += 10000
-                candidate_matches.append((priority, contact))
-                break
-        
-        if candidate_matches and candidate_matches[-1][1] == contact:
-            continue
-        
-        # Fuzzy word matching
-        if search_words and contact_words:
-            common_words = search_words & contact_words
-            score = len(common_words)
-            
-            if contact_words.issubset(search_words):
-                score += 10
-            
-            # Check first word matching for multi-word names
-            if len(search_words) >= 2 and len(contact_words) >= 2:
-                search_parts = search_normalized.split()
-                contact_parts = contact_normalized.split()
-                
-                if common_words and search_parts[0] not in contact_parts and contact_parts[0] not in search_parts:
-                    score = 0
-            
-            if score > 0:
-                priority = score
-                if prefer_category and category_id == prefer_category:
-                    priority += 10000
-                candidate_matches.append((priority, contact))
-    
-    # Return best match
-    if candidate_matches:
-        candidate_matches.sort(key=lambda x: x[0], reverse=True)
-        return candidate_matches[0][1]
-    
-    return None
+    match = find_contact_match(
+        db,
+        payee_name,
+        prefer_category=prefer_category,
+        custom_mappings=custom_mappings,
+        mode=mode,
+        threshold=threshold
+    )
+    return match['contact'] if match else None
 
 
 def create_voucher_for_transaction(
@@ -675,4 +694,10 @@ def create_voucher_for_transaction(
     
     # Create the voucher
     response = client.create_voucher(voucher_data)
+    
+    # Record the number as used in the voucher number ledger
+    if response and 'objects' in response:
+        voucher_id = response['objects'].get('voucher', {}).get('id')
+        mark_voucher_number_used(plan['voucher_number'], voucher_id)
+    
     return response